@@ -4,44 +4,223 @@
 #
 
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import numpy as np
 import psutil
-import threading
 import time
 from datetime import datetime
-import json
 import os
+import sys
+
+from recolector import CmdlineCache, ProcessRegistry
+from muestreador import BackgroundSampler, PeriodicThread, SystemSampler, select_collector
+from tabla_procesos import VirtualTable, process_key, process_row, show_processes
+from busqueda import SearchIndex
+from series import TimeSeriesStore
+from planificador import RefreshScheduler
+from observados import IDENTITY_TOLERANCE, WATCHED_SERIES, WatchedTracker, read_identity, reconcile_watched
+from historial import open_history
+from persistencia import AtomicJsonFile, data_path
+from terminacion import collect_targets, format_report, terminate_processes
+from prioridades import PRIORITY_VALUES, RULE_FIELDS, PriorityEnforcer, PriorityRule, parse_rules
+from alertas import DEFAULT_RULES, AlertEngine, AlertRule, describe_alert, parse_rules as parse_alert_rules
 
 class TaskManagerGUI:
     """Administrador de Tareas con Interfaz Gráfica"""
     
-    def __init__(self):
+    # Ventanas de tiempo de los gráficos del monitor (segundos)
+    GRAPH_WINDOWS = {'2 minutos': 120, '10 minutos': 600, '1 hora': 3600, '1 día': 86400}
+    
+    # Velocidades de reproducción (segundos de grabación por segundo real)
+    REPLAY_SPEEDS = {'1x': 1.0, '10x': 10.0, '60x': 60.0, '600x': 600.0}
+    
+    # Etiquetas en español de las prioridades y de los campos de las reglas
+    PRIORITY_LABELS = {'realtime': 'Tiempo real', 'high': 'Alta', 'normal': 'Normal',
+                       'below_normal': 'Por debajo de Normal', 'idle': 'Inactiva'}
+    RULE_FIELD_LABELS = {'name': 'Nombre', 'exe': 'Ejecutable', 'user': 'Usuario'}
+    ALERT_METRIC_LABELS = {'cpu': 'CPU% de un proceso', 'rss_mb': 'Memoria (MB) de un proceso',
+                           'system_cpu': 'CPU% del sistema', 'system_memory': 'Memoria% del sistema'}
+    
+    def __init__(self, started=None):
+        # Instante de inicio para medir cuánto tarda en aparecer la ventana
+        self.started = started if started is not None else time.perf_counter()
+        self.startup_time = None
         self.root = tk.Tk()
         self.root.title("Administrador de Tareas")
         self.root.geometry("1200x800")
         self.root.configure(bg='#2c3e50')
         
-        # Variables para gráficos dinámicos
-        self.cpu_data = []
-        self.memory_data = []
-        self.time_data = []
-        self.max_points = 50
+        # Historial para gráficos dinámicos (búfer circular con niveles 1s/10s/1min)
+        self.system_series = TimeSeriesStore(('cpu', 'memory'))
+        # Historial por núcleo: una sola matriz tiempo x núcleos
+        self.core_count = psutil.cpu_count() or 1
+        self.core_series = TimeSeriesStore([f'cpu{i}' for i in range(self.core_count)])
+        self.graph_window = 120
+        self.graphs_version = 0
+        
+        # Archivos de datos en el directorio del usuario, no en el de trabajo
+        try:
+            watched_path = data_path('watched_processes.json')
+            history_path = data_path('historial_metricas.db')
+            rules_path = data_path('priority_rules.json')
+            alert_rules_path = data_path('alert_rules.json')
+            alert_log_path = data_path('alertas.log')
+        except OSError:
+            watched_path, history_path = 'watched_processes.json', 'historial_metricas.db'
+            rules_path = 'priority_rules.json'
+            alert_rules_path, alert_log_path = 'alert_rules.json', 'alertas.log'
+        # La lista de observados se guarda con escritura atómica diferida
+        self.watched_file = AtomicJsonFile(watched_path, legacy_path='watched_processes.json')
+        self.save_after_id = None
+        self.save_check_id = None
+        self.save_error = None  # último error de guardado ya informado
+        
+        # Historial persistente en SQLite (opcional: None si no se puede abrir)
+        self.metrics_history = open_history(history_path)
+        
+        # Muestreo compartido de CPU/memoria/disco (etiquetas y gráficos)
+        self.system_sampler = SystemSampler(period=2.0, series=self.system_series,
+                                            core_series=self.core_series,
+                                            history=self.metrics_history)
+        
+        # Última instantánea de procesos (compartida por todas las pestañas)
+        self.current_snapshot = None
+        self.rendered_version = 0
+        self.active_search = ''
+        self.render_error = None    # último error al dibujar la tabla (se informa una vez)
+        
+        # Orden de la tabla: (columna, descendente), la primera es la principal
+        self.sort_keys = [('CPU%', True)]
+        
+        # Registro persistente de procesos: conserva los Process entre muestras
+        self.process_registry = ProcessRegistry()
+        
+        # Líneas de comando: solo se leen cuando una búsqueda las necesita
+        self.cmdline_cache = CmdlineCache(self.process_registry)
+        
+        # Índice de búsqueda (se activa con la primera búsqueda)
+        self.search_index = SearchIndex(self.cmdline_cache)
+        self.search_after_id = None
+        
+        # Muestreador de procesos en segundo plano (doble búfer).
+        # En Linux se lee /proc directamente; si no está disponible se usa psutil.
+        self.process_sampler = BackgroundSampler(collect=select_collector('auto', self.process_registry),
+                                                 period=3.0)
+        self.process_sampler.add_listener(self.search_index.update)
+        # Construir las columnas NumPy en el hilo del muestreador
+        self.process_sampler.add_listener(lambda snapshot: snapshot.columns())
+        
+        # Grabación y reproducción de instantáneas (grabacion se importa al usarlas)
+        self.recorder = None
+        self.replay = None
+        self.process_sampler.add_listener(self.record_snapshot)
+        
+        # Terminación en bloque en un hilo aparte (un trabajo a la vez)
+        self.termination_executor = None
+        self.termination_future = None
         
         # Base de datos de procesos observados
         self.watched_processes = self.load_watched_processes()
         
+        # Historial por proceso observado (solo consulta los PIDs observados)
+        self.watched_tracker = WatchedTracker(period=2.0)
+        self.watched_tracker.set_watched(self.watched_processes)
+        self.graph_process = None
+        self.graph_process_labels = {}
+        self.process_graphs_version = 0
+        self.reconciled_version = 0
+        self.reattach_var = tk.BooleanVar(value=False)
+        
+        # Prioridades automáticas: la de cada observado y reglas por patrón,
+        # aplicadas en el hilo del muestreador con cada instantánea
+        self.rules_file = AtomicJsonFile(rules_path)
+        rules_data = self.rules_file.load()
+        self.priority_rules = list(parse_rules(rules_data.get('rules')))
+        self.priority_enforcer = PriorityEnforcer(enabled=rules_data.get('enabled', True))
+        self.priority_enforcer.set_rules(self.priority_rules)
+        self.priority_enforcer.set_watched(self.watched_processes)
+        self.process_sampler.add_listener(self.priority_enforcer.apply)
+        self.enforce_priorities_var = tk.BooleanVar(value=self.priority_enforcer.enabled)
+        
+        # Alertas por umbral: se evalúan con cada instantánea en el hilo del
+        # muestreador y se muestran como avisos que no bloquean la ventana
+        self.alert_rules_file = AtomicJsonFile(alert_rules_path)
+        alert_data = self.alert_rules_file.load()
+        alert_rules = parse_alert_rules(alert_data['rules']) if 'rules' in alert_data else DEFAULT_RULES
+        self.alert_engine = AlertEngine(alert_rules, log_path=alert_log_path,
+                                        enabled=alert_data.get('enabled', True))
+        self.process_sampler.add_listener(self.evaluate_alerts)
+        self.alert_toast = None
+        self.alert_toast_after_id = None
+        
         # Configurar estilos
         self.setup_styles()
         
         # Crear la interfaz
         self.create_widgets()
         
-        # Iniciar actualización automática
-        self.update_system_info()
+        # Iniciar actualización automática (un solo planificador para todo).
+        # Los hilos de muestreo arrancan cuando la ventana ya está a la vista.
+        self.setup_scheduler()
+        self.root.bind('<Map>', self.on_first_map, add='+')
+        self.root.after(1000, self.start_background_work)
+    
+    def on_first_map(self, event):
+        """Primera aparición de la ventana: medir el arranque e iniciar los muestreos"""
+        if event.widget is not self.root or self.startup_time is not None:
+            return
+        self.startup_time = 0.0
+        self.root.after_idle(self.finish_startup)
+    
+    def finish_startup(self):
+        """Se ejecuta cuando Tk terminó de dibujar la ventana por primera vez"""
+        self.startup_time = time.perf_counter() - self.started
+        if os.environ.get('ADMINISTRADOR_MEDIR_ARRANQUE'):
+            # Modo de medición (benchmarks/bench_arranque.py): informar y salir
+            print(f"arranque_ms={self.startup_time * 1000:.1f}", flush=True)
+            self.root.after(0, self.root.destroy)
+            return
+        self.start_background_work()
+    
+    def start_background_work(self):
+        """Inicia los hilos de muestreo (idempotente)"""
+        self.process_sampler.start()
+        self.watched_tracker.start()
         self.start_real_time_monitoring()
     
+    def setup_scheduler(self):
+        """Registra todas las tareas periódicas en el planificador"""
+        self.scheduler = RefreshScheduler(self.root, self.notebook)
+        system_tab = (str(self.system_frame),)
+        processes_tabs = (str(self.processes_frame), str(self.watched_frame))
+        monitor_tab = (str(self.monitor_frame),)
+        
+        # Hilos de muestreo: rápidos con su pestaña a la vista, lentos en segundo plano
+        self.scheduler.bind_rate('muestreo_procesos', self.process_sampler.set_period,
+                                 self.process_sampler.period, 30.0, tabs=processes_tabs)
+        self.scheduler.bind_rate('muestreo_sistema', self.system_sampler.set_period,
+                                 1.0, 10.0, tabs=system_tab + monitor_tab)
+        self.scheduler.bind_rate('muestreo_observados', self.watched_tracker.set_period,
+                                 2.0, 5.0, tabs=monitor_tab + (str(self.watched_frame),))
+        self.apply_alert_sampling()
+        
+        # Tareas de la interfaz: (periodo activo, periodo en segundo plano; None = pausa)
+        self.scheduler.add('procesos', self.poll_process_snapshots, 0.2, None,
+                           priority=0, tabs=processes_tabs)
+        self.scheduler.add('graficos', self.poll_system_samples, 0.5, None,
+                           priority=1, tabs=monitor_tab)
+        self.scheduler.add('sistema', self.update_system_info, 1.0, 30.0,
+                           priority=2, tabs=system_tab)
+        self.scheduler.add('reproduccion', self.update_replay_controls, 0.5, None,
+                           priority=2, tabs=processes_tabs)
+        self.scheduler.add('observados', self.update_watched_list, 5.0, None,
+                           priority=3, tabs=(str(self.watched_frame),))
+        # El estado de los observados se concilia con cada instantánea, en cualquier pestaña
+        self.scheduler.add('conciliar', self.reconcile_watched_processes, 1.0, 5.0, priority=4)
+        # Los avisos de alertas se muestran en cualquier pestaña
+        self.scheduler.add('alertas', self.show_pending_alerts, 1.0, 1.0, priority=4)
+        self.scheduler.start()
+    
     def setup_styles(self):
         """Configura los estilos de la interfaz"""
         style = ttk.Style()
@@ -70,21 +249,33 @@ class TaskManagerGUI:
     
     def load_watched_processes(self):
         """Carga la lista de procesos observados"""
-        try:
-            if os.path.exists('watched_processes.json'):
-                with open('watched_processes.json', 'r') as f:
-                    return json.load(f)
-            return {}
-        except:
-            return {}
+        data = self.watched_file.load()
+        return data if isinstance(data, dict) else {}
     
     def save_watched_processes(self):
-        """Guarda la lista de procesos observados"""
-        try:
-            with open('watched_processes.json', 'w') as f:
-                json.dump(self.watched_processes, f, indent=2)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al guardar: {e}")
+        """Programa el guardado: los cambios seguidos se escriben una sola vez"""
+        if self.save_after_id is not None:
+            self.root.after_cancel(self.save_after_id)
+        self.save_after_id = self.root.after(500, self.flush_watched_processes)
+    
+    def flush_watched_processes(self):
+        """Entrega la lista al escritor en segundo plano (escritura atómica)"""
+        self.save_after_id = None
+        self.watched_file.save(self.watched_processes)
+        if self.save_check_id is None:
+            self.save_check_id = self.root.after(100, self.check_watched_save)
+    
+    def check_watched_save(self):
+        """Informa el resultado de la escritura en cuanto el escritor termina"""
+        if self.watched_file.busy:
+            self.save_check_id = self.root.after(100, self.check_watched_save)
+            return
+        self.save_check_id = None
+        error = self.watched_file.error
+        message = None if error is None else str(error)
+        if message is not None and message != self.save_error:
+            messagebox.showerror("Error", f"Error al guardar: {error}")
+        self.save_error = message
     
     def create_widgets(self):
         """Crea todos los widgets de la interfaz"""
@@ -103,17 +294,41 @@ class TaskManagerGUI:
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True)
         
-        # Crear todas las pestañas
-        self.create_system_info_tab()
-        self.create_processes_tab()
-        self.create_monitoring_tab()
-        self.create_watched_processes_tab()
-        self.create_actions_tab()
+        # Las pestañas se crean vacías y su contenido se construye al mostrarlas
+        # por primera vez: al inicio solo se arma la de Sistema
+        self.tab_builders = {}
+        self.system_frame = self.add_tab("Sistema", self.create_system_info_tab)
+        self.processes_frame = self.add_tab("Procesos", self.create_processes_tab)
+        self.monitor_frame = self.add_tab("Monitor", self.create_monitoring_tab)
+        self.watched_frame = self.add_tab("Observados", self.create_watched_processes_tab)
+        self.actions_frame = self.add_tab("Acciones", self.create_actions_tab)
+        self.notebook.bind('<<NotebookTabChanged>>', self.build_current_tab)
+        self.build_current_tab()
+        
+        # Redibujar el Monitor al volver a la pestaña o al restaurar la ventana
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed, add='+')
+        self.root.bind('<Map>', self.on_window_mapped, add='+')
+    
+    def add_tab(self, text, builder):
+        """Agrega una pestaña vacía cuyo contenido construye `builder` al mostrarla"""
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=text)
+        self.tab_builders[str(frame)] = builder
+        return frame
+    
+    def build_current_tab(self, event=None):
+        """Construye la pestaña visible si todavía no se construyó"""
+        builder = self.tab_builders.pop(self.notebook.select(), None)
+        if builder is not None:
+            builder()
+    
+    def tab_built(self, frame):
+        """Indica si el contenido de una pestaña ya se construyó"""
+        return str(frame) not in self.tab_builders
     
     def create_system_info_tab(self):
         """Crea la pestaña de información del sistema"""
-        system_frame = ttk.Frame(self.notebook)
-        self.notebook.add(system_frame, text="Sistema")
+        system_frame = self.system_frame
         
         # Marco superior para información básica
         info_frame = tk.Frame(system_frame, bg='#34495e', relief='ridge', bd=2)
@@ -168,16 +383,20 @@ class TaskManagerGUI:
                                         bg='#34495e', fg='#ecf0f1')
         self.disk_total_label.pack()
         
+        # Costo de CPU del propio administrador (medido por el planificador)
+        self.monitor_cost_label = tk.Label(info_frame, text="Costo del monitor: ---",
+                                           bg='#34495e', fg='#bdc3c7')
+        self.monitor_cost_label.pack()
+        
         # Botón de actualización manual
         refresh_btn = ttk.Button(info_frame, text="Actualizar", 
                                 style='Action.TButton',
-                                command=self.update_system_info)
+                                command=self.refresh_system_info)
         refresh_btn.pack(pady=10)
     
     def create_processes_tab(self):
         """Crea la pestaña de procesos"""
-        processes_frame = ttk.Frame(self.notebook)
-        self.notebook.add(processes_frame, text="Procesos")
+        processes_frame = self.processes_frame
         
         # Marco de controles
         controls_frame = tk.Frame(processes_frame, bg='#34495e', relief='ridge', bd=2)
@@ -192,6 +411,7 @@ class TaskManagerGUI:
         
         tk.Label(search_frame, text="Buscar:", bg='#34495e', fg='#ecf0f1').pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', self.on_search_changed)
         search_entry = tk.Entry(search_frame, textvariable=self.search_var, width=30)
         search_entry.pack(side=tk.LEFT, padx=5)
         
@@ -203,6 +423,16 @@ class TaskManagerGUI:
                                           command=self.update_processes_list)
         refresh_processes_btn.pack(side=tk.LEFT, padx=5)
         
+        # Terminar los procesos seleccionados (Ctrl/Shift+clic para elegir varios)
+        terminate_selected_btn = ttk.Button(search_frame, text="Terminar seleccionados",
+                                            command=self.terminate_selected)
+        terminate_selected_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.terminate_tree_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(search_frame, text="Incluir procesos hijos",
+                       variable=self.terminate_tree_var,
+                       bg='#34495e', fg='#ecf0f1', selectcolor='#34495e').pack(side=tk.LEFT, padx=5)
+        
         # Marco para filtros adicionales
         filter_frame = tk.Frame(controls_frame, bg='#34495e')
         filter_frame.pack(pady=5)
@@ -213,9 +443,70 @@ class TaskManagerGUI:
                                          variable=self.show_accessible_only,
                                          bg='#34495e', fg='#ecf0f1',
                                          selectcolor='#34495e',
-                                         command=self.update_processes_list)
+                                         command=self.render_processes)
         accessible_check.pack(side=tk.LEFT, padx=10)
         
+        self.show_all_processes = tk.BooleanVar(value=False)
+        show_all_check = tk.Checkbutton(filter_frame,
+                                        text="Mostrar todos los procesos",
+                                        variable=self.show_all_processes,
+                                        bg='#34495e', fg='#ecf0f1',
+                                        selectcolor='#34495e',
+                                        command=self.render_processes)
+        show_all_check.pack(side=tk.LEFT, padx=10)
+        
+        # Intervalo de actualización automática de la lista
+        tk.Label(filter_frame, text="Actualizar cada (s):", bg='#34495e', fg='#ecf0f1').pack(side=tk.LEFT)
+        self.refresh_period_var = tk.StringVar(value=str(self.process_sampler.period))
+        period_spin = tk.Spinbox(filter_frame, from_=1, to=60, increment=1, width=5,
+                                 textvariable=self.refresh_period_var,
+                                 command=self.apply_refresh_period)
+        period_spin.bind('<Return>', self.apply_refresh_period)
+        period_spin.pack(side=tk.LEFT, padx=5)
+        
+        # Errores al dibujar la tabla (sin diálogos modales: se redibuja cada 0,2 s)
+        self.processes_status_label = tk.Label(filter_frame, text="", bg='#34495e', fg='#e74c3c')
+        self.processes_status_label.pack(side=tk.LEFT, padx=10)
+        
+        # Grabación de instantáneas y reproducción de grabaciones anteriores
+        replay_frame = tk.Frame(controls_frame, bg='#34495e')
+        replay_frame.pack(pady=5)
+        
+        self.recording_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(replay_frame, text="Grabar", variable=self.recording_var,
+                       bg='#34495e', fg='#ecf0f1', selectcolor='#34495e',
+                       command=self.toggle_recording).pack(side=tk.LEFT, padx=10)
+        ttk.Button(replay_frame, text="Reproducir...",
+                   command=self.open_replay).pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(replay_frame, text="Velocidad:", bg='#34495e', fg='#ecf0f1').pack(side=tk.LEFT)
+        self.replay_speed_var = tk.StringVar(value='1x')
+        self.replay_speed_combo = ttk.Combobox(replay_frame, textvariable=self.replay_speed_var,
+                                               values=list(self.REPLAY_SPEEDS),
+                                               state='disabled', width=6)
+        self.replay_speed_combo.bind('<<ComboboxSelected>>', self.set_replay_speed)
+        self.replay_speed_combo.pack(side=tk.LEFT, padx=5)
+        
+        self.replay_paused_var = tk.BooleanVar(value=False)
+        self.replay_pause_check = tk.Checkbutton(replay_frame, text="Pausa",
+                                                 variable=self.replay_paused_var,
+                                                 bg='#34495e', fg='#ecf0f1', selectcolor='#34495e',
+                                                 state='disabled', command=self.toggle_replay_pause)
+        self.replay_pause_check.pack(side=tk.LEFT, padx=5)
+        
+        # La posición se aplica al soltar el control, no en cada movimiento
+        self.replay_scale = tk.Scale(replay_frame, orient=tk.HORIZONTAL, length=250,
+                                     showvalue=False, from_=0, to=1, resolution=1,
+                                     bg='#34495e', highlightthickness=0, state='disabled')
+        self.replay_scale.bind('<ButtonRelease-1>', self.seek_replay)
+        self.replay_scale.pack(side=tk.LEFT, padx=5)
+        
+        self.replay_label = tk.Label(replay_frame, text="En vivo", bg='#34495e', fg='#ecf0f1', width=20)
+        self.replay_label.pack(side=tk.LEFT, padx=5)
+        self.replay_live_btn = ttk.Button(replay_frame, text="En vivo", state='disabled',
+                                          command=self.stop_replay)
+        self.replay_live_btn.pack(side=tk.LEFT, padx=5)
+        
     # (Botón de ayuda de permisos eliminado por solicitud del usuario)
         
         # Lista de procesos con scroll
@@ -225,11 +516,13 @@ class TaskManagerGUI:
         # Crear Treeview para procesos
         columns = ('PID', 'Nombre', 'CPU%', 'Memoria%', 'Memoria(MB)', 'Estado')
         self.processes_tree = ttk.Treeview(list_frame, columns=columns, show='headings',
-                                          style='Custom.Treeview')
+                                          style='Custom.Treeview', selectmode='extended')
+        self.processes_tree.bind('<Delete>', lambda e: self.terminate_selected())
         
         # Configurar columnas
         for col in columns:
-            self.processes_tree.heading(col, text=col)
+            self.processes_tree.heading(col, text=col,
+                                        command=lambda c=col: self.sort_by_column(c))
             if col == 'PID':
                 self.processes_tree.column(col, width=80)
             elif col == 'Nombre':
@@ -241,21 +534,26 @@ class TaskManagerGUI:
             else:
                 self.processes_tree.column(col, width=120)
         
-        # Scrollbar vertical
-        v_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.processes_tree.yview)
-        self.processes_tree.configure(yscrollcommand=v_scrollbar.set)
+        # Scrollbar vertical (controlada por la tabla virtual)
+        v_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        self.process_table = VirtualTable(self.processes_tree, v_scrollbar,
+                                          row_factory=process_row, row_key=process_key)
+        self.update_sort_headings()
 
         # Empaquetar
         self.processes_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        # Cargar procesos inicialmente
-        self.update_processes_list()
+        # Los procesos se cargan cuando el muestreador publica la primera instantánea
     
     def create_monitoring_tab(self):
         """Crea la pestaña de monitoreo con gráficos dinámicos"""
-        monitor_frame = ttk.Frame(self.notebook)
-        self.notebook.add(monitor_frame, text="Monitor")
+        # matplotlib se importa recién aquí: es lo más lento de cargar
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from graficos import SystemFigure
+        
+        monitor_frame = self.monitor_frame
         
         # Marco de título
         title_frame = tk.Frame(monitor_frame, bg='#34495e', relief='ridge', bd=2)
@@ -264,32 +562,43 @@ class TaskManagerGUI:
         ttk.Label(title_frame, text="MONITOREO EN TIEMPO REAL", 
                  style='Subtitle.TLabel').pack(pady=10)
         
-        # Crear figura de matplotlib
-        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(10, 6))
-        self.fig.patch.set_facecolor('#2c3e50')
-        
-        # Configurar gráfico de CPU
-        self.ax1.set_title('Uso de CPU (%)', color='white', fontsize=12, fontweight='bold')
-        self.ax1.set_ylabel('Porcentaje', color='white')
-        self.ax1.set_facecolor('#34495e')
-        self.ax1.tick_params(colors='white')
-        self.ax1.grid(True, alpha=0.3)
-        
-        # Configurar gráfico de Memoria
-        self.ax2.set_title('Uso de Memoria (%)', color='white', fontsize=12, fontweight='bold')
-        self.ax2.set_ylabel('Porcentaje', color='white')
-        self.ax2.set_xlabel('Tiempo', color='white')
-        self.ax2.set_facecolor('#34495e')
-        self.ax2.tick_params(colors='white')
-        self.ax2.grid(True, alpha=0.3)
+        # Figura del sistema: artistas persistentes que solo cambian sus datos
+        self.system_figure = SystemFigure(self.core_count)
+        self.fig = self.system_figure.fig
+        self.ax1, self.ax2, self.ax3 = self.system_figure.axes
+        
+        # Figura del historial de un proceso observado (se muestra en lugar de la del sistema)
+        self.proc_fig = Figure(figsize=(10, 7))
+        proc_axes = self.proc_fig.subplots(2, 2)
+        self.proc_fig.patch.set_facecolor('#2c3e50')
+        (self.proc_ax_cpu, self.proc_ax_rss), (self.proc_ax_threads, self.proc_ax_io) = proc_axes
+        for ax, title in ((self.proc_ax_cpu, 'CPU del proceso (%)'),
+                          (self.proc_ax_rss, 'Memoria RSS (MB)'),
+                          (self.proc_ax_threads, 'Hilos'),
+                          (self.proc_ax_io, 'E/S de disco (KB/s)')):
+            ax.set_title(title, color='white', fontsize=12, fontweight='bold')
+            ax.set_facecolor('#34495e')
+            ax.tick_params(colors='white')
+            ax.grid(True, alpha=0.3)
+        self.proc_cpu_line, = self.proc_ax_cpu.plot([], [], 'r-', linewidth=2)
+        self.proc_rss_line, = self.proc_ax_rss.plot([], [], 'b-', linewidth=2)
+        self.proc_threads_line, = self.proc_ax_threads.plot([], [], 'g-', linewidth=2)
+        self.proc_read_line, = self.proc_ax_io.plot([], [], 'c-', linewidth=2, label='Lectura')
+        self.proc_write_line, = self.proc_ax_io.plot([], [], 'm-', linewidth=2, label='Escritura')
+        self.proc_ax_io.legend(loc='upper left', fontsize=8)
+        self.proc_fig.tight_layout()
+        self.configure_time_axis()
         
         # Integrar matplotlib en tkinter
         canvas_frame = tk.Frame(monitor_frame)
         canvas_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         self.canvas = FigureCanvasTkAgg(self.fig, canvas_frame)
+        # Cada dibujo completo (inicio, cambio de tamaño) renueva el fondo para blitting
+        self.system_figure.attach(self.canvas)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.proc_canvas = FigureCanvasTkAgg(self.proc_fig, canvas_frame)
         
         # Controles de monitoreo
         controls_monitor_frame = tk.Frame(monitor_frame, bg='#34495e')
@@ -299,18 +608,41 @@ class TaskManagerGUI:
         monitor_check = tk.Checkbutton(controls_monitor_frame, 
                                       text="Monitoreo activo",
                                       variable=self.monitoring_active,
+                                      command=self.toggle_monitoring,
                                       bg='#34495e', fg='#ecf0f1',
                                       selectcolor='#34495e')
         monitor_check.pack(side=tk.LEFT, padx=10)
         
+        # Ventana de tiempo mostrada (los niveles del historial cubren hasta un día)
+        tk.Label(controls_monitor_frame, text="Ventana:", bg='#34495e', fg='#ecf0f1').pack(side=tk.LEFT)
+        self.graph_window_var = tk.StringVar(value='2 minutos')
+        window_combo = ttk.Combobox(controls_monitor_frame, textvariable=self.graph_window_var,
+                                    values=list(self.GRAPH_WINDOWS), width=12, state='readonly')
+        window_combo.bind('<<ComboboxSelected>>', self.set_graph_window)
+        window_combo.pack(side=tk.LEFT, padx=5)
+        
+        # Historial de un proceso observado en lugar del sistema completo
+        tk.Label(controls_monitor_frame, text="Mostrar:", bg='#34495e', fg='#ecf0f1').pack(side=tk.LEFT)
+        self.graph_view_var = tk.StringVar(value='Sistema')
+        self.graph_view_combo = ttk.Combobox(controls_monitor_frame, textvariable=self.graph_view_var,
+                                             values=['Sistema'], width=30, state='readonly')
+        self.graph_view_combo.bind('<<ComboboxSelected>>', self.set_graph_view)
+        self.graph_view_combo.pack(side=tk.LEFT, padx=5)
+        
         clear_btn = ttk.Button(controls_monitor_frame, text="Limpiar graficos",
                               command=self.clear_graphs)
         clear_btn.pack(side=tk.RIGHT, padx=10)
+        
+        alerts_btn = ttk.Button(controls_monitor_frame, text="Alertas...",
+                                command=self.edit_alert_rules)
+        alerts_btn.pack(side=tk.RIGHT, padx=5)
+        
+        # Procesos observados disponibles en el selector
+        self.sync_watched_graphs()
     
     def create_watched_processes_tab(self):
         """Crea la pestaña para procesos observados"""
-        watched_frame = ttk.Frame(self.notebook)
-        self.notebook.add(watched_frame, text="Observados")
+        watched_frame = self.watched_frame
         
         # Marco de título
         title_frame = tk.Frame(watched_frame, bg='#34495e', relief='ridge', bd=2)
@@ -339,6 +671,25 @@ class TaskManagerGUI:
                                         command=self.update_watched_list)
         refresh_watched_btn.pack(side=tk.RIGHT, padx=5)
         
+        # Si el programa se reinicia con otro PID, seguirlo por nombre y ejecutable
+        tk.Checkbutton(crud_frame, text="Reasociar al reiniciarse",
+                       variable=self.reattach_var,
+                       bg='#34495e', fg='#ecf0f1',
+                       selectcolor='#34495e').pack(side=tk.RIGHT, padx=10)
+        
+        # Prioridades automáticas (observados y reglas por patrón)
+        priority_rules_frame = tk.Frame(watched_frame, bg='#34495e')
+        priority_rules_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        tk.Checkbutton(priority_rules_frame, text="Aplicar prioridades automáticamente",
+                       variable=self.enforce_priorities_var,
+                       bg='#34495e', fg='#ecf0f1', selectcolor='#34495e',
+                       command=self.toggle_priority_enforcement).pack(side=tk.LEFT, padx=5)
+        ttk.Button(priority_rules_frame, text="Reglas de prioridad...",
+                   command=self.edit_priority_rules).pack(side=tk.LEFT, padx=5)
+        self.priority_status_label = tk.Label(priority_rules_frame, text="", bg='#34495e', fg='#ecf0f1')
+        self.priority_status_label.pack(side=tk.LEFT, padx=10)
+        
         # Lista de procesos observados
         watched_list_frame = tk.Frame(watched_frame)
         watched_list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -369,8 +720,7 @@ class TaskManagerGUI:
     
     def create_actions_tab(self):
         """Crea la pestaña de acciones sobre procesos"""
-        actions_frame = ttk.Frame(self.notebook)
-        self.notebook.add(actions_frame, text="Acciones")
+        actions_frame = self.actions_frame
 
         # Marco de título
         title_frame = tk.Frame(actions_frame, bg='#34495e', relief='ridge', bd=2)
@@ -388,6 +738,10 @@ class TaskManagerGUI:
         tk.Label(terminate_frame, text="PID del proceso:", bg='#e74c3c', fg='white').pack(anchor=tk.W, padx=10, pady=5)
         self.terminate_pid_var = tk.StringVar()
         tk.Entry(terminate_frame, textvariable=self.terminate_pid_var, width=20).pack(anchor=tk.W, padx=10)
+        self.terminate_pid_tree_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(terminate_frame, text="Terminar también todos sus procesos hijos",
+                       variable=self.terminate_pid_tree_var, bg='#e74c3c', fg='white',
+                       selectcolor='#c0392b').pack(anchor=tk.W, padx=10, pady=(5, 0))
         terminate_btn = tk.Button(terminate_frame, text="TERMINAR PROCESO",
                                  bg='#c0392b', fg='white', font=('Arial', 10, 'bold'), command=self.terminate_process)
         terminate_btn.pack(pady=10)
@@ -420,154 +774,142 @@ class TaskManagerGUI:
                             bg='#2980b9', fg='white', font=('Arial', 10, 'bold'), command=self.show_process_info)
         info_btn.pack(pady=10)
     
-    def update_system_info(self):
-        """Actualiza la información del sistema"""
+    def show_system_info(self):
+        """Muestra en las etiquetas la última muestra del sistema"""
+        sample, _ = self.system_sampler.latest()
+        if sample is None:
+            return
         try:
             # CPU
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            cpu_count = psutil.cpu_count()
-            self.cpu_usage_label.config(text=f"Uso: {cpu_percent:.1f}%")
-            self.cpu_cores_label.config(text=f"Núcleos: {cpu_count}")
+            self.cpu_usage_label.config(text=f"Uso: {sample.cpu_percent:.1f}%")
+            self.cpu_cores_label.config(text=f"Núcleos: {sample.cpu_count}")
             
             # Memoria
-            memory = psutil.virtual_memory()
-            self.memory_usage_label.config(text=f"Uso: {memory.percent:.1f}%")
-            self.memory_total_label.config(text=f"Total: {memory.total / (1024**3):.1f} GB")
+            self.memory_usage_label.config(text=f"Uso: {sample.memory_percent:.1f}%")
+            self.memory_total_label.config(text=f"Total: {sample.memory_total / (1024**3):.1f} GB")
             
             # Disco
-            try:
-                disk = psutil.disk_usage('C:' if os.name == 'nt' else '/')
-                disk_percent = (disk.used / disk.total) * 100
-                self.disk_usage_label.config(text=f"Uso: {disk_percent:.1f}%")
-                self.disk_total_label.config(text=f"Total: {disk.total / (1024**3):.1f} GB")
-            except:
+            if sample.disk_total:
+                self.disk_usage_label.config(text=f"Uso: {sample.disk_percent:.1f}%")
+                self.disk_total_label.config(text=f"Total: {sample.disk_total / (1024**3):.1f} GB")
+            else:
                 self.disk_usage_label.config(text="Uso: N/A")
                 self.disk_total_label.config(text="Total: N/A")
             
         except Exception:
             pass
+    
+    def refresh_system_info(self):
+        """Pide una muestra inmediata y la muestra en cuanto esté lista"""
+        self.system_sampler.request_refresh()
+        self.root.after(100, self.show_system_info)
+    
+    def update_system_info(self):
+        """Actualiza la información del sistema (tarea del planificador)"""
+        # Solo lee la muestra ya tomada por el muestreador: nunca bloquea
+        self.show_system_info()
+        self.monitor_cost_label.config(
+            text=f"Costo del monitor: {self.scheduler.cpu_cost:.1f}% de un núcleo")
         
-        # Programar próxima actualización
-        self.root.after(5000, self.update_system_info)
-        
-    def get_safe_process_info(self, proc):
-        """Obtiene información de proceso de manera segura"""
-        info = {
-            'pid': proc.pid,
-            'name': 'N/A',
-            'cpu_percent': 0.0,
-            'memory_percent': 0.0,
-            'memory_mb': 0.0,
-            'status': 'N/A',
-            'accessible': True
-        }
-        
-        try:
-            info['name'] = proc.name()[:30]
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            info['name'] = '[Acceso denegado]'
-            info['accessible'] = False
-        except Exception:
-            info['name'] = '[Error]'
-            info['accessible'] = False
-        
-        try:
-            cpu = proc.cpu_percent()
-            info['cpu_percent'] = cpu if cpu is not None else 0.0
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            info['cpu_percent'] = 0.0
-            info['accessible'] = False
-        except Exception:
-            info['cpu_percent'] = 0.0
-        
-        try:
-            mem_percent = proc.memory_percent()
-            info['memory_percent'] = mem_percent if mem_percent is not None else 0.0
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            info['memory_percent'] = 0.0
-            info['accessible'] = False
-        except Exception:
-            info['memory_percent'] = 0.0
-        
-        try:
-            memory_info = proc.memory_info()
-            info['memory_mb'] = memory_info.rss / (1024*1024) if memory_info else 0.0
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            info['memory_mb'] = 0.0
-            info['accessible'] = False
-        except Exception:
-            info['memory_mb'] = 0.0
-        
-        try:
-            status = proc.status()
-            info['status'] = status[:15] if status else 'N/A'
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            info['status'] = '[Protegido]'
-            info['accessible'] = False
-        except Exception:
-            info['status'] = '[Error]'
-            info['accessible'] = False
-        # Intentar obtener la línea de comando para búsquedas avanzadas
+    def update_processes_list(self):
+        """Actualiza la lista de procesos"""
+        # El botón "Actualizar" muestra la lista completa y pide una muestra nueva
+        self.active_search = ''
+        self.process_sampler.request_refresh()
+        self.render_processes()
+    
+    def latest_snapshot(self):
+        """(instantánea, versión) de la grabación en reproducción o del muestreador"""
+        replay = self.replay
+        return (replay if replay is not None else self.process_sampler).latest()
+    
+    def poll_process_snapshots(self):
+        """Revisa el doble búfer y dibuja solo si hay una instantánea nueva"""
+        snapshot, version = self.latest_snapshot()
+        if version != self.rendered_version and self.tab_built(self.processes_frame):
+            self.render_processes()
+    
+    def apply_refresh_period(self, *args):
+        """Aplica el intervalo de actualización elegido por el usuario"""
         try:
-            cmdline = proc.cmdline()
-            info['cmdline'] = ' '.join(cmdline) if cmdline else ''
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            info['cmdline'] = ''
-        except Exception:
-            info['cmdline'] = ''
+            period = max(PeriodicThread.MIN_PERIOD, float(self.refresh_period_var.get()))
+        except (ValueError, tk.TclError):
+            return
+        self.scheduler.set_active_period('muestreo_procesos', period)
+    
+    def filter_processes(self, columns, search_term=''):
+        """Máscara de filas según el filtro de accesibilidad y la búsqueda"""
+        accessible_only = self.show_accessible_only.get()
+        if not search_term:
+            return columns.mask(accessible_only=accessible_only)
+        
+        matches = self.search_index.search(search_term)
+        if matches is None:
+            # Índice aún vacío: buscar solo por PID y nombre
+            return columns.mask(accessible_only=accessible_only, name_term=search_term)
+        # Buscar por PID exacto, nombre parcial o cmdline parcial (índice)
+        return columns.mask(accessible_only=accessible_only, pids=[pid for pid, _ in matches])
+    
+    def sort_by_column(self, column):
+        """Ordena por una columna; repetir el clic invierte el sentido
 
-        return info
+        Las columnas elegidas antes quedan como criterios de desempate.
+        """
+        primary, descending = self.sort_keys[0]
+        if primary == column:
+            self.sort_keys[0] = (column, not descending)
+        else:
+            # Texto ascendente por defecto; números de mayor a menor
+            default_desc = column not in ('PID', 'Nombre', 'Estado')
+            self.sort_keys = [(column, default_desc)] + \
+                [key for key in self.sort_keys if key[0] != column][:2]
+        self.update_sort_headings()
+        self.render_processes()
     
-    def update_processes_list(self):
-        """Actualiza la lista de procesos"""
-        # Limpiar lista actual
-        for item in self.processes_tree.get_children():
-            self.processes_tree.delete(item)
+    def update_sort_headings(self):
+        """Muestra una flecha en la columna de orden principal"""
+        primary, descending = self.sort_keys[0]
+        for col in self.processes_tree['columns']:
+            arrow = (' ▼' if descending else ' ▲') if col == primary else ''
+            self.processes_tree.heading(col, text=col + arrow)
+    
+    def render_processes(self):
+        """Dibuja la última instantánea terminada en la tabla de procesos"""
+        snapshot, version = self.latest_snapshot()
+        if snapshot is None:
+            return 0
+        self.current_snapshot = snapshot
+        self.rendered_version = version
         
         try:
-            procesos = []
-            accessible_count = 0
-            total_count = 0
-            
-            for proc in psutil.process_iter():
-                total_count += 1
-                try:
-                    info = self.get_safe_process_info(proc)
-                    
-                    # Aplicar filtro si está activado
-                    if self.show_accessible_only.get() and not info['accessible']:
-                        continue
-                    
-                    procesos.append(info)
-                    if info['accessible']:
-                        accessible_count += 1
-                except Exception:
-                    continue
+            columns = snapshot.columns()
+            mask = self.filter_processes(columns, self.active_search)
             
-            # Ordenar por CPU
-            procesos.sort(key=lambda x: x['cpu_percent'], reverse=True)
+            if self.active_search or self.show_all_processes.get():
+                # Resultados de búsqueda o lista completa: se muestran todos
+                limit = None
+            else:
+                # Mostrar top 50 procesos
+                limit = 50
             
-            # Mostrar top 50 procesos
-            displayed_count = min(50, len(procesos))
-            for proc in procesos[:displayed_count]:
-                pid = proc['pid']
-                name = proc['name']
-                cpu = f"{proc['cpu_percent']:.1f}"
-                mem_percent = f"{proc['memory_percent']:.1f}"
-                mem_mb = f"{proc['memory_mb']:.1f}"
-                status = proc['status']
-                
-                self.processes_tree.insert('', 'end', values=(pid, name, cpu, mem_percent, mem_mb, status))
+            # Filtrado, top-k y orden vectorizados sobre las columnas
+            count = show_processes(self.process_table, columns, self.sort_keys, mask, limit)
+            self.report_render_error(None)
             
-            # Actualizar título o mostrar información de estado
-            if not self.show_accessible_only.get() and accessible_count < total_count:
-                restricted_count = total_count - accessible_count
-                print(f"Procesos: {displayed_count} mostrados, {accessible_count} accesibles de {total_count} totales")
-            else:
-                print(f"Procesos mostrados: {displayed_count} de {len(procesos)} totales")
+            return count
                 
         except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar procesos: {e}")
+            self.report_render_error(f"Error al cargar procesos: {e}")
+            return 0
+    
+    def report_render_error(self, message):
+        """Muestra el error en la barra de estado y lo registra una vez por error distinto"""
+        if message == self.render_error:
+            return
+        self.render_error = message
+        if message is not None:
+            print(message, file=sys.stderr, flush=True)
+        self.processes_status_label.config(text=message or "")
     
     def search_processes(self):
         """Busca procesos por nombre"""
@@ -576,122 +918,444 @@ class TaskManagerGUI:
             self.update_processes_list()
             return
         
-        # Limpiar lista
-        for item in self.processes_tree.get_children():
-            self.processes_tree.delete(item)
-        
+        # Filtrar sobre la última instantánea, sin recorrer procesos en el hilo de Tk
+        self.ensure_search_index()
+        self.active_search = search_term
+        found_count = self.render_processes()
+        if found_count == 0 and self.current_snapshot is not None:
+            messagebox.showinfo("Búsqueda", f"No se encontraron procesos con '{search_term}'")
+    
+    def ensure_search_index(self):
+        """Activa el índice de búsqueda la primera vez que se necesita"""
+        if not self.search_index.enabled:
+            self.search_index.enable()
+            self.process_sampler.request_refresh()
+    
+    def on_search_changed(self, *args):
+        """Filtra mientras se escribe, con una espera para agrupar teclas"""
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(150, self.apply_search_filter)
+    
+    def apply_search_filter(self):
+        """Aplica el término escrito en el buscador sin mostrar diálogos"""
+        self.search_after_id = None
+        search_term = self.search_var.get().strip().lower()
+        if search_term:
+            self.ensure_search_index()
+        self.active_search = search_term
+        self.render_processes()
+    
+    def record_snapshot(self, snapshot):
+        """Oyente del muestreador: agrega la instantánea a la grabación activa"""
+        recorder = self.recorder
+        if recorder is None:
+            return
+        sample, _ = self.system_sampler.latest()
+        system = (sample.cpu_percent, sample.memory_percent) if sample else (np.nan, np.nan)
+        recorder.record(snapshot, system)
+    
+    def recordings_dir(self):
+        """Carpeta de las grabaciones (se crea si no existe)"""
         try:
-            found_count = 0
-            for proc in psutil.process_iter():
-                try:
-                    info = self.get_safe_process_info(proc)
-
-                    # Aplicar filtro de accesibilidad si está activado
-                    if self.show_accessible_only.get() and not info['accessible']:
-                        continue
-
-                    # Buscar por PID exacto, nombre parcial o cmdline parcial
-                    pid_str = str(info['pid'])
-                    name_lower = info['name'].lower() if info['name'] else ''
-                    cmd_lower = info.get('cmdline', '').lower()
-
-                    if (search_term == pid_str) or (search_term in name_lower) or (search_term in cmd_lower):
-                        pid = info['pid']
-                        name = info['name']
-                        cpu = f"{info['cpu_percent']:.1f}"
-                        mem_percent = f"{info['memory_percent']:.1f}"
-                        mem_mb = f"{info['memory_mb']:.1f}"
-                        status = info['status']
-
-                        self.processes_tree.insert('', 'end', values=(pid, name, cpu, mem_percent, mem_mb, status))
-                        found_count += 1
-
-                except Exception:
-                    continue
-            
-            if found_count == 0:
-                messagebox.showinfo("Búsqueda", f"No se encontraron procesos con '{search_term}'")
-                        
-        except Exception as e:
-            messagebox.showerror("Error", f"Error en búsqueda: {e}")
+            path = data_path('grabaciones')
+            os.makedirs(path, exist_ok=True)
+        except OSError:
+            path = os.path.abspath('grabaciones')
+            os.makedirs(path, exist_ok=True)
+        return path
+    
+    def toggle_recording(self):
+        """Inicia o detiene la grabación de las instantáneas de procesos"""
+        if not self.recording_var.get():
+            recorder, self.recorder = self.recorder, None
+            if recorder is not None:
+                recorder.close()
+                messagebox.showinfo("Grabación", f"Se grabaron {recorder.frames} instantáneas en:\n"
+                                                 f"{recorder.path}")
+            return
+        from grabacion import SnapshotRecorder
+        try:
+            path = os.path.join(self.recordings_dir(), f"{datetime.now():%Y%m%d-%H%M%S}.atgr")
+            self.recorder = SnapshotRecorder(path, psutil.virtual_memory().total)
+        except (OSError, ValueError) as e:
+            self.recording_var.set(False)
+            messagebox.showerror("Error", f"No se pudo iniciar la grabación: {e}")
+    
+    def open_replay(self):
+        """Abre una grabación y la muestra en lugar de los datos en vivo"""
+        path = filedialog.askopenfilename(title="Abrir grabación", initialdir=self.recordings_dir(),
+                                          filetypes=[("Grabaciones", "*.atgr"), ("Todos", "*")])
+        if not path:
+            return
+        from grabacion import ReplaySampler, SnapshotPlayer
+        try:
+            player = SnapshotPlayer(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"No se pudo abrir la grabación: {e}")
+            return
+        if not len(player.times):
+            player.close()
+            messagebox.showinfo("Reproducción", "La grabación no tiene instantáneas")
+            return
+        self.stop_replay()
+        self.replay = ReplaySampler(player, speed=self.REPLAY_SPEEDS.get(self.replay_speed_var.get(), 1.0))
+        self.replay.set_paused(self.replay_paused_var.get())
+        self.replay.start()
+        self.rendered_version = 0
+        self.graphs_version = 0
+        self.replay_scale.config(state='normal', from_=player.start_time,
+                                 to=max(player.end_time, player.start_time + 1))
+        for widget in (self.replay_pause_check, self.replay_live_btn):
+            widget.config(state='normal')
+        self.replay_speed_combo.config(state='readonly')
+        self.update_replay_controls()
+    
+    def stop_replay(self):
+        """Vuelve a los datos en vivo"""
+        replay, self.replay = self.replay, None
+        if replay is None:
+            return
+        replay.stop()
+        replay.player.close()
+        self.replay_scale.config(state='disabled')
+        for widget in (self.replay_pause_check, self.replay_live_btn):
+            widget.config(state='disabled')
+        self.replay_speed_combo.config(state='disabled')
+        self.replay_label.config(text="En vivo")
+        # Forzar el redibujo con la instantánea y las muestras en vivo
+        self.rendered_version = 0
+        self.graphs_version = 0
+        self.render_processes()
+        self.update_graphs_display(full_redraw=True)
+    
+    def set_replay_speed(self, event=None):
+        if self.replay is not None:
+            self.replay.set_speed(self.REPLAY_SPEEDS.get(self.replay_speed_var.get(), 1.0))
+    
+    def toggle_replay_pause(self):
+        if self.replay is not None:
+            self.replay.set_paused(self.replay_paused_var.get())
+    
+    def seek_replay(self, event=None):
+        """Salta al instante elegido con el control deslizante"""
+        if self.replay is not None:
+            self.replay.seek(float(self.replay_scale.get()))
+            self.update_replay_controls()
+    
+    def update_replay_controls(self):
+        """Muestra la posición de la reproducción en el control deslizante"""
+        replay = self.replay
+        if replay is None:
+            return
+        position = replay.position()
+        self.replay_scale.set(position)
+        self.replay_label.config(text=datetime.fromtimestamp(position).strftime('%Y-%m-%d %H:%M:%S'))
     
     def start_real_time_monitoring(self):
         """Inicia el monitoreo en tiempo real para gráficos"""
-        def update_graphs():
-            while True:
-                if self.monitoring_active.get():
-                    try:
-                        # Obtener datos actuales
-                        cpu_percent = psutil.cpu_percent(interval=1)
-                        memory_percent = psutil.virtual_memory().percent
-                        current_time = datetime.now().strftime("%H:%M:%S")
-                        
-                        # Agregar a listas
-                        self.cpu_data.append(cpu_percent)
-                        self.memory_data.append(memory_percent)
-                        self.time_data.append(current_time)
-                        
-                        # Mantener solo los últimos puntos
-                        if len(self.cpu_data) > self.max_points:
-                            self.cpu_data.pop(0)
-                            self.memory_data.pop(0)
-                            self.time_data.pop(0)
-                        
-                        # Actualizar gráficos
-                        self.root.after(0, self.update_graphs_display)
-                        
-                    except Exception:
-                        pass
-                
-                time.sleep(2)
+        self.system_sampler.start()
+    
+    def poll_system_samples(self):
+        """Redibuja los gráficos cuando el muestreador publica una muestra nueva"""
+        if self.graph_process is not None:
+            _, version = self.watched_tracker.latest()
+            if version != self.process_graphs_version:
+                self.process_graphs_version = version
+                self.update_graphs_display()
+            return
+        # Durante una reproducción el Monitor sigue los cuadros de la grabación
+        source = self.replay if self.replay is not None else self.system_sampler
+        _, version = source.latest()
+        if version != self.graphs_version:
+            self.graphs_version = version
+            self.update_graphs_display()
+    
+    def evaluate_alerts(self, snapshot):
+        """Oyente del muestreador: evalúa las reglas de alerta sobre la instantánea"""
+        sample, _ = self.system_sampler.latest()
+        system = ({'system_cpu': sample.cpu_percent, 'system_memory': sample.memory_percent}
+                  if sample else None)
+        self.alert_engine.evaluate(snapshot, system)
+    
+    def show_pending_alerts(self):
+        """Muestra las alertas nuevas en un aviso que no bloquea la ventana"""
+        alerts = self.alert_engine.take_pending()
+        if not alerts:
+            return
+        lines = [describe_alert(alert) for alert in alerts[-5:]]
+        if len(alerts) > 5:
+            lines.insert(0, f"{len(alerts)} alertas nuevas (las últimas 5):")
+        self.show_toast("\n".join(lines), warning=any(not alert.resolved for alert in alerts))
+    
+    def show_toast(self, text, warning=True, duration_ms=8000):
+        """Aviso en la esquina de la ventana que se cierra solo o con un clic"""
+        self.close_toast()
+        toast = tk.Toplevel(self.root)
+        toast.overrideredirect(True)
+        toast.attributes('-topmost', True)
+        label = tk.Label(toast, text=text, justify=tk.LEFT, padx=12, pady=8,
+                         bg='#e74c3c' if warning else '#27ae60', fg='white', font=('Arial', 10))
+        label.pack()
+        toast.update_idletasks()
+        x = self.root.winfo_rootx() + self.root.winfo_width() - toast.winfo_reqwidth() - 20
+        y = self.root.winfo_rooty() + self.root.winfo_height() - toast.winfo_reqheight() - 20
+        toast.geometry(f"+{max(0, x)}+{max(0, y)}")
+        label.bind('<Button-1>', lambda e: self.close_toast())
+        self.alert_toast = toast
+        self.alert_toast_after_id = self.root.after(duration_ms, self.close_toast)
+    
+    def close_toast(self):
+        if self.alert_toast_after_id is not None:
+            self.root.after_cancel(self.alert_toast_after_id)
+            self.alert_toast_after_id = None
+        if self.alert_toast is not None:
+            self.alert_toast.destroy()
+            self.alert_toast = None
+    
+    def save_alert_rules(self):
+        """Guarda las reglas de alerta y ajusta el muestreo que necesitan"""
+        engine = self.alert_engine
+        self.alert_rules_file.save({'enabled': engine.enabled,
+                                    'rules': [rule._asdict() for rule in engine.rules]})
+        self.apply_alert_sampling()
+    
+    def apply_alert_sampling(self):
+        """Con reglas activas, los muestreos no se ralentizan más que lo que piden las alertas"""
+        period = self.alert_engine.sample_period()
+        for name in ('muestreo_procesos', 'muestreo_sistema'):
+            self.scheduler.set_max_period(name, period)
+    
+    def edit_alert_rules(self):
+        """Diálogo con las reglas de alerta y las últimas alertas (no bloquea la ventana)"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Alertas")
+        dialog.transient(self.root)
         
-        # Ejecutar en hilo separado
-        thread = threading.Thread(target=update_graphs, daemon=True)
-        thread.start()
+        frame = tk.Frame(dialog, padx=10, pady=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        enabled_var = tk.BooleanVar(value=self.alert_engine.enabled)
+        
+        def toggle_enabled():
+            self.alert_engine.enabled = enabled_var.get()
+            self.save_alert_rules()
+        
+        tk.Checkbutton(frame, text="Alertas activas", variable=enabled_var,
+                       command=toggle_enabled).pack(anchor=tk.W)
+        tk.Label(frame, text="Se alerta si el valor supera el umbral durante la duración indicada; "
+                             "se resuelve al bajar del umbral menos la histéresis.",
+                 justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 5))
+        
+        columns = ('Métrica', 'Umbral', 'Duración (s)', 'Histéresis')
+        rules_tree = ttk.Treeview(frame, columns=columns, show='headings', height=6)
+        for col, width in zip(columns, (200, 80, 100, 80)):
+            rules_tree.heading(col, text=col)
+            rules_tree.column(col, width=width)
+        rules_tree.pack(fill=tk.BOTH, expand=True)
+        
+        def refresh():
+            rules_tree.delete(*rules_tree.get_children())
+            for rule in self.alert_engine.rules:
+                rules_tree.insert('', 'end', values=(self.ALERT_METRIC_LABELS[rule.metric],
+                                                     f"{rule.threshold:g}", f"{rule.duration:g}",
+                                                     f"{rule.hysteresis:g}"))
+        
+        form = tk.Frame(frame)
+        form.pack(fill=tk.X, pady=5)
+        metric_var = tk.StringVar(value=self.ALERT_METRIC_LABELS['cpu'])
+        ttk.Combobox(form, textvariable=metric_var, state='readonly', width=25,
+                     values=list(self.ALERT_METRIC_LABELS.values())).pack(side=tk.LEFT)
+        entries = []
+        for label, default in (("Umbral:", "90"), ("Duración:", "30"), ("Histéresis:", "5")):
+            tk.Label(form, text=label).pack(side=tk.LEFT, padx=(5, 0))
+            var = tk.StringVar(value=default)
+            tk.Entry(form, textvariable=var, width=7).pack(side=tk.LEFT)
+            entries.append(var)
+        
+        def add_rule():
+            try:
+                threshold, duration, hysteresis = (float(var.get()) for var in entries)
+            except ValueError:
+                messagebox.showerror("Error", "Umbral, duración e histéresis deben ser números",
+                                     parent=dialog)
+                return
+            if duration < 0 or hysteresis < 0:
+                messagebox.showerror("Error", "La duración y la histéresis no pueden ser negativas",
+                                     parent=dialog)
+                return
+            metrics = {label: metric for metric, label in self.ALERT_METRIC_LABELS.items()}
+            rule = AlertRule(metrics[metric_var.get()], threshold, duration, hysteresis)
+            self.alert_engine.set_rules(self.alert_engine.rules + (rule,))
+            self.save_alert_rules()
+            refresh()
+        
+        def delete_rule():
+            selected = {rules_tree.index(item) for item in rules_tree.selection()}
+            if selected:
+                self.alert_engine.set_rules(rule for i, rule in enumerate(self.alert_engine.rules)
+                                            if i not in selected)
+                self.save_alert_rules()
+                refresh()
+        
+        tk.Button(form, text="Agregar", command=add_rule).pack(side=tk.LEFT, padx=5)
+        tk.Button(frame, text="Eliminar seleccionadas", command=delete_rule).pack(anchor=tk.W)
+        
+        # Últimas alertas (el registro completo está en el archivo)
+        tk.Label(frame, text="Últimas alertas:").pack(anchor=tk.W, pady=(10, 0))
+        recent_list = tk.Listbox(frame, height=8, width=90)
+        recent_list.pack(fill=tk.BOTH, expand=True)
+        for alert in reversed(self.alert_engine.recent):
+            when = datetime.fromtimestamp(alert.timestamp).strftime('%H:%M:%S')
+            recent_list.insert(tk.END, f"{when}  {describe_alert(alert)}")
+        tk.Label(frame, text=f"Registro: {self.alert_engine.log_path}", justify=tk.LEFT).pack(anchor=tk.W)
+        tk.Button(frame, text="Cerrar", width=10, command=dialog.destroy).pack(anchor=tk.E, pady=(5, 0))
+        refresh()
+    
+    def toggle_monitoring(self):
+        """Activa o pausa el registro de muestras en el historial"""
+        self.system_sampler.recording = self.monitoring_active.get()
+    
+    def graphs_visible(self):
+        """Indica si la pestaña Monitor está visible y la ventana no está minimizada"""
+        try:
+            return (self.root.state() not in ('iconic', 'withdrawn')
+                    and self.notebook.select() == str(self.monitor_frame))
+        except tk.TclError:
+            return False
+    
+    def on_tab_changed(self, event=None):
+        """Al mostrar el Monitor se hace un dibujo completo con los datos actuales"""
+        if self.graphs_visible():
+            self.update_graphs_display(full_redraw=True)
     
-    def update_graphs_display(self):
+    def on_window_mapped(self, event):
+        """Al restaurar la ventana minimizada se redibujan los gráficos"""
+        if event.widget is self.root:
+            self.on_tab_changed()
+    
+    def configure_time_axis(self):
+        """Ajusta el eje de tiempo a la ventana elegida (requiere dibujo completo)"""
+        scale, unit = self.graph_time_unit()
+        for ax in (self.ax1, self.ax2, self.ax3, self.proc_ax_threads, self.proc_ax_io,
+                   self.proc_ax_cpu, self.proc_ax_rss):
+            ax.set_xlim(-self.graph_window / scale, 0)
+        for ax in (self.ax3, self.proc_ax_threads, self.proc_ax_io):
+            ax.set_xlabel(f'Tiempo ({unit})', color='white')
+    
+    def update_graphs_display(self, full_redraw=False):
         """Actualiza la visualización de los gráficos"""
+        # No gastar tiempo del hilo principal si nadie está mirando
+        if not self.graphs_visible():
+            return
+        if self.graph_process is not None:
+            self.update_process_graphs()
+            return
         try:
-            # Limpiar gráficos
-            self.ax1.clear()
-            self.ax2.clear()
-            
-            if self.cpu_data and self.memory_data:
-                # Gráfico CPU
-                self.ax1.plot(range(len(self.cpu_data)), self.cpu_data, 'r-', linewidth=2, label='CPU')
-                self.ax1.fill_between(range(len(self.cpu_data)), self.cpu_data, alpha=0.3, color='red')
-                self.ax1.set_title('Uso de CPU (%)', color='white', fontsize=12, fontweight='bold')
-                self.ax1.set_ylabel('Porcentaje', color='white')
-                self.ax1.set_ylim(0, 100)
-                self.ax1.set_facecolor('#34495e')
-                self.ax1.tick_params(colors='white')
-                self.ax1.grid(True, alpha=0.3)
-                
-                # Gráfico Memoria
-                self.ax2.plot(range(len(self.memory_data)), self.memory_data, 'b-', linewidth=2, label='Memoria')
-                self.ax2.fill_between(range(len(self.memory_data)), self.memory_data, alpha=0.3, color='blue')
-                self.ax2.set_title('Uso de Memoria (%)', color='white', fontsize=12, fontweight='bold')
-                self.ax2.set_ylabel('Porcentaje', color='white')
-                self.ax2.set_xlabel('Tiempo', color='white')
-                self.ax2.set_ylim(0, 100)
-                self.ax2.set_facecolor('#34495e')
-                self.ax2.tick_params(colors='white')
-                self.ax2.grid(True, alpha=0.3)
+            # Tiempo relativo al presente en la unidad de la ventana elegida
+            scale, unit = self.graph_time_unit()
+            replay = self.replay
+            if replay is not None:
+                # Reproducción: CPU y memoria grabados, relativos a la posición actual
+                position = replay.position()
+                times, values = replay.player.system_window(position, self.graph_window)
+                x = (times - position) / scale
+            elif self.metrics_history is not None and self.graph_window >= 3600:
+                # Ventanas largas: el historial en disco incluye sesiones anteriores
+                times, values = self.metrics_history.query(self.graph_window)
+                x = (times - time.time()) / scale
+            else:
+                times, values = self.system_series.window(self.graph_window)
+                x = (times - time.monotonic()) / scale
+            figure = self.system_figure
+            figure.set_usage(x, values[:, 0], values[:, 1])
+            if replay is None:
+                times, values = self.core_series.window(self.graph_window)
+                figure.set_cores(times, values, scale)
+            else:
+                # La grabación no guarda el uso por núcleo
+                figure.clear_cores()
+            figure.redraw(full=full_redraw)
             
-            # Actualizar canvas
-            self.canvas.draw()
+        except Exception:
+            pass
+    
+    def update_process_graphs(self):
+        """Dibuja el historial del proceso observado elegido
+
+        Las escalas cambian con los datos, así que se dibuja la figura
+        completa; solo ocurre con una muestra nueva y la pestaña a la vista.
+        """
+        try:
+            store = self.watched_tracker.series(self.graph_process)
+            if store is None:
+                times, values = np.empty(0), np.empty((0, len(WATCHED_SERIES)))
+            else:
+                times, values = store.window(self.graph_window)
+            scale, unit = self.graph_time_unit()
+            x = (times - time.monotonic()) / scale
             
+            lines = (self.proc_cpu_line, self.proc_rss_line, self.proc_threads_line,
+                     self.proc_read_line, self.proc_write_line)
+            for column, line in enumerate(lines):
+                line.set_data(x, values[:, column])
+            for ax in (self.proc_ax_cpu, self.proc_ax_rss, self.proc_ax_threads, self.proc_ax_io):
+                ax.relim()
+                ax.autoscale_view(scalex=False)
+                ax.set_ylim(bottom=0)
+            self.proc_canvas.draw_idle()
         except Exception:
             pass
     
+    def set_graph_view(self, event=None):
+        """Cambia entre los gráficos del sistema y los de un proceso observado"""
+        self.graph_process = self.graph_process_labels.get(self.graph_view_var.get())
+        system_widget = self.canvas.get_tk_widget()
+        process_widget = self.proc_canvas.get_tk_widget()
+        if self.graph_process is None:
+            process_widget.pack_forget()
+            system_widget.pack(fill=tk.BOTH, expand=True)
+        else:
+            system_widget.pack_forget()
+            process_widget.pack(fill=tk.BOTH, expand=True)
+        self.update_graphs_display(full_redraw=True)
+    
+    def sync_watched_graphs(self):
+        """Actualiza el muestreo por proceso, las prioridades y la lista del Monitor"""
+        self.watched_tracker.set_watched(self.watched_processes)
+        self.priority_enforcer.set_watched(self.watched_processes)
+        if not self.tab_built(self.monitor_frame):
+            return
+        self.graph_process_labels = {f"{pid} - {data['name']}": pid
+                                     for pid, data in self.watched_processes.items()}
+        self.graph_view_combo['values'] = ['Sistema'] + list(self.graph_process_labels)
+        if self.graph_process is not None and self.graph_process not in self.watched_processes:
+            self.graph_view_var.set('Sistema')
+            self.set_graph_view()
+    
+    def graph_time_unit(self):
+        """Escala y unidad del eje de tiempo según la ventana mostrada"""
+        if self.graph_window <= 300:
+            return 1, 's'
+        if self.graph_window <= 7200:
+            return 60, 'min'
+        return 3600, 'h'
+    
+    def set_graph_window(self, event=None):
+        """Cambia la ventana de tiempo de los gráficos"""
+        self.graph_window = self.GRAPH_WINDOWS.get(self.graph_window_var.get(), 120)
+        self.configure_time_axis()
+        self.update_graphs_display(full_redraw=True)
+    
     def clear_graphs(self):
         """Limpia los gráficos"""
-        self.cpu_data.clear()
-        self.memory_data.clear()
-        self.time_data.clear()
-        self.ax1.clear()
-        self.ax2.clear()
-        self.canvas.draw()
+        self.system_series.clear()
+        self.core_series.clear()
+        if self.graph_process is not None:
+            store = self.watched_tracker.series(self.graph_process)
+            if store is not None:
+                store.clear()
+        self.update_graphs_display()
 
     def ask_priority_choice(self, title="Seleccionar Prioridad", initial="media"):
         """Muestra un diálogo modal con un Combobox para elegir prioridad.
@@ -709,13 +1373,7 @@ class TaskManagerGUI:
         frame.pack(fill=tk.BOTH, expand=True)
         tk.Label(frame, text="Prioridad:", bg='#f39c12', fg='white').pack(anchor=tk.W)
         # Por defecto, usar mapeo de prioridades del sistema con etiquetas en español
-        priority_choices = [
-            ('realtime', 'Tiempo real'),
-            ('high', 'Alta'),
-            ('normal', 'Normal'),
-            ('below_normal', 'Por debajo de Normal'),
-            ('idle', 'Inactiva'),
-        ]
+        priority_choices = list(self.PRIORITY_LABELS.items())
 
         # Determinar etiqueta inicial
         label_map = {val: label for val, label in priority_choices}
@@ -787,9 +1445,15 @@ class TaskManagerGUI:
         if pid and pid.isdigit():
             pid = int(pid)
             try:
-                if psutil.pid_exists(pid):
-                    process = psutil.Process(pid)
-                    name = process.name()
+                # Reutilizar la última instantánea si el proceso aparece en ella
+                info = self.current_snapshot.get(pid) if self.current_snapshot else None
+                if info is not None and info.accessible:
+                    name = info.name
+                elif psutil.pid_exists(pid):
+                    name = psutil.Process(pid).name()
+                else:
+                    name = None
+                if name is not None:
                     # Usar Combobox modal para evitar entrada libre
                     priority = self.ask_priority_choice("Prioridad de observación", initial="normal")
                     if priority is None:
@@ -799,11 +1463,15 @@ class TaskManagerGUI:
                     # Mapamos prioridades comunes de observación a valores internos
                     obs_priority_map = {'alta': 'high', 'media': 'normal', 'baja': 'idle', 'high': 'high', 'normal': 'normal', 'idle': 'idle'}
                     stored_priority = obs_priority_map.get(priority, 'normal')
+                    # Identidad completa: el PID solo no distingue un proceso que lo reutilizó
+                    create_time, exe = read_identity(pid)
                     self.watched_processes[str(pid)] = {
                         'name': name,
                         'priority': stored_priority,
                         'status': 'activo',
-                        'added': datetime.now().isoformat()
+                        'added': datetime.now().isoformat(),
+                        'create_time': create_time,
+                        'exe': exe
                     }
                     
                     self.save_watched_processes()
@@ -865,22 +1533,119 @@ class TaskManagerGUI:
                 self.update_watched_list()
                 messagebox.showinfo("Éxito", "Proceso eliminado de observación")
     
+    def reconcile_watched_processes(self):
+        """Actualiza solo el estado de los observados con la última instantánea"""
+        snapshot, version = self.process_sampler.latest()
+        if snapshot is None or version == self.reconciled_version:
+            return
+        self.reconciled_version = version
+        if reconcile_watched(self.watched_processes, snapshot, reattach=self.reattach_var.get()):
+            self.save_watched_processes()
+            self.update_watched_list()
+    
+    def toggle_priority_enforcement(self):
+        """Activa o pausa la aplicación automática de prioridades"""
+        self.priority_enforcer.enabled = self.enforce_priorities_var.get()
+        self.save_priority_rules()
+        self.update_watched_list()
+    
+    def save_priority_rules(self):
+        """Guarda las reglas y se las pasa al aplicador de prioridades"""
+        self.priority_enforcer.set_rules(self.priority_rules)
+        self.rules_file.save({'enabled': self.priority_enforcer.enabled,
+                              'rules': [rule._asdict() for rule in self.priority_rules]})
+        # Aplicar en la próxima muestra, no al final del periodo
+        self.process_sampler.request_refresh()
+    
+    def edit_priority_rules(self):
+        """Diálogo para agregar y eliminar reglas de prioridad por patrón"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Reglas de prioridad")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        frame = tk.Frame(dialog, padx=10, pady=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        tk.Label(frame, text="La primera regla que coincide define la prioridad; "
+                             "la de un proceso observado tiene precedencia.\n"
+                             "Patrones con * y ?, sin distinguir mayúsculas (por ejemplo: make*, */bin/ffmpeg).",
+                 justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 5))
+        
+        rules_tree = ttk.Treeview(frame, columns=('Campo', 'Patrón', 'Prioridad'), show='headings', height=8)
+        for col, width in (('Campo', 100), ('Patrón', 250), ('Prioridad', 150)):
+            rules_tree.heading(col, text=col)
+            rules_tree.column(col, width=width)
+        rules_tree.pack(fill=tk.BOTH, expand=True)
+        
+        def refresh():
+            rules_tree.delete(*rules_tree.get_children())
+            for rule in self.priority_rules:
+                rules_tree.insert('', 'end', values=(self.RULE_FIELD_LABELS[rule.field], rule.pattern,
+                                                     self.PRIORITY_LABELS[rule.priority]))
+        
+        form = tk.Frame(frame)
+        form.pack(fill=tk.X, pady=5)
+        field_var = tk.StringVar(value=self.RULE_FIELD_LABELS['name'])
+        ttk.Combobox(form, textvariable=field_var, state='readonly', width=12,
+                     values=[self.RULE_FIELD_LABELS[field] for field in RULE_FIELDS]).pack(side=tk.LEFT)
+        pattern_var = tk.StringVar()
+        tk.Entry(form, textvariable=pattern_var, width=30).pack(side=tk.LEFT, padx=5)
+        priority_var = tk.StringVar(value=self.PRIORITY_LABELS['idle'])
+        ttk.Combobox(form, textvariable=priority_var, state='readonly', width=20,
+                     values=list(self.PRIORITY_LABELS.values())).pack(side=tk.LEFT)
+        
+        def add_rule():
+            pattern = pattern_var.get().strip()
+            if not pattern:
+                messagebox.showwarning("Advertencia", "Escriba un patrón", parent=dialog)
+                return
+            fields = {label: field for field, label in self.RULE_FIELD_LABELS.items()}
+            priorities = {label: priority for priority, label in self.PRIORITY_LABELS.items()}
+            self.priority_rules.append(PriorityRule(fields[field_var.get()], pattern,
+                                                    priorities[priority_var.get()]))
+            pattern_var.set("")
+            self.save_priority_rules()
+            refresh()
+        
+        def delete_rule():
+            indexes = sorted((rules_tree.index(item) for item in rules_tree.selection()), reverse=True)
+            for i in indexes:
+                del self.priority_rules[i]
+            if indexes:
+                self.save_priority_rules()
+                refresh()
+        
+        tk.Button(form, text="Agregar", command=add_rule).pack(side=tk.LEFT, padx=5)
+        buttons = tk.Frame(frame)
+        buttons.pack(fill=tk.X)
+        tk.Button(buttons, text="Eliminar seleccionadas", command=delete_rule).pack(side=tk.LEFT)
+        tk.Button(buttons, text="Cerrar", width=10, command=dialog.destroy).pack(side=tk.RIGHT)
+        refresh()
+    
     def update_watched_list(self):
         """Actualiza la lista de procesos observados"""
+        self.sync_watched_graphs()
+        if not self.tab_built(self.watched_frame):
+            return
         for item in self.watched_tree.get_children():
             self.watched_tree.delete(item)
         
         for pid, data in self.watched_processes.items():
             added_date = data['added'][:19].replace('T', ' ')
             # Mostrar prioridades en español
-            display_priority_map = {'realtime': 'Tiempo real', 'high': 'Alta', 'normal': 'Normal', 'below_normal': 'Por debajo de Normal', 'idle': 'Inactiva'}
-            display_priority = display_priority_map.get(data.get('priority', 'normal'), data.get('priority', 'Normal'))
+            display_priority = self.PRIORITY_LABELS.get(data.get('priority', 'normal'), data.get('priority', 'Normal'))
             display_status = data.get('status', '').capitalize()
 
             self.watched_tree.insert('', 'end', values=(
                 pid, data['name'], display_priority,
                 display_status, added_date
             ))
+        
+        enforcer = self.priority_enforcer
+        status = f"Cambios de prioridad: {enforcer.changes}"
+        if enforcer.denied:
+            status += f"  |  Sin permisos: {enforcer.denied}"
+        self.priority_status_label.config(text=status if enforcer.enabled else "")
     
     def terminate_process(self):
         """Termina un proceso por PID con manejo de permisos."""
@@ -917,23 +1682,16 @@ Terminar procesos del sistema puede causar inestabilidad.
                 except psutil.AccessDenied:
                     pass
 
-                if messagebox.askyesno("Confirmar", f"¿Terminar proceso {name} (PID: {pid})?"):
+                include_tree = self.terminate_pid_tree_var.get()
+                question = (f"¿Terminar proceso {name} (PID: {pid}) y todos sus hijos?" if include_tree
+                            else f"¿Terminar proceso {name} (PID: {pid})?")
+                if messagebox.askyesno("Confirmar", question):
                     try:
-                        process.terminate()
-                        messagebox.showinfo("Éxito", f"Proceso {name} terminado correctamente")
-                        self.terminate_pid_var.set("")
-                        self.update_processes_list()
+                        create_time = process.create_time()
                     except psutil.AccessDenied:
-                        # Sugerir alternativas
-                        error_msg = f"""Permisos insuficientes para terminar el proceso {name}"""
-                        if messagebox.askyesno("Permisos Insuficientes", error_msg):
-                            try:
-                                process.kill()
-                                messagebox.showinfo("Éxito", f"Proceso {name} forzado a terminar")
-                                self.terminate_pid_var.set("")
-                                self.update_processes_list()
-                            except Exception as e:
-                                messagebox.showerror("Error", f"No se pudo forzar la terminación: {e}")
+                        create_time = None
+                    self.terminate_pid_var.set("")
+                    self.start_termination([(pid, create_time)], include_tree)
             else:
                 messagebox.showerror("Error", "El proceso no existe")
         except psutil.NoSuchProcess:
@@ -941,6 +1699,72 @@ Terminar procesos del sistema puede causar inestabilidad.
         except Exception as e:
             messagebox.showerror("Error", f"Error inesperado: {e}")
     
+    def selected_processes(self):
+        """(pid, create_time, nombre) de las filas seleccionadas en la tabla de procesos
+
+        Incluye las seleccionadas que no están a la vista (la tabla virtual
+        solo dibuja la ventana visible).
+        """
+        if not self.tab_built(self.processes_frame):
+            return []
+        return [(info.pid, info.create_time or None, info.name)
+                for info in self.process_table.selected_rows()]
+    
+    def terminate_selected(self):
+        """Termina todos los procesos seleccionados con una sola confirmación"""
+        if self.replay is not None:
+            messagebox.showinfo("Reproducción", "Vuelva a los datos en vivo para terminar procesos")
+            return
+        selected = self.selected_processes()
+        if not selected:
+            messagebox.showinfo("Terminar", "Seleccione uno o más procesos en la tabla")
+            return
+        include_tree = self.terminate_tree_var.get()
+        names = "\n".join(f"• {name} (PID: {pid})" for pid, _, name in selected[:10])
+        if len(selected) > 10:
+            names += f"\n… y {len(selected) - 10} más"
+        children = " y todos sus procesos hijos" if include_tree else ""
+        if messagebox.askyesno("Confirmar", f"¿Terminar {len(selected)} proceso(s){children}?\n\n{names}"):
+            self.start_termination([(pid, create_time) for pid, create_time, _ in selected], include_tree)
+    
+    def start_termination(self, targets, include_tree):
+        """Termina los procesos en un hilo aparte y muestra un único informe al final"""
+        if self.termination_future is not None:
+            messagebox.showinfo("Terminar", "Ya hay una terminación en curso")
+            return
+        if self.termination_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.termination_executor = ThreadPoolExecutor(max_workers=1)
+        self.termination_future = self.termination_executor.submit(
+            self.run_termination, targets, include_tree)
+        self.root.after(100, self.check_termination)
+    
+    @staticmethod
+    def run_termination(targets, include_tree):
+        """terminate() a todos, una sola espera y kill() a los que sigan vivos"""
+        processes, gone = collect_targets(targets, include_tree)
+        return terminate_processes(processes, gone=gone)
+    
+    def check_termination(self):
+        """Espera sin bloquear a que termine el trabajo y muestra el informe"""
+        future = self.termination_future
+        if not future.done():
+            self.root.after(100, self.check_termination)
+            return
+        self.termination_future = None
+        try:
+            report = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Error inesperado: {e}")
+            return
+        if report.denied or report.survivors:
+            messagebox.showwarning("Terminación", format_report(report))
+        else:
+            messagebox.showinfo("Terminación", format_report(report))
+        # La pestaña de procesos se construye al abrirla por primera vez
+        if self.tab_built(self.processes_frame):
+            self.update_processes_list()
+    
     def change_priority(self):
         """Cambia la prioridad de un proceso"""
         pid_str = self.priority_pid_var.get().strip()
@@ -969,19 +1793,8 @@ Terminar procesos del sistema puede causar inestabilidad.
                         return
                 
                 try:
-                    # Mapear prioridades
-                    if os.name == 'nt':  # Windows
-                        priority_map = {
-                            'realtime': psutil.REALTIME_PRIORITY_CLASS,
-                            'high': psutil.HIGH_PRIORITY_CLASS,
-                            'normal': psutil.NORMAL_PRIORITY_CLASS,
-                            'below_normal': psutil.BELOW_NORMAL_PRIORITY_CLASS,
-                            'idle': psutil.IDLE_PRIORITY_CLASS
-                        }
-                        process.nice(priority_map[priority])
-                    else:  # Linux/Mac
-                        nice_map = {'realtime': -20, 'high': -10, 'normal': 0, 'below_normal': 10, 'idle': 19}
-                        process.nice(nice_map[priority])
+                    # Clases de prioridad en Windows, valores de nice en Linux/Mac
+                    process.nice(PRIORITY_VALUES[priority])
                     
                     messagebox.showinfo("Éxito", f"Prioridad de {name} cambiada a {priority}")
                     self.priority_pid_var.set("")
@@ -1047,13 +1860,20 @@ Terminar procesos del sistema puede causar inestabilidad.
                 
                 # Información de rendimiento
                 info_parts.append("\nRendimiento:")
+                # El CPU% sale de la última muestra en vivo: cpu_percent() sobre un
+                # Process nuevo devuelve 0.0 y el del muestreador es de su hilo
+                snapshot, _ = self.process_sampler.latest()
+                row = snapshot.get(pid) if snapshot is not None else None
                 try:
-                    cpu_percent = process.cpu_percent()
-                    info_parts.append(f"• CPU: {cpu_percent:.1f}%")
-                except psutil.AccessDenied:
-                    info_parts.append("• CPU: [Permisos insuficientes]")
-                except Exception:
+                    same = row is not None and abs(row.create_time - process.create_time()) <= IDENTITY_TOLERANCE
+                except psutil.Error:
+                    same = False
+                if not same:
                     info_parts.append("• CPU: [No disponible]")
+                elif row.accessible:
+                    info_parts.append(f"• CPU: {row.cpu_percent:.1f}%")
+                else:
+                    info_parts.append("• CPU: [Permisos insuficientes]")
                 
                 try:
                     memory_percent = process.memory_percent()
@@ -1122,6 +1942,22 @@ Terminar procesos del sistema puede causar inestabilidad.
             pass
         except Exception:
             pass
+        finally:
+            # Escribir los cambios que aún esperaban el guardado diferido
+            if self.save_after_id is not None:
+                self.watched_file.save(self.watched_processes)
+            # La ventana ya no existe: los errores de la última escritura van a stderr
+            for data_file in (self.watched_file, self.rules_file, self.alert_rules_file):
+                if not data_file.flush():
+                    print(f"No se terminó de guardar {data_file.path}", file=sys.stderr)
+                elif data_file.error is not None:
+                    print(f"Error al guardar {data_file.path}: {data_file.error}", file=sys.stderr)
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.replay is not None:
+                self.replay.stop()
+            if self.metrics_history is not None:
+                self.metrics_history.close()
 
 def main():
     """Función principal"""
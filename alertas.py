@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# Motor de alertas por umbral
+# Evalúa todas las reglas sobre cada instantánea en una sola pasada vectorizada
+#
+
+import json
+import math
+import threading
+from collections import deque, namedtuple
+
+import numpy as np
+
+# Métricas por proceso -> columna de ProcessColumns; y métricas del sistema
+PROCESS_METRICS = {'cpu': 'cpu', 'rss_mb': 'rss'}
+SYSTEM_METRICS = ('system_cpu', 'system_memory')
+METRIC_UNITS = {'cpu': '%', 'rss_mb': ' MB', 'system_cpu': '%', 'system_memory': '%'}
+
+# Regla: se dispara si `metric` supera `threshold` durante `duration` segundos
+# seguidos y se resuelve cuando baja de threshold - hysteresis
+AlertRule = namedtuple('AlertRule', ['metric', 'threshold', 'duration', 'hysteresis'])
+AlertRule.__new__.__defaults__ = (0.0, 0.0)
+
+# Evento de alerta; pid/name son None para las métricas del sistema
+Alert = namedtuple('Alert', ['timestamp', 'rule', 'pid', 'name', 'value', 'resolved'])
+
+DEFAULT_RULES = (
+    AlertRule('cpu', 90.0, 60.0, 10.0),
+    AlertRule('system_memory', 90.0, 10.0, 5.0),
+)
+
+# Bits para el PID en la clave (create_time en centésimas de segundo, PID)
+PID_BITS = 24
+
+
+def parse_rules(items):
+    """Reglas válidas a partir de la lista guardada en JSON (las inválidas se ignoran)"""
+    rules = []
+    for item in items or ():
+        try:
+            rule = AlertRule(item['metric'], float(item['threshold']),
+                             float(item.get('duration', 0.0)), float(item.get('hysteresis', 0.0)))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue
+        if (rule.metric in PROCESS_METRICS or rule.metric in SYSTEM_METRICS) and rule.duration >= 0:
+            rules.append(rule)
+    return tuple(rules)
+
+
+def describe_rule(rule):
+    """Texto corto de una regla, p. ej. 'cpu > 90% durante 60 s'"""
+    return f"{rule.metric} > {rule.threshold:g}{METRIC_UNITS[rule.metric]} durante {rule.duration:g} s"
+
+
+def describe_alert(alert):
+    """Texto de una alerta para notificaciones y registros"""
+    unit = METRIC_UNITS[alert.rule.metric]
+    target = f"{alert.name} (PID: {alert.pid})" if alert.pid is not None else "Sistema"
+    if alert.resolved:
+        return f"Resuelta: {target} {alert.rule.metric} = {alert.value:.1f}{unit}"
+    return f"{target}: {describe_rule(alert.rule)} (actual {alert.value:.1f}{unit})"
+
+
+def process_keys(columns):
+    """Clave entera por proceso que combina create_time y PID (sobrevive a la reutilización)"""
+    created = np.round(columns.create_time * 100).astype(np.int64)
+    return (created << PID_BITS) | (columns.pid & ((1 << PID_BITS) - 1))
+
+
+class AlertEngine:
+    """Evalúa reglas de umbral con duración sostenida e histéresis
+
+    El estado por proceso (desde cuándo supera el umbral y si la alerta
+    está activa) se guarda en matrices procesos x reglas solo para los
+    procesos que superan algún umbral o tienen una alerta activa, con las
+    claves (pid, create_time) ordenadas para alinearlas con cada
+    instantánea. El resto se descarta con una comparación vectorizada por
+    métrica, así que el costo casi no depende de la cantidad de procesos.
+    Solo los eventos (disparo o resolución) se convierten en objetos.
+    """
+
+    # Periodo máximo de muestreo mientras haya reglas activas: las instantáneas
+    # siguen llegando aunque la ventana esté en segundo plano
+    SAMPLE_PERIOD = 5.0
+
+    def __init__(self, rules=DEFAULT_RULES, log_path=None, enabled=True):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.log_error = None
+        self.pending = deque(maxlen=1000)  # alertas aún no mostradas
+        self.recent = deque(maxlen=200)    # últimas alertas para la interfaz
+        self._lock = threading.Lock()
+        self.set_rules(rules)
+
+    def set_rules(self, rules):
+        """Reemplaza las reglas y descarta el estado anterior"""
+        rules = tuple(rules)
+        # Reglas por proceso agrupadas por métrica: cada grupo es un rango de columnas
+        process_rules = sorted((rule for rule in rules if rule.metric in PROCESS_METRICS),
+                               key=lambda rule: rule.metric)
+        blocks = []
+        for i, rule in enumerate(process_rules):
+            if blocks and blocks[-1][0] == PROCESS_METRICS[rule.metric]:
+                blocks[-1][1] = slice(blocks[-1][1].start, i + 1)
+            else:
+                blocks.append([PROCESS_METRICS[rule.metric], slice(i, i + 1)])
+        with self._lock:
+            self.rules = rules
+            self._process_rules = process_rules
+            self._blocks = [tuple(block) for block in blocks]
+            self._threshold = np.array([r.threshold for r in process_rules])
+            self._clear = np.array([r.threshold - r.hysteresis for r in process_rules])
+            self._duration = np.array([r.duration for r in process_rules])
+            self._keys = np.empty(0, dtype=np.int64)
+            self._since = np.empty((0, len(process_rules)))
+            self._active = np.empty((0, len(process_rules)), dtype=bool)
+            self._system = {rule: (math.nan, False) for rule in rules if rule.metric in SYSTEM_METRICS}
+
+    def sample_period(self):
+        """Periodo máximo de muestreo que necesitan las reglas (None si no hay ninguna activa)"""
+        if not self.enabled or not self.rules:
+            return None
+        return self.SAMPLE_PERIOD
+
+    def evaluate(self, snapshot, system=None, now=None):
+        """Evalúa una instantánea; `system` es {'system_cpu': %, 'system_memory': %}
+
+        Devuelve las alertas nuevas (disparadas o resueltas) y las agrega a
+        `pending`, `recent` y al registro.
+        """
+        if not self.enabled:
+            return []
+        now = snapshot.timestamp if now is None else now
+        with self._lock:
+            alerts = self._evaluate_processes(snapshot, now) + self._evaluate_system(system or {}, now)
+        if alerts:
+            self.pending.extend(alerts)
+            self.recent.extend(alerts)
+            self.append_log(alerts)
+        return alerts
+
+    def _evaluate_processes(self, snapshot, now):
+        if not self._process_rules:
+            return []
+        columns = snapshot.columns()
+        keys = process_keys(columns)
+
+        # Procesos con estado guardado (alerta activa o umbral superado antes)
+        position = np.searchsorted(self._keys, keys)
+        position[position == len(self._keys)] = 0
+        tracked = self._keys[position] == keys if len(self._keys) else np.zeros(len(keys), dtype=bool)
+
+        # Candidatos: superan el umbral más bajo de alguna métrica o tienen estado
+        candidates = tracked.copy()
+        for metric, block in self._blocks:
+            candidates |= getattr(columns, metric) > self._threshold[block].min()
+        rows = np.flatnonzero(candidates)
+        if not len(rows):
+            self._keys = keys[:0]
+            self._since, self._active = self._since[:0], self._active[:0]
+            return []
+
+        # Matrices candidatos x reglas
+        values = np.empty((len(rows), len(self._process_rules)))
+        for metric, block in self._blocks:
+            values[:, block] = getattr(columns, metric)[rows, None]
+        since = np.full(values.shape, np.nan)
+        active = np.zeros(values.shape, dtype=bool)
+        had_state = tracked[rows]
+        since[had_state] = self._since[position[rows[had_state]]]
+        active[had_state] = self._active[position[rows[had_state]]]
+
+        above = values > self._threshold
+        since = np.where(above, np.where(np.isnan(since), now, since), np.nan)
+        fired = above & ~active & (now - since >= self._duration)
+        resolved = active & (values < self._clear)
+        active = (active | fired) & ~resolved
+
+        # Guardar solo los procesos que siguen con estado, ordenados por clave
+        keep = active.any(axis=1) | ~np.isnan(since).all(axis=1)
+        kept_keys = keys[rows[keep]]
+        order = np.argsort(kept_keys)
+        self._keys = kept_keys[order]
+        self._since = since[keep][order]
+        self._active = active[keep][order]
+
+        alerts = []
+        for flags, is_resolved in ((fired, False), (resolved, True)):
+            for row, rule_index in zip(*np.nonzero(flags)):
+                info = columns.rows[rows[row]]
+                alerts.append(Alert(now, self._process_rules[rule_index], info.pid, info.name,
+                                    float(values[row, rule_index]), is_resolved))
+        return alerts
+
+    def _evaluate_system(self, system, now):
+        alerts = []
+        for rule, (since, active) in self._system.items():
+            value = system.get(rule.metric)
+            if value is None or math.isnan(value):
+                continue
+            if value > rule.threshold:
+                since = now if math.isnan(since) else since
+                if not active and now - since >= rule.duration:
+                    active = True
+                    alerts.append(Alert(now, rule, None, None, value, False))
+            else:
+                since = math.nan
+                if active and value < rule.threshold - rule.hysteresis:
+                    active = False
+                    alerts.append(Alert(now, rule, None, None, value, True))
+            self._system[rule] = (since, active)
+        return alerts
+
+    def append_log(self, alerts):
+        """Agrega las alertas al registro (JSON por líneas, solo se agrega al final)"""
+        if not self.log_path:
+            return
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                for alert in alerts:
+                    record = {'timestamp': alert.timestamp, 'rule': alert.rule._asdict(),
+                              'pid': alert.pid, 'name': alert.name, 'value': alert.value,
+                              'resolved': alert.resolved}
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+                    f.write('\n')
+            self.log_error = None
+        except OSError as e:
+            self.log_error = e
+
+    def take_pending(self):
+        """Alertas nuevas desde la última llamada (para mostrarlas en la interfaz)"""
+        alerts = []
+        while self.pending:
+            alerts.append(self.pending.popleft())
+        return alerts
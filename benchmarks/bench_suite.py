@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# Suite de benchmarks de los caminos críticos
+# Recolección, orden, filtro, búsqueda, tabla de Tk y gráficos con procesos sintéticos
+#
+# Uso: python benchmarks/bench_suite.py [--counts 1000,10000] [--denied 0.1]
+#          [--cmdline 200] [--repeats 5] [--output resultados.json] [--compare base.json]
+#   Sin pantalla la tabla de Tk se omite; con Xvfb: xvfb-run python benchmarks/bench_suite.py
+#   Los gráficos usan el backend Agg de matplotlib y no necesitan pantalla.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from busqueda import SearchIndex
+from columnas import ProcessColumns
+from series import TimeSeriesStore
+from sintetico import SyntheticCmdlineCache, SyntheticProcessSource
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(function, repeats, setup=None):
+    """Tiempos en ms de `repeats` ejecuciones (después de una de calentamiento)
+
+    `setup` corre antes de cada ejecución, fuera de la medición.
+    """
+    function()
+    times = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def result(stage, count, times):
+    return {'stage': stage, 'count': count, 'median_ms': round(statistics.median(times), 3),
+            'min_ms': round(min(times), 3), 'repeats': len(times)}
+
+
+def bench_data(source, repeats):
+    """Recolección, columnas, orden, filtro y búsqueda sobre la misma fuente"""
+    count = source.count
+    # ProcessRegistry.collect_snapshot sobre procesos simulados; el avance de
+    # la simulación (altas, bajas, cambios de CPU) queda fuera de la medición
+    results = [result('collect', count, timed(source.registry.collect_snapshot, repeats,
+                                              setup=source.advance))]
+
+    snapshot = source.collect_snapshot()
+    results.append(result('columns', count, timed(lambda: ProcessColumns(snapshot), repeats)))
+    columns = snapshot.columns()
+    sort_keys = [('CPU%', True), ('Nombre', False)]
+    results.append(result('sort_top50', count, timed(lambda: columns.order(sort_keys, None, 50), repeats)))
+    results.append(result('sort_full', count, timed(lambda: columns.order(sort_keys), repeats)))
+    results.append(result('filter_name', count,
+                          timed(lambda: columns.mask(accessible_only=True, name_term='chrome'), repeats)))
+
+    # Índice de búsqueda: construcción completa, actualización incremental y consulta
+    cache = SyntheticCmdlineCache(source)
+
+    def build_index():
+        index = SearchIndex(cache)
+        index.enable()
+        index.update(snapshot)
+        return index
+
+    results.append(result('search_index_build', count, timed(build_index, repeats)))
+    index = build_index()
+    following = [source.collect_snapshot() for _ in range(repeats + 1)]
+    updates = iter(following)
+    results.append(result('search_index_update', count, timed(lambda: index.update(next(updates)), repeats)))
+    results.append(result('search', count, timed(lambda: index.search('python'), repeats)))
+    return results
+
+
+def bench_render(source, repeats):
+    """Tabla virtual de Tk con una instantánea nueva por repetición (necesita pantalla)"""
+    import tkinter as tk
+    from tkinter import ttk
+    from tabla_procesos import VirtualTable, process_row, show_processes
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"  (tabla de Tk omitida: {e})")
+        return []
+    try:
+        frame = tk.Frame(root)
+        frame.pack(fill=tk.BOTH, expand=True)
+        tree = ttk.Treeview(frame, columns=('PID', 'Nombre', 'CPU%', 'Memoria%', 'Memoria(MB)', 'Estado'),
+                            show='headings', height=30)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        table = VirtualTable(tree, scrollbar, row_factory=process_row)
+        root.update()
+
+        def render():
+            # El mismo camino que render_processes con "Mostrar todos los procesos"
+            columns = source.collect_snapshot().columns()
+            show_processes(table, columns, [('CPU%', True)], columns.mask())
+            root.update_idletasks()
+
+        return [result('render', source.count, timed(render, repeats))]
+    finally:
+        root.destroy()
+
+
+def bench_graphs(repeats, cores=16, window=120):
+    """Dibujo completo y actualización con blitting de la figura del Monitor (Agg)"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from graficos import SystemFigure
+
+    series = TimeSeriesStore(('cpu', 'memory'))
+    core_series = TimeSeriesStore([f'cpu{i}' for i in range(cores)])
+    rng = np.random.default_rng(0)
+    now = time.monotonic()
+    for t in np.arange(now - window, now, 1.0):
+        series.append(rng.uniform(0, 100, 2), t)
+        core_series.append(rng.uniform(0, 100, cores), t)
+
+    # La misma figura que la pestaña Monitor, sobre un lienzo sin pantalla
+    figure = SystemFigure(cores)
+    figure.attach(FigureCanvasAgg(figure.fig))
+    for ax in figure.axes[:2]:
+        ax.set_xlim(-window, 0)
+
+    def update(full):
+        # Mismos pasos que update_graphs_display con datos en vivo
+        times, values = series.window(window)
+        figure.set_usage(times - time.monotonic(), values[:, 0], values[:, 1])
+        figure.set_cores(*core_series.window(window))
+        figure.redraw(full=full)
+
+    update(True)
+    return [result('graph_full', window, timed(lambda: update(True), repeats)),
+            result('graph_blit', window, timed(lambda: update(False), repeats))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, base_path):
+    """Imprime la relación actual/base por etapa (> 1 = más lento que la base)"""
+    with open(base_path, encoding='utf-8') as f:
+        base = {(r['stage'], r['count']): r for r in json.load(f)['results']}
+    print(f"\nComparación con {base_path}:")
+    for r in results:
+        previous = base.get((r['stage'], r['count']))
+        if previous and previous['median_ms'] > 0:
+            ratio = r['median_ms'] / previous['median_ms']
+            print(f"  {r['stage']:<22} {r['count']:>7} {previous['median_ms']:>10.2f} ms -> "
+                  f"{r['median_ms']:>10.2f} ms  {ratio:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de los caminos críticos")
+    parser.add_argument('--counts', default='1000,10000', help="cantidades de procesos separadas por comas")
+    parser.add_argument('--denied', type=float, default=0.1, help="fracción de procesos protegidos")
+    parser.add_argument('--cmdline', type=int, default=200, help="largo de las líneas de comando")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--cores', type=int, default=16, help="núcleos de la franja de calor")
+    parser.add_argument('--output', default='bench_resultados.json', help="archivo JSON de resultados")
+    parser.add_argument('--compare', default=None, help="resultados anteriores para comparar")
+    args = parser.parse_args()
+
+    results = []
+    for count in (int(c) for c in args.counts.split(',')):
+        print(f"{count} procesos sintéticos...")
+        source = SyntheticProcessSource(count, denied_ratio=args.denied, cmdline_size=args.cmdline)
+        results += bench_data(source, args.repeats)
+        results += bench_render(source, args.repeats)
+    print("Gráficos del monitor (Agg)...")
+    results += bench_graphs(args.repeats, cores=args.cores)
+
+    print(f"\n{'Etapa':<22} {'N':>7} {'Mediana':>12} {'Mínimo':>12}")
+    for r in results:
+        print(f"{r['stage']:<22} {r['count']:>7} {r['median_ms']:>9.2f} ms {r['min_ms']:>9.2f} ms")
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'denied_ratio': args.denied, 'cmdline_size': args.cmdline,
+                   'repeats': args.repeats, 'cores': args.cores},
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados en {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
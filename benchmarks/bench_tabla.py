@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Benchmark de la tabla de procesos
+# Cuenta las llamadas Tcl por actualización: borrar y reinsertar todo vs reconciliación
+#
+# Uso: python benchmarks/bench_tabla.py
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabla_procesos import TreeviewReconciler
+
+
+class CountingTree:
+    """Sustituto de ttk.Treeview que solo cuenta las llamadas Tcl"""
+
+    def __init__(self):
+        self.calls = 0
+        self.children = []
+
+    def get_children(self, item=''):
+        self.calls += 1
+        return tuple(self.children)
+
+    def delete(self, *items):
+        self.calls += 1
+        removed = set(items)
+        self.children = [iid for iid in self.children if iid not in removed]
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.calls += 1
+        iid = iid if iid is not None else str(len(self.children))
+        self.children.append(iid)
+        return iid
+
+    def item(self, iid, **kw):
+        self.calls += 1
+
+    def set_children(self, item, *children):
+        self.calls += 1
+        self.children = list(children)
+
+
+def make_rows(count, seed):
+    """Filas sintéticas (iid, valores) con PIDs consecutivos"""
+    rng = random.Random(seed)
+    return [(str(pid), (pid, f"proc{pid}", f"{rng.random() * 5:.1f}", "0.1", "12.0", "sleeping"))
+            for pid in range(1, count + 1)]
+
+
+def next_refresh(rows, rng, churn=0.02, changed=0.10):
+    """Simula una actualización: algunos procesos terminan, otros nacen y otros cambian"""
+    next_pid = max(int(iid) for iid, _ in rows) + 1
+    result = []
+    for iid, values in rows:
+        r = rng.random()
+        if r < churn:
+            continue
+        if r < churn + changed:
+            values = values[:2] + (f"{rng.random() * 5:.1f}",) + values[3:]
+        result.append((iid, values))
+    for _ in range(len(rows) - len(result)):
+        result.append((str(next_pid), (next_pid, f"proc{next_pid}", "0.0", "0.1", "12.0", "running")))
+        next_pid += 1
+    return result
+
+
+def naive_render(tree, rows):
+    """Método original: borrar cada fila y reinsertar todas"""
+    for item in tree.get_children():
+        tree.delete(item)
+    for iid, values in rows:
+        tree.insert('', 'end', values=values)
+
+
+def main():
+    rng = random.Random(1)
+    print(f"{'Filas':>8} {'Borrar+insertar':>16} {'Reconciliación':>15} {'Ahorro':>8}")
+    for count in (1000, 10000):
+        rows = make_rows(count, seed=count)
+        naive_tree = CountingTree()
+        naive_render(naive_tree, rows)
+        fast_tree = CountingTree()
+        reconciler = TreeviewReconciler(fast_tree)
+        reconciler.reconcile(rows)
+
+        refreshes = 10
+        naive_tree.calls = 0
+        fast_tree.calls = 0
+        for _ in range(refreshes):
+            rows = next_refresh(rows, rng)
+            naive_render(naive_tree, rows)
+            reconciler.reconcile(rows)
+
+        naive = naive_tree.calls / refreshes
+        fast = fast_tree.calls / refreshes
+        print(f"{count:>8} {naive:>16.0f} {fast:>15.0f} {naive / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
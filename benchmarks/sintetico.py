@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# Fuente de procesos sintética para los benchmarks
+# Simula hosts de miles de procesos con la misma interfaz que los recolectores
+#
+
+import contextlib
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+
+from recolector import ProcessRegistry
+
+# Nombres típicos; se combinan con un sufijo para que haya muchos distintos
+NAMES = ('chrome', 'firefox', 'python3', 'java', 'node', 'postgres', 'nginx', 'sshd',
+         'bash', 'systemd', 'kworker/0:1', 'containerd-shim', 'dockerd', 'code',
+         'Spotify.exe', 'svchost.exe', 'sqlservr.exe', 'explorer.exe')
+STATUSES = ('sleeping', 'sleeping', 'sleeping', 'running', 'idle', 'disk-sleep', 'stopped', 'zombie')
+
+# Memoria total simulada (MB) para memory_percent
+TOTAL_MEMORY_MB = 16384
+
+pmem = namedtuple('pmem', ['rss'])
+
+
+class SyntheticProcess:
+    """Sustituto de psutil.Process con los métodos que usa ProcessRegistry
+
+    Un proceso protegido devuelve ad_value en todos sus campos, igual que
+    as_dict() de psutil cuando cada lectura lanza AccessDenied.
+    """
+
+    def __init__(self, pid, create_time, name, memory_mb, status, denied):
+        self.pid = pid
+        self.name = name
+        self.memory_mb = memory_mb
+        self.status = status
+        self.denied = denied
+        self.cpu_percent = 0.0
+        self._create_time = create_time
+        # psutil.Process lee create_time sin caché a través de _proc
+        self._proc = self
+
+    def create_time(self):
+        return self._create_time
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def as_dict(self, attrs, ad_value=None):
+        if self.denied:
+            return {attr: self.pid if attr == 'pid' else ad_value for attr in attrs}
+        values = {
+            'pid': self.pid,
+            'name': self.name,
+            'cpu_percent': self.cpu_percent,
+            'memory_percent': self.memory_mb / TOTAL_MEMORY_MB * 100,
+            'memory_info': pmem(int(self.memory_mb * 1024 * 1024)),
+            'status': self.status,
+        }
+        return {attr: values.get(attr, ad_value) for attr in attrs}
+
+
+class SyntheticProcessSource:
+    """Simula un host de `count` procesos y los recolecta con ProcessRegistry
+
+    Cada llamada a collect_snapshot() simula una muestra nueva (cambia el
+    CPU% de una parte de los procesos y reemplaza una fracción `churn` por
+    procesos nuevos) y la recolecta con el mismo código que la aplicación,
+    sobre objetos SyntheticProcess en lugar de psutil. Una fracción
+    `denied_ratio` de los procesos niega el acceso a sus campos.
+    """
+
+    def __init__(self, count=10000, denied_ratio=0.1, cmdline_size=200, churn=0.02, seed=0):
+        self.count = count
+        self.denied_ratio = denied_ratio
+        self.cmdline_size = cmdline_size
+        self.churn = churn
+        self.rng = random.Random(seed)
+        self.boot_time = time.time() - 86400
+        self._next_pid = 1
+        self._processes = {}
+        for _ in range(count):
+            self._add_process()
+        self.registry = ProcessRegistry(pids=lambda: list(self._processes), process=self._process)
+
+    def _add_process(self):
+        pid = self._next_pid
+        self._next_pid += 1
+        rng = self.rng
+        self._processes[pid] = SyntheticProcess(
+            pid=pid,
+            create_time=self.boot_time + pid * 0.01,
+            name=f"{rng.choice(NAMES)}-{rng.randrange(1000)}",
+            memory_mb=rng.lognormvariate(3.0, 1.5),
+            status=rng.choice(STATUSES),
+            denied=rng.random() < self.denied_ratio,
+        )
+
+    def _process(self, pid):
+        """Igual que psutil.Process(pid) para la fuente simulada"""
+        try:
+            return self._processes[pid]
+        except KeyError:
+            raise psutil.NoSuchProcess(pid) from None
+
+    def cmdline(self, info):
+        """Línea de comando sintética de `cmdline_size` caracteres (vacía si está protegido)"""
+        if not info.accessible:
+            return ''
+        base = f"/usr/bin/{info.name} --pid={info.pid} "
+        return (base + 'x' * self.cmdline_size)[:self.cmdline_size]
+
+    def advance(self):
+        """Simula el paso del tiempo entre dos muestras"""
+        rng = self.rng
+        for pid, proc in list(self._processes.items()):
+            r = rng.random()
+            if r < self.churn:
+                del self._processes[pid]
+                self._add_process()
+            elif r < 0.3:
+                proc.cpu_percent = round(rng.expovariate(1.0), 1)
+
+    def collect_snapshot(self):
+        """Misma interfaz que ProcessRegistry.collect_snapshot()"""
+        self.advance()
+        return self.registry.collect_snapshot()
+
+
+class SyntheticCmdlineCache:
+    """Sustituto de CmdlineCache que lee las líneas de comando de la fuente sintética"""
+
+    def __init__(self, source):
+        self.source = source
+
+    def get(self, info):
+        return self.source.cmdline(info)
+
+    def prune(self, snapshot):
+        pass
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# Índice de búsqueda de procesos
+# Trigramas sobre PID, nombre y línea de comando, actualizado por instantánea
+#
+
+import threading
+
+
+def trigrams(text):
+    """Conjunto de trigramas de un texto"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Índice invertido de trigramas sobre los procesos de una instantánea
+
+    Se actualiza de forma incremental desde el hilo del muestreador: solo
+    se indexan los procesos nuevos y se quitan los que terminaron. Las
+    búsquedas trabajan solo en memoria, sin llamadas al sistema.
+    """
+
+    def __init__(self, cmdline_cache=None):
+        self.cmdline_cache = cmdline_cache
+        self.enabled = False
+        self.ready = False
+        self._lock = threading.Lock()
+        self._docs = {}      # (pid, create_time) -> texto en minúsculas
+        self._postings = {}  # trigrama -> conjunto de claves
+
+    def __len__(self):
+        return len(self._docs)
+
+    def enable(self):
+        """Activa el índice; se llena con la próxima instantánea"""
+        self.enabled = True
+
+    def update(self, snapshot):
+        """Sincroniza el índice con una instantánea (listener del muestreador)"""
+        if not self.enabled:
+            return
+
+        alive = {(p.pid, p.create_time): p for p in snapshot}
+        with self._lock:
+            known = set(self._docs)
+
+        # Leer líneas de comando fuera del candado (pueden requerir syscalls)
+        added = {}
+        for key in alive.keys() - known:
+            info = alive[key]
+            cmdline = self.cmdline_cache.get(info) if self.cmdline_cache else ''
+            added[key] = f"{info.pid}\n{info.name}\n{cmdline}".lower()
+
+        with self._lock:
+            for key in known - alive.keys():
+                text = self._docs.pop(key)
+                for gram in trigrams(text):
+                    keys = self._postings.get(gram)
+                    if keys is not None:
+                        keys.discard(key)
+                        if not keys:
+                            del self._postings[gram]
+            for key, text in added.items():
+                self._docs[key] = text
+                for gram in trigrams(text):
+                    self._postings.setdefault(gram, set()).add(key)
+            self.ready = True
+
+        if self.cmdline_cache is not None:
+            self.cmdline_cache.prune(snapshot)
+
+    def search(self, term):
+        """Devuelve las claves (pid, create_time) que coinciden con el término
+
+        Coinciden el PID exacto o el término como subcadena del nombre o
+        de la línea de comando. Devuelve None si el índice aún no está listo.
+        """
+        term = term.strip().lower()
+        with self._lock:
+            if not self.ready:
+                return None
+
+            if len(term) < 3:
+                # Términos cortos: recorrido lineal en memoria
+                candidates = self._docs.keys()
+            else:
+                postings = sorted((self._postings.get(g, set()) for g in trigrams(term)), key=len)
+                candidates = set.intersection(*postings) if postings[0] else set()
+
+            result = set()
+            for key in candidates:
+                pid_str, _, rest = self._docs[key].partition('\n')
+                if term == pid_str or term in rest:
+                    result.add(key)
+            return result
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# Tabla de procesos en columnas
+# Arreglos NumPy por campo para filtrar, ordenar y elegir el top-k sin bucles
+#
+
+import numpy as np
+
+# Códigos numéricos de estado (el orden define el orden al ordenar por Estado)
+STATUS_CODES = {
+    'running': 0, 'sleeping': 1, 'disk-sleep': 2, 'idle': 3, 'waking': 4,
+    'stopped': 5, 'tracing-stop': 6, 'parked': 7, 'wake-kill': 8,
+    'zombie': 9, 'dead': 10,
+}
+UNKNOWN_STATUS = len(STATUS_CODES)
+
+# Columnas de la tabla de la interfaz -> arreglo que se usa para ordenar
+SORT_COLUMNS = {
+    'PID': 'pid',
+    'Nombre': 'name_rank',
+    'CPU%': 'cpu',
+    'Memoria%': 'mem',
+    'Memoria(MB)': 'rss',
+    'Estado': 'status_code',
+}
+
+
+class IndexedRows:
+    """Vista de solo lectura sobre una tupla de filas seleccionadas por índice
+
+    Permite pasar a la tabla virtual miles de filas sin construir una lista:
+    solo se accede a las filas del rango visible.
+    """
+
+    def __init__(self, rows, index):
+        self.rows = rows
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.rows[i] for i in self.index[item]]
+        return self.rows[self.index[item]]
+
+    def __iter__(self):
+        return (self.rows[i] for i in self.index)
+
+
+class ProcessColumns:
+    """Instantánea de procesos almacenada como columnas NumPy"""
+
+    def __init__(self, snapshot):
+        processes = snapshot.processes
+        n = len(processes)
+        self.rows = processes
+        self.pid = np.fromiter((p.pid for p in processes), dtype=np.int64, count=n)
+        self.create_time = np.fromiter((p.create_time for p in processes), dtype=np.float64, count=n)
+        self.cpu = np.fromiter((p.cpu_percent for p in processes), dtype=np.float64, count=n)
+        self.mem = np.fromiter((p.memory_percent for p in processes), dtype=np.float64, count=n)
+        self.rss = np.fromiter((p.memory_mb for p in processes), dtype=np.float64, count=n)
+        self.status_code = np.fromiter((STATUS_CODES.get(p.status, UNKNOWN_STATUS) for p in processes),
+                                       dtype=np.int8, count=n)
+        self.accessible = np.fromiter((p.accessible for p in processes), dtype=bool, count=n)
+        self.names = np.array([p.name.lower() for p in processes], dtype=str)
+        self._name_rank = None
+
+    def __len__(self):
+        return len(self.pid)
+
+    @property
+    def name_rank(self):
+        """Posición de cada nombre en orden alfabético (para ordenar como número)"""
+        if self._name_rank is None:
+            _, self._name_rank = np.unique(self.names, return_inverse=True)
+        return self._name_rank
+
+    def mask(self, accessible_only=False, pids=None, name_term=None):
+        """Máscara booleana de las filas que pasan los filtros"""
+        mask = np.ones(len(self), dtype=bool)
+        if accessible_only:
+            mask &= self.accessible
+        if pids is not None:
+            mask &= np.isin(self.pid, np.fromiter(pids, dtype=np.int64))
+        if name_term is not None:
+            by_name = np.char.find(self.names, name_term) >= 0
+            if name_term.isdigit():
+                by_name |= self.pid == int(name_term)
+            mask &= by_name
+        return mask
+
+    def order(self, sort_keys, mask=None, limit=None):
+        """Índices de las filas ordenadas por una o varias columnas
+
+        `sort_keys` es una lista de (columna, descendente) donde la primera
+        es la principal. Con `limit` se usa partition para descartar las
+        filas que no pueden estar entre los k primeros antes de ordenar;
+        las empatadas en el límite se conservan para que las demás claves
+        decidan cuáles entran.
+        """
+        index = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+        if not sort_keys or len(index) == 0:
+            return index[:limit] if limit else index
+
+        keys = []
+        for column, descending in sort_keys:
+            values = getattr(self, SORT_COLUMNS.get(column, column))[index]
+            keys.append(-values.astype(np.float64) if descending else values)
+
+        if limit is not None and limit < len(index):
+            # Valor de la clave principal en la posición k: todo lo menor entra
+            # seguro y todo lo igual compite por los últimos lugares
+            kth = np.partition(keys[0], limit - 1)[limit - 1]
+            if not np.isnan(kth):
+                top = np.flatnonzero(keys[0] <= kth)
+                index = index[top]
+                keys = [k[top] for k in keys]
+
+        # lexsort usa la última clave como principal; el PID desempata
+        order = np.lexsort([self.pid[index]] + keys[::-1])
+        return index[order[:limit]] if limit else index[order]
+
+    def select(self, index):
+        """Filas correspondientes a un arreglo de índices"""
+        return IndexedRows(self.rows, index)
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# Grabación y reproducción de instantáneas
+# Formato binario compacto: cuadros delta por (pid, create_time) comprimidos con zlib
+#
+
+import math
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from muestreador import PeriodicThread
+from recolector import ProcessInfo, ProcessSnapshot
+
+# Archivo: MAGIC, memoria total (u64) y luego cuadros. Cada cuadro lleva una
+# cabecera sin comprimir (tipo, marca de tiempo, CPU y memoria del sistema,
+# largo) para poder indexar y mostrar el Monitor sin descomprimir nada.
+MAGIC = b'ATGRAB1\n'
+FILE_HEADER = struct.Struct('<Q')
+FRAME_HEADER = struct.Struct('<BdffI')
+KEYFRAME = 1
+COUNT = struct.Struct('<I')
+
+
+class _State:
+    """Procesos de un cuadro en columnas ordenadas por PID
+
+    El CPU% se guarda en décimas (u16) y la memoria en KiB (u32): con esa
+    resolución los procesos inactivos no cambian entre cuadros y el delta
+    queda casi vacío.
+    """
+
+    __slots__ = ('pid', 'create_time', 'cpu', 'rss', 'status', 'accessible', 'name')
+
+    def __init__(self, pid, create_time, cpu, rss, status, accessible, name):
+        self.pid = pid
+        self.create_time = create_time
+        self.cpu = cpu
+        self.rss = rss
+        self.status = status
+        self.accessible = accessible
+        self.name = name
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        processes = sorted(snapshot.processes, key=lambda p: p.pid)
+        n = len(processes)
+        return cls(
+            np.fromiter((p.pid for p in processes), dtype=np.uint32, count=n),
+            np.fromiter((p.create_time for p in processes), dtype=np.float64, count=n),
+            np.fromiter((min(65535, round(p.cpu_percent * 10)) for p in processes), dtype=np.uint16, count=n),
+            np.fromiter((round(p.memory_mb * 1024) for p in processes), dtype=np.uint32, count=n),
+            np.array([p.status for p in processes], dtype=object),
+            np.fromiter((p.accessible for p in processes), dtype=np.uint8, count=n),
+            np.array([p.name for p in processes], dtype=object),
+        )
+
+    def take(self, index):
+        return _State(*(getattr(self, field)[index] for field in self.__slots__))
+
+    def to_snapshot(self, timestamp, total_memory):
+        rss_bytes = self.rss.astype(np.float64) * 1024
+        memory_percent = (rss_bytes / total_memory * 100 if total_memory else np.zeros(len(self.pid))).tolist()
+        memory_mb = (rss_bytes / (1024*1024)).tolist()
+        cpu = (self.cpu / 10).tolist()
+        processes = [
+            ProcessInfo(pid, create_time, name, cpu_percent, mem_percent, mb, status, bool(accessible))
+            for pid, create_time, name, cpu_percent, mem_percent, mb, status, accessible in zip(
+                self.pid.tolist(), self.create_time.tolist(), self.name, cpu, memory_percent,
+                memory_mb, self.status, self.accessible.tolist())
+        ]
+        return ProcessSnapshot(processes, timestamp)
+
+
+# Codificación de bloques: cantidad (u32) seguida de los arreglos en crudo
+
+def _pack_strings(values):
+    data = '\0'.join(values).encode('utf-8')
+    return COUNT.pack(len(data)) + data
+
+
+def _pack_statuses(values):
+    table, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return _pack_strings(table.tolist()) + codes.astype(np.uint8).tobytes()
+
+
+def _pack_state(state):
+    return b''.join((COUNT.pack(len(state.pid)), state.pid.tobytes(), state.create_time.tobytes(),
+                     state.cpu.tobytes(), state.rss.tobytes(), state.accessible.tobytes(),
+                     _pack_statuses(state.status), _pack_strings(state.name)))
+
+
+# Campos que un cuadro delta guarda solo cuando cambian
+DELTA_FIELDS = ('cpu', 'rss', 'status', 'name')
+NUMERIC_DTYPES = {'cpu': np.uint16, 'rss': np.uint32}
+
+
+def _pack_values(field, values):
+    if field == 'status':
+        return _pack_statuses(values)
+    if field == 'name':
+        return _pack_strings(values)
+    return values.tobytes()
+
+
+class _Reader:
+    """Cursor sobre el cuerpo descomprimido de un cuadro"""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def count(self):
+        (n,) = COUNT.unpack_from(self.data, self.pos)
+        self.pos += COUNT.size
+        return n
+
+    def array(self, dtype, n):
+        size = np.dtype(dtype).itemsize * n
+        values = np.frombuffer(self.data, dtype=dtype, count=n, offset=self.pos)
+        self.pos += size
+        return values
+
+    def strings(self, n):
+        size = self.count()
+        text = self.data[self.pos:self.pos + size].decode('utf-8')
+        self.pos += size
+        values = np.empty(n, dtype=object)
+        if n:
+            values[:] = text.split('\0')
+        return values
+
+    def statuses(self, n):
+        size = COUNT.unpack_from(self.data, self.pos)[0]
+        table_text = self.data[self.pos + COUNT.size:self.pos + COUNT.size + size].decode('utf-8')
+        self.pos += COUNT.size + size
+        table = np.array(table_text.split('\0') if n else [], dtype=object)
+        codes = self.array(np.uint8, n)
+        return table[codes] if n else np.empty(0, dtype=object)
+
+    def values(self, field, n):
+        if field == 'status':
+            return self.statuses(n)
+        if field == 'name':
+            return self.strings(n)
+        return self.array(NUMERIC_DTYPES[field], n)
+
+    def state(self):
+        n = self.count()
+        pid = self.array(np.uint32, n)
+        create_time = self.array(np.float64, n)
+        cpu = self.array(np.uint16, n)
+        rss = self.array(np.uint32, n)
+        accessible = self.array(np.uint8, n)
+        status = self.statuses(n)
+        name = self.strings(n)
+        return _State(pid, create_time, cpu, rss, status, accessible, name)
+
+
+def _encode_delta(previous, current):
+    """Cuerpo de un cuadro delta: bajas, altas y solo los campos que cambiaron"""
+    _, ip, ic = np.intersect1d(previous.pid, current.pid, assume_unique=True, return_indices=True)
+    same = previous.create_time[ip] == current.create_time[ic]
+    ip, ic = ip[same], ic[same]
+
+    removed = np.ones(len(previous.pid), dtype=bool)
+    removed[ip] = False
+    added = np.ones(len(current.pid), dtype=bool)
+    added[ic] = False
+
+    parts = [COUNT.pack(int(removed.sum())), previous.pid[removed].tobytes(),
+             _pack_state(current.take(np.flatnonzero(added)))]
+    pids = current.pid[ic]
+    for field in DELTA_FIELDS:
+        after = getattr(current, field)[ic]
+        changed = getattr(previous, field)[ip] != after
+        parts += [COUNT.pack(int(changed.sum())), pids[changed].tobytes(),
+                  _pack_values(field, after[changed])]
+    return b''.join(parts)
+
+
+def _apply_delta(previous, body):
+    """Reconstruye el cuadro siguiente a partir del anterior y un cuerpo delta"""
+    reader = _Reader(body)
+    removed = reader.array(np.uint32, reader.count())
+    added = reader.state()
+
+    state = previous.take(slice(None))
+    for field in DELTA_FIELDS:
+        n = reader.count()
+        pids = reader.array(np.uint32, n)
+        values = reader.values(field, n)
+        if n:
+            column = getattr(state, field).copy()
+            column[np.searchsorted(state.pid, pids)] = values
+            setattr(state, field, column)
+
+    if len(removed):
+        state = state.take(np.flatnonzero(~np.isin(state.pid, removed)))
+    if len(added.pid):
+        merged = _State(*(np.concatenate((getattr(state, f), getattr(added, f))) for f in _State.__slots__))
+        state = merged.take(np.argsort(merged.pid, kind='stable'))
+    return state
+
+
+def _scan_frames(data):
+    """Cabeceras de los cuadros completos de `data` (lo que sigue a la cabecera del archivo)
+
+    Devuelve ([(posición del contenido, tipo, instante, CPU, memoria, largo)],
+    fin del último cuadro completo). Un cuadro cortado al final se ignora.
+    """
+    frames = []
+    pos = 0
+    while pos + FRAME_HEADER.size <= len(data):
+        flag, timestamp, cpu, memory, size = FRAME_HEADER.unpack_from(data, pos)
+        if pos + FRAME_HEADER.size + size > len(data):
+            break  # último cuadro incompleto (grabación interrumpida)
+        frames.append((pos + FRAME_HEADER.size, flag, timestamp, cpu, memory, size))
+        pos += FRAME_HEADER.size + size
+    return frames, pos
+
+
+class SnapshotRecorder:
+    """Agrega instantáneas a un archivo de grabación
+
+    Cada KEYFRAME_INTERVAL cuadros se escribe un cuadro completo (y se
+    reinicia el compresor) para poder saltar a cualquier punto; los demás
+    guardan solo las diferencias con el anterior. Cada cuadro se vacía al
+    disco con Z_SYNC_FLUSH, así que un corte solo pierde el último; al
+    reabrir la grabación ese cuadro cortado se descarta antes de agregar.
+    """
+
+    KEYFRAME_INTERVAL = 200
+
+    def __init__(self, path, total_memory):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a+b')
+        self._file.seek(0, 2)
+        if self._file.tell() == 0:
+            self.total_memory = int(total_memory)
+            self._file.write(MAGIC + FILE_HEADER.pack(self.total_memory))
+        else:
+            self._file.seek(0)
+            if self._file.read(len(MAGIC)) != MAGIC:
+                self._file.close()
+                raise ValueError(f"{path} no es una grabación")
+            (self.total_memory,) = FILE_HEADER.unpack(self._file.read(FILE_HEADER.size))
+            data = self._file.read()
+            _, end = _scan_frames(data)
+            if end < len(data):
+                # Sin esto los cuadros nuevos quedarían detrás del cortado e ilegibles
+                self._file.truncate(len(MAGIC) + FILE_HEADER.size + end)
+            self._file.seek(0, 2)
+        self._previous = None
+        self._since_keyframe = 0
+        self._compressor = None
+        self.frames = 0
+
+    def record(self, snapshot, system=(math.nan, math.nan)):
+        """Agrega una instantánea; `system` es (CPU%, memoria%) del sistema"""
+        state = _State.from_snapshot(snapshot)
+        with self._lock:
+            if self._file.closed:
+                return
+            keyframe = self._previous is None or self._since_keyframe >= self.KEYFRAME_INTERVAL
+            if keyframe:
+                self._compressor = zlib.compressobj(6)
+                self._since_keyframe = 0
+                body = _pack_state(state)
+            else:
+                body = _encode_delta(self._previous, state)
+            payload = self._compressor.compress(body) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._file.write(FRAME_HEADER.pack(KEYFRAME if keyframe else 0, snapshot.timestamp,
+                                               system[0], system[1], len(payload)))
+            self._file.write(payload)
+            self._file.flush()
+            self._previous = state
+            self._since_keyframe += 1
+            self.frames += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class SnapshotPlayer:
+    """Lee una grabación con acceso aleatorio por cuadro o por instante
+
+    Al abrir solo se leen las cabeceras de los cuadros. Avanzar de a un
+    cuadro aplica un solo delta; un salto arranca desde el cuadro completo
+    más cercano anterior.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} no es una grabación")
+        (self.total_memory,) = FILE_HEADER.unpack(self._file.read(FILE_HEADER.size))
+
+        offsets, flags, times, system = [], [], [], []
+        frames, _ = _scan_frames(self._file.read())
+        for pos, flag, timestamp, cpu, memory, size in frames:
+            offsets.append((len(MAGIC) + FILE_HEADER.size + pos, size))
+            flags.append(flag)
+            times.append(timestamp)
+            system.append((cpu, memory))
+        if not flags or not flags[0] & KEYFRAME:
+            self._file.close()
+            raise ValueError(f"{path} no contiene cuadros completos")
+        self.offsets = offsets
+        self.keyframes = np.flatnonzero(np.array(flags) & KEYFRAME)
+        self._keyframe_set = set(self.keyframes.tolist())
+        self.times = np.array(times, dtype=np.float64)
+        self.system = np.array(system, dtype=np.float64).reshape(-1, 2)
+        self._lock = threading.Lock()
+        self._position = None
+        self._state = None
+        self._decompressor = None
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def start_time(self):
+        return float(self.times[0])
+
+    @property
+    def end_time(self):
+        return float(self.times[-1])
+
+    def index_at(self, timestamp):
+        """Último cuadro con marca de tiempo menor o igual a `timestamp`"""
+        return max(0, int(np.searchsorted(self.times, timestamp, side='right')) - 1)
+
+    def _body(self, i):
+        offset, size = self.offsets[i]
+        self._file.seek(offset)
+        return self._decompressor.decompress(self._file.read(size))
+
+    def snapshot(self, i):
+        """Instantánea del cuadro `i`"""
+        with self._lock:
+            i = min(max(0, i), len(self) - 1)
+            keyframe = int(self.keyframes[np.searchsorted(self.keyframes, i, side='right') - 1])
+            if self._position is None or not (keyframe <= self._position <= i):
+                # Saltar: empezar desde el cuadro completo anterior
+                self._decompressor = zlib.decompressobj()
+                self._state = _Reader(self._body(keyframe)).state()
+                self._position = keyframe
+            while self._position < i:
+                self._position += 1
+                if self._position in self._keyframe_set:
+                    self._decompressor = zlib.decompressobj()
+                    self._state = _Reader(self._body(self._position)).state()
+                else:
+                    self._state = _apply_delta(self._state, self._body(self._position))
+            return self._state.to_snapshot(float(self.times[i]), self.total_memory)
+
+    def system_window(self, end_time, seconds):
+        """(tiempos, valores) de CPU y memoria del sistema en la ventana que termina en `end_time`"""
+        start = np.searchsorted(self.times, end_time - seconds)
+        stop = np.searchsorted(self.times, end_time, side='right')
+        return self.times[start:stop], self.system[start:stop]
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class ReplaySampler(PeriodicThread):
+    """Reproduce una grabación con la misma interfaz que el muestreador de procesos
+
+    El reloj de reproducción avanza `speed` segundos de grabación por
+    segundo real; solo se publica una instantánea cuando cambia el cuadro.
+    """
+
+    MIN_PERIOD = 0.1
+
+    def __init__(self, player, speed=1.0, period=0.2):
+        super().__init__(period)
+        self.player = player
+        self.speed = speed
+        self.paused = False
+        self._clock_lock = threading.Lock()
+        self._anchor = (player.start_time, None)  # (instante de grabación, monotónico)
+        self._shown = None
+
+    def position(self):
+        """Instante de la grabación que se está mostrando"""
+        with self._clock_lock:
+            recorded, wall = self._anchor
+            if wall is None or self.paused:
+                return recorded
+            return min(self.player.end_time, recorded + (time.monotonic() - wall) * self.speed)
+
+    def _set_anchor(self, recorded):
+        with self._clock_lock:
+            self._anchor = (recorded, None if self.paused else time.monotonic())
+
+    def seek(self, timestamp):
+        """Salta a un instante de la grabación"""
+        self._set_anchor(min(max(timestamp, self.player.start_time), self.player.end_time))
+        self.request_refresh()
+
+    def set_speed(self, speed):
+        self._set_anchor(self.position())
+        self.speed = speed
+
+    def set_paused(self, paused):
+        position = self.position()
+        self.paused = paused
+        self._set_anchor(position)
+
+    def start(self):
+        self._set_anchor(self.position())
+        super().start()
+
+    def tick(self):
+        index = self.player.index_at(self.position())
+        if index == self._shown:
+            return None
+        self._shown = index
+        return self.player.snapshot(index)
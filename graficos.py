@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# Gráficos del Monitor
+# Figura de CPU, memoria y núcleos con artistas persistentes y blitting (sin Tk)
+#
+
+import time
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+
+def fill_vertices(x, y):
+    """Polígono del área bajo la curva para un PolyCollection"""
+    if not len(x):
+        return []
+    polygon = np.empty((len(x) + 2, 2))
+    polygon[0] = (x[0], 0)
+    polygon[1:-1, 0] = x
+    polygon[1:-1, 1] = y
+    polygon[-1] = (x[-1], 0)
+    return [polygon]
+
+
+def _style_axes(ax, title, ylabel=None):
+    ax.set_title(title, color='white', fontsize=12, fontweight='bold')
+    if ylabel:
+        ax.set_ylabel(ylabel, color='white')
+    ax.set_facecolor('#34495e')
+    ax.tick_params(colors='white')
+
+
+class SystemFigure:
+    """Figura del Monitor: uso de CPU, de memoria y franja de calor por núcleo
+
+    Los artistas se crean una vez y luego solo cambian sus datos. Al
+    asociarla a un lienzo (attach) cada dibujo completo guarda el fondo
+    estático y redraw() dibuja solo los artistas encima (blitting). La usan
+    la interfaz (FigureCanvasTkAgg) y los benchmarks (FigureCanvasAgg).
+    """
+
+    def __init__(self, core_count):
+        self.core_count = core_count
+        self.canvas = None
+        self.background = None
+
+        self.fig = Figure(figsize=(10, 7))
+        self.ax1, self.ax2, self.ax3 = self.fig.subplots(
+            3, 1, gridspec_kw={'height_ratios': [3, 3, 2]})
+        self.fig.patch.set_facecolor('#2c3e50')
+
+        for ax, title in ((self.ax1, 'Uso de CPU (%)'), (self.ax2, 'Uso de Memoria (%)')):
+            _style_axes(ax, title, 'Porcentaje')
+            ax.set_ylim(0, 100)
+            ax.grid(True, alpha=0.3)
+
+        # Franja de calor por núcleo: una sola imagen, sin importar cuántos núcleos haya
+        _style_axes(self.ax3, 'CPU por núcleo (%)', 'Núcleo')
+        self.ax3.set_ylim(core_count - 0.5, -0.5)
+        self.cores_image = self.ax3.imshow(np.full((core_count, 1), np.nan), aspect='auto',
+                                           cmap='inferno', vmin=0, vmax=100,
+                                           interpolation='nearest', animated=True)
+
+        self.cpu_line, = self.ax1.plot([], [], 'r-', linewidth=2, label='CPU', animated=True)
+        self.cpu_fill = PolyCollection([], facecolors='red', alpha=0.3, animated=True)
+        self.ax1.add_collection(self.cpu_fill)
+        self.memory_line, = self.ax2.plot([], [], 'b-', linewidth=2, label='Memoria', animated=True)
+        self.memory_fill = PolyCollection([], facecolors='blue', alpha=0.3, animated=True)
+        self.ax2.add_collection(self.memory_fill)
+
+    @property
+    def axes(self):
+        return (self.ax1, self.ax2, self.ax3)
+
+    def attach(self, canvas):
+        """Asocia el lienzo; cada dibujo completo renueva el fondo para blitting"""
+        self.canvas = canvas
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        """Dibuja solo las líneas, rellenos y la franja de núcleos"""
+        for ax, artists in ((self.ax1, (self.cpu_fill, self.cpu_line)),
+                            (self.ax2, (self.memory_fill, self.memory_line)),
+                            (self.ax3, (self.cores_image,))):
+            for artist in artists:
+                ax.draw_artist(artist)
+
+    def set_usage(self, x, cpu, memory):
+        """Curvas de CPU y memoria; x es el tiempo relativo al presente"""
+        self.cpu_line.set_data(x, cpu)
+        self.cpu_fill.set_verts(fill_vertices(x, cpu))
+        self.memory_line.set_data(x, memory)
+        self.memory_fill.set_verts(fill_vertices(x, memory))
+
+    def set_cores(self, times, values, scale=1, now=None):
+        """Franja de calor con la matriz tiempo x núcleos (tiempos monotónicos)"""
+        if len(times) < 2:
+            self.clear_cores()
+            return
+        now = time.monotonic() if now is None else now
+        # Cada columna cubre desde su muestra hasta la siguiente
+        self.cores_image.set_data(values.T)
+        self.cores_image.set_extent(((times[0] - now) / scale, (times[-1] - now) / scale,
+                                     self.core_count - 0.5, -0.5))
+
+    def clear_cores(self):
+        self.cores_image.set_data(np.full((self.core_count, 1), np.nan))
+
+    def redraw(self, full=False):
+        """Dibujo completo o, si ya hay fondo guardado, solo los artistas"""
+        if full or self.background is None:
+            # _on_draw renueva el fondo y dibuja los datos
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self.draw_artists()
+            self.canvas.blit(self.fig.bbox)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# Historial persistente de métricas
+# SQLite en modo WAL con inserciones por lotes, consolidación y retención
+#
+
+import itertools
+import math
+import threading
+import time
+
+import numpy as np
+
+try:
+    import sqlite3
+except ImportError:  # Python compilado sin sqlite3: el historial queda deshabilitado
+    sqlite3 = None
+
+# Niveles: (resolución en segundos, retención en segundos). El nivel 0
+# guarda las muestras tal como llegan; los demás son promedios por intervalo.
+DEFAULT_LEVELS = (
+    (1.0, 86400.0),             # muestras crudas durante 1 día
+    (60.0, 30 * 86400.0),       # 1 min durante 30 días
+    (3600.0, 365 * 86400.0),    # 1 hora durante 1 año
+)
+
+
+class MetricsHistory:
+    """Historial de métricas del sistema guardado en SQLite
+
+    record() se llama desde el hilo del muestreador y solo acumula filas en
+    memoria; se escriben en lote cada BATCH_SIZE muestras o FLUSH_INTERVAL
+    segundos. Cada ROLLUP_INTERVAL segundos los datos se consolidan en los
+    niveles más gruesos y se borra lo que supera la retención. Las consultas
+    usan su propia conexión: en modo WAL no bloquean al escritor.
+    """
+
+    BATCH_SIZE = 30
+    FLUSH_INTERVAL = 10.0
+    ROLLUP_INTERVAL = 60.0
+
+    def __init__(self, path, names=('cpu', 'memory'), levels=DEFAULT_LEVELS):
+        if sqlite3 is None:
+            raise RuntimeError("Este Python no incluye sqlite3")
+        if not all(name.isidentifier() for name in names):
+            raise ValueError("Los nombres de las series deben ser identificadores")
+        self.path = path
+        self.names = tuple(names)
+        self.levels = levels
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._last_rollup = float('-inf')
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        columns = ', '.join(f'{name} REAL' for name in self.names)
+        self._writer.execute(f"CREATE TABLE IF NOT EXISTS metrics ("
+                             f"level INTEGER NOT NULL, ts REAL NOT NULL, {columns}, "
+                             f"PRIMARY KEY (level, ts)) WITHOUT ROWID")
+        self._writer.commit()
+        self._reader = self._connect()
+
+        self._columns = ', '.join(self.names)
+        self._averages = ', '.join(f'AVG({name})' for name in self.names)
+        self._insert = (f"INSERT OR REPLACE INTO metrics (level, ts, {self._columns}) "
+                        f"VALUES (0, ?, {', '.join('?' * len(self.names))})")
+
+    def _connect(self):
+        # Las conexiones se crean en el hilo de Tk y el escritor se usa desde
+        # el muestreador; cada una tiene su propio candado
+        return sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+
+    def record(self, values, timestamp=None):
+        """Agrega una muestra (marca de tiempo de reloj, time.time())"""
+        if timestamp is None:
+            timestamp = time.time()
+        with self._write_lock:
+            self._pending.append((timestamp, *values))
+            now = time.monotonic()
+            if len(self._pending) >= self.BATCH_SIZE or now - self._last_flush >= self.FLUSH_INTERVAL:
+                self._flush(now)
+
+    def flush(self):
+        """Escribe de inmediato las muestras pendientes"""
+        with self._write_lock:
+            self._flush(time.monotonic())
+
+    def _flush(self, now):
+        self._last_flush = now
+        if self._pending:
+            with self._writer:
+                self._writer.executemany(self._insert, self._pending)
+            self._pending.clear()
+        if now - self._last_rollup >= self.ROLLUP_INTERVAL:
+            self._last_rollup = now
+            self._rollup(time.time())
+
+    def _rollup(self, wall_now):
+        """Consolida los intervalos cerrados en cada nivel y aplica la retención"""
+        with self._writer:
+            for level in range(1, len(self.levels)):
+                step = self.levels[level][0]
+                last = self._writer.execute("SELECT MAX(ts) FROM metrics WHERE level = ?",
+                                            (level,)).fetchone()[0]
+                start = last + step if last is not None else float('-inf')
+                end = math.floor(wall_now / step) * step  # el intervalo en curso aún no cierra
+                self._writer.execute(
+                    f"INSERT OR REPLACE INTO metrics (level, ts, {self._columns}) "
+                    f"SELECT ?, CAST(ts / ? AS INTEGER) * ?, {self._averages} FROM metrics "
+                    f"WHERE level = ? AND ts >= ? AND ts < ? GROUP BY CAST(ts / ? AS INTEGER)",
+                    (level, step, step, level - 1, start, end, step))
+            for level, (_, retention) in enumerate(self.levels):
+                self._writer.execute("DELETE FROM metrics WHERE level = ? AND ts < ?",
+                                     (level, wall_now - retention))
+
+    def query(self, seconds, max_points=1000, now=None):
+        """Devuelve (tiempos, valores) de los últimos `seconds` segundos
+
+        Se usa el nivel más grueso cuya resolución alcanza para `max_points`
+        puntos, completado con el tramo reciente de los niveles más finos que
+        aún no se consolidó. El promedio por intervalo se hace en SQLite y el
+        resultado se lee directo a arreglos NumPy, sin listas de filas.
+        Las marcas de tiempo son de reloj (time.time()).
+        """
+        if now is None:
+            now = time.time()
+        start = now - seconds
+        bucket = seconds / max_points
+        level = 0
+        for i, (step, retention) in enumerate(self.levels):
+            if step <= bucket and retention >= seconds:
+                level = i
+        step = max(bucket, self.levels[level][0])
+
+        width = len(self.names) + 1
+        parts = []
+        with self._read_lock:
+            for source in range(level, -1, -1):
+                cursor = self._reader.execute(
+                    f"SELECT MIN(ts), {self._averages} FROM metrics "
+                    f"WHERE level = ? AND ts >= ? GROUP BY CAST(ts / ? AS INTEGER) ORDER BY 1",
+                    (source, start, step))
+                block = np.fromiter(itertools.chain.from_iterable(cursor), dtype=np.float64)
+                block = block.reshape(-1, width)
+                if len(block):
+                    parts.append(block)
+                    # Lo más fino solo completa lo que el nivel grueso aún no tiene
+                    covered = self._reader.execute("SELECT MAX(ts) FROM metrics WHERE level = ?",
+                                                   (source,)).fetchone()[0]
+                    start = covered + self.levels[source][0]
+        if not parts:
+            return np.empty(0), np.empty((0, len(self.names)))
+        data = np.vstack(parts)
+        return data[:, 0], data[:, 1:]
+
+    def close(self):
+        """Escribe lo pendiente y cierra las conexiones"""
+        with self._write_lock:
+            try:
+                self._flush(time.monotonic())
+            finally:
+                self._writer.close()
+        with self._read_lock:
+            self._reader.close()
+
+
+def open_history(path, names=('cpu', 'memory')):
+    """Abre el historial persistente o devuelve None si no está disponible"""
+    try:
+        return MetricsHistory(path, names)
+    except Exception:
+        return None
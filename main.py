@@ -4,29 +4,68 @@ Administrador de Tareas - Punto de entrada principal
 Interfaz gráfica para gestión de procesos del sistema
 """
 
+import time
+
+# Referencia para medir cuánto tarda en aparecer la ventana
+STARTED = time.perf_counter()
+
+import argparse
+import importlib.util
 import os
 import sys
 
+def parse_args(argv=None):
+    """Opciones de línea de comando"""
+    parser = argparse.ArgumentParser(description="Administrador de Tareas")
+    parser.add_argument('--headless', action='store_true',
+                        help="sin interfaz: emite instantáneas como JSON por líneas (NDJSON)")
+    parser.add_argument('--interval', type=float, default=2.0,
+                        help="segundos entre instantáneas en modo sin interfaz (por defecto 2)")
+    parser.add_argument('--fields', default=None,
+                        help="campos por proceso separados por comas (por defecto todos)")
+    parser.add_argument('--output', default=None,
+                        help="archivo de salida (se agrega al final); por defecto stdout")
+    parser.add_argument('--count', type=int, default=0,
+                        help="cantidad de instantáneas a emitir (0 = sin límite)")
+    parser.add_argument('--backend', choices=('auto', 'proc', 'psutil'), default='auto',
+                        help="recolector de procesos")
+    parser.add_argument('--record', default=None, metavar='ARCHIVO',
+                        help="agrega las instantáneas a una grabación binaria (sin NDJSON salvo con --output)")
+    args = parser.parse_args(argv)
+    if args.interval <= 0:
+        parser.error("--interval debe ser mayor que 0")
+    return parser, args
+
+def headless_main(parser, args):
+    """Modo sin interfaz: no importa tkinter, matplotlib ni pandas"""
+    # Solo se busca, igual que en el modo gráfico: sin_interfaz la importa después
+    if importlib.util.find_spec('psutil') is None:
+        print("Error: Falta la dependencia requerida psutil (pip install psutil)", file=sys.stderr)
+        return 1
+
+    from sin_interfaz import FIELDS, parse_fields, run_headless
+    try:
+        fields = parse_fields(args.fields) if args.fields else FIELDS
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        run_headless(interval=args.interval, fields=fields, output=args.output,
+                     count=args.count, backend=args.backend, record=args.record)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
 def main():
     """Función principal"""
+    parser, args = parse_args()
+    if args.headless:
+        sys.exit(headless_main(parser, args))
+
     try:
-        # Verificar dependencias críticas
-        missing_deps = []
-        
-        try:
-            import psutil
-        except ImportError:
-            missing_deps.append("psutil")
-        
-        try:
-            import matplotlib
-        except ImportError:
-            missing_deps.append("matplotlib")
-        
-        try:
-            import tkinter
-        except ImportError:
-            missing_deps.append("tkinter")
+        # Verificar dependencias críticas sin importarlas (solo se buscan)
+        missing_deps = [dep for dep in ("psutil", "matplotlib", "numpy", "tkinter")
+                        if importlib.util.find_spec(dep) is None]
         
         if missing_deps:
             print("Error: Faltan dependencias requeridas:")
@@ -38,7 +77,7 @@ def main():
         
         # Iniciar aplicación
         from administrador_de_tareas import TaskManagerGUI
-        app = TaskManagerGUI()
+        app = TaskManagerGUI(started=STARTED)
         app.run()
         
     except ImportError as e:
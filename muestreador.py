@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# Muestreador en segundo plano
+# Recolecta instantáneas fuera del hilo de Tk y las publica en un doble búfer
+#
+
+import os
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+from recolector import ProcessRegistry
+from recolector_linux import LinuxProcCollector
+
+
+def select_collector(backend='auto', registry=None):
+    """Elige la función de recolección según el backend pedido
+
+    'proc' usa el recolector rápido de /proc (solo Linux), 'psutil' usa el
+    registro de procesos y 'auto' usa /proc si está disponible y, si no,
+    vuelve a psutil automáticamente.
+    """
+    if backend in ('auto', 'proc') and LinuxProcCollector.available():
+        try:
+            return LinuxProcCollector().collect_snapshot
+        except (OSError, RuntimeError, ValueError):
+            pass
+    if registry is None:
+        registry = ProcessRegistry()
+    return registry.collect_snapshot
+
+
+class DoubleBuffer:
+    """Doble búfer: el productor arma el valor aparte y lo publica de una vez
+
+    El lector solo ve valores terminados; nunca una instantánea a medias.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._front = None
+        self._version = 0
+
+    def publish(self, value):
+        """Intercambia el búfer visible por un valor ya terminado"""
+        with self._lock:
+            self._front = value
+            self._version += 1
+
+    def latest(self):
+        """Devuelve (valor, versión) del último valor publicado"""
+        with self._lock:
+            return self._front, self._version
+
+
+class PeriodicThread:
+    """Hilo que ejecuta tick() cada `period` segundos con cadencia fija"""
+
+    MIN_PERIOD = 0.5
+
+    def __init__(self, period):
+        self.period = period
+        self.buffer = DoubleBuffer()
+        self.listeners = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Inicia el hilo de muestreo (idempotente)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo de muestreo"""
+        self._stop.set()
+        self._wake.set()
+
+    def set_period(self, period):
+        """Cambia el periodo de muestreo y aplica el cambio de inmediato"""
+        self.period = max(self.MIN_PERIOD, float(period))
+        self._wake.set()
+
+    def add_listener(self, callback):
+        """Registra una función que recibe cada resultado antes de publicarlo
+
+        Se ejecuta en el hilo del muestreador, nunca en el hilo de Tk.
+        """
+        self.listeners.append(callback)
+
+    def request_refresh(self):
+        """Pide una muestra inmediata sin esperar al próximo periodo"""
+        self._wake.set()
+
+    def latest(self):
+        """Último resultado terminado y su versión"""
+        return self.buffer.latest()
+
+    def tick(self):
+        """Produce un resultado (None = no publicar nada); lo implementa cada muestreador"""
+        raise NotImplementedError
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                result = self.tick()
+                # None: nada nuevo que publicar en este tick
+                if result is not None:
+                    for callback in self.listeners:
+                        try:
+                            callback(result)
+                        except Exception:
+                            pass
+                    self.buffer.publish(result)
+            except Exception:
+                pass
+            # Descontar lo que tardó la muestra para mantener la cadencia
+            self._wake.wait(max(0.0, self.period - (time.monotonic() - started)))
+            self._wake.clear()
+
+
+class BackgroundSampler(PeriodicThread):
+    """Hilo que recolecta instantáneas de procesos cada `period` segundos"""
+
+    def __init__(self, collect=None, period=3.0):
+        super().__init__(period)
+        # Por defecto se usa un registro propio para que el CPU% sea real
+        self.collect = collect if collect is not None else ProcessRegistry().collect_snapshot
+
+    def tick(self):
+        return self.collect()
+
+
+# Muestra del estado general del sistema
+SystemSample = namedtuple('SystemSample', [
+    'timestamp', 'cpu_percent', 'per_cpu', 'cpu_count', 'memory_percent', 'memory_total',
+    'disk_percent', 'disk_total'
+])
+
+
+class SystemSampler(PeriodicThread):
+    """Muestreo compartido de CPU, memoria y disco sin esperas bloqueantes
+
+    cpu_percent(interval=None) mide el uso desde la llamada anterior, así
+    que no duerme: la primera llamada fija la línea base y cada tick
+    devuelve el delta desde el tick previo. Las etiquetas de "Sistema" y los
+    gráficos del Monitor leen la misma muestra.
+    """
+
+    MIN_PERIOD = 0.25
+
+    def __init__(self, period=1.0, series=None, core_series=None, history=None):
+        super().__init__(period)
+        self.series = series
+        self.core_series = core_series  # una serie por núcleo (matriz tiempo x núcleos)
+        self.history = history  # historial persistente opcional (MetricsHistory)
+        self.recording = True
+        self.cpu_count = psutil.cpu_count()
+        self.disk_path = 'C:' if os.name == 'nt' else '/'
+        # Línea base para la primera medición (total y por núcleo)
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+
+    def tick(self):
+        timestamp = time.monotonic()
+        cpu_percent = psutil.cpu_percent(interval=None)
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+        memory = psutil.virtual_memory()
+        try:
+            disk = psutil.disk_usage(self.disk_path)
+            disk_percent, disk_total = (disk.used / disk.total) * 100, disk.total
+        except Exception:
+            disk_percent, disk_total = None, None
+
+        if self.recording and self.series is not None:
+            self.series.append((cpu_percent, memory.percent), timestamp)
+        if self.recording and self.core_series is not None:
+            self.core_series.append(per_cpu, timestamp)
+        if self.recording and self.history is not None:
+            # Un error de disco no debe impedir publicar la muestra
+            try:
+                self.history.record((cpu_percent, memory.percent))
+            except Exception:
+                pass
+
+        return SystemSample(timestamp, cpu_percent, tuple(per_cpu), self.cpu_count, memory.percent,
+                            memory.total, disk_percent, disk_total)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# Procesos observados
+# Historial por proceso (CPU, RSS, hilos, E/S) de los procesos en observación
+#
+
+import math
+import threading
+import time
+
+import numpy as np
+import psutil
+
+from muestreador import PeriodicThread
+from recolector import DENIED_NAME
+from series import TimeSeriesStore
+
+# Niveles de historial por proceso: 2 s durante 1 hora y 1 min durante 1 día
+WATCHED_TIERS = (
+    (2.0, 3600.0),
+    (60.0, 86400.0),
+)
+
+# Series guardadas para cada proceso observado
+WATCHED_SERIES = ('cpu', 'rss_mb', 'threads', 'read_kbs', 'write_kbs')
+
+# Diferencia máxima de create_time (s) para considerar que es el mismo proceso
+IDENTITY_TOLERANCE = 0.05
+
+# Estados que se actualizan solos; 'inactivo' es solo una marca del usuario
+AUTOMATIC_STATUSES = ('activo', 'suspendido', 'terminado')
+
+
+def read_identity(pid):
+    """Identidad (create_time, exe) de un proceso vivo; exe vacío si no se puede leer"""
+    proc = psutil.Process(pid)
+    with proc.oneshot():
+        create_time = proc.create_time()
+        try:
+            exe = proc.exe()
+        except (psutil.AccessDenied, psutil.ZombieProcess):
+            exe = ''
+    return create_time, exe
+
+
+def same_process(entry, info):
+    """Indica si la fila de la instantánea es el mismo proceso que la entrada
+
+    Se compara create_time siempre que la fila lo tenga, aunque el proceso
+    esté protegido (en Windows y macOS se lee igual). Las entradas antiguas
+    no tienen create_time: decide el nombre, y solo si no se puede leer se
+    acepta el PID sin confirmar (ver identity_confirmed).
+    """
+    create_time = entry.get('create_time')
+    if create_time is None:
+        return info.name == DENIED_NAME or info.name == entry.get('name', '')[:30]
+    if not info.create_time:
+        # La entrada tiene identidad pero la fila no: no se puede confirmar
+        return False
+    return abs(info.create_time - create_time) <= IDENTITY_TOLERANCE
+
+
+def identity_confirmed(entry, info):
+    """La fila confirma la entrada: create_time conocido o nombre legible que coincide"""
+    if entry.get('create_time') is not None:
+        return same_process(entry, info)
+    return info.name != DENIED_NAME and info.name == entry.get('name', '')[:30]
+
+
+def _find_restarted(entry, snapshot, taken):
+    """Busca el mismo programa con otro PID (mismo nombre y, si se conoce, mismo exe)"""
+    columns = snapshot.columns()
+    name = entry.get('name', '')[:30]
+    candidates = np.flatnonzero(columns.names == name.lower())
+    # El más reciente primero
+    for i in sorted(candidates, key=lambda i: -snapshot.processes[i].create_time):
+        info = snapshot.processes[i]
+        if info.pid in taken or info.name != name:
+            continue
+        if info.create_time <= (entry.get('create_time') or 0.0):
+            continue
+        if entry.get('exe'):
+            try:
+                _, exe = read_identity(info.pid)
+            except psutil.Error:
+                continue
+            if exe and exe != entry['exe']:
+                continue
+        return info
+    return None
+
+
+def reconcile_watched(watched, snapshot, reattach=False):
+    """Actualiza el estado de las entradas observadas con una instantánea
+
+    Compara la identidad (pid, create_time) de cada entrada con la fila del
+    mismo PID: las que faltan o cuyo PID fue reutilizado pasan a
+    'terminado'. Solo se consultan los PIDs observados, O(observados). Con
+    `reattach` una entrada terminada se vuelve a asociar al mismo programa
+    reiniciado con otro PID. Modifica `watched` y devuelve True si cambió.
+    """
+    changed = False
+    alive = {}
+    for key, entry in watched.items():
+        info = snapshot.get(int(key)) if key.isdigit() else None
+        if info is not None and same_process(entry, info):
+            alive[key] = info
+    gone = watched.keys() - alive.keys()
+
+    for key, info in alive.items():
+        entry = watched[key]
+        # La identidad solo se guarda si el nombre la confirma
+        if entry.get('create_time') is None and info.create_time and identity_confirmed(entry, info):
+            entry['create_time'] = info.create_time
+            changed = True
+        status = 'suspendido' if info.status == 'stopped' else 'activo'
+        if entry.get('status') in AUTOMATIC_STATUSES and entry.get('status') != status:
+            entry['status'] = status
+            changed = True
+
+    for key in gone:
+        if watched[key].get('status') != 'terminado':
+            watched[key]['status'] = 'terminado'
+            changed = True
+
+    if reattach and gone:
+        taken = {int(key) for key in watched if key.isdigit()}
+        for key in gone:
+            info = _find_restarted(watched[key], snapshot, taken)
+            if info is None:
+                continue
+            entry = watched.pop(key)
+            entry.update(create_time=info.create_time, status='activo')
+            watched[str(info.pid)] = entry
+            taken.add(info.pid)
+            changed = True
+    return changed
+
+
+class WatchedTracker(PeriodicThread):
+    """Registra el comportamiento de cada proceso observado en su propio búfer circular
+
+    En cada tick solo se consultan los PIDs observados (costo O(observados)),
+    nunca la lista completa de procesos. Los objetos Process se conservan
+    entre ticks para que el CPU% y las tasas de E/S sean deltas reales.
+    """
+
+    def __init__(self, period=2.0, tiers=WATCHED_TIERS):
+        super().__init__(period)
+        self.tiers = tiers
+        self._lock = threading.Lock()
+        self._watched = {}      # clave (PID como texto) -> create_time esperado o None
+        self._procs = {}        # clave -> psutil.Process
+        self._last_io = {}      # clave -> (instante, bytes leídos, bytes escritos)
+        self._series = {}       # clave -> TimeSeriesStore
+
+    def set_watched(self, watched):
+        """Reemplaza los procesos observados (llamado desde Tk con watched_processes)"""
+        with self._lock:
+            self._watched = {key: entry.get('create_time') for key, entry in watched.items()}
+            for key in [key for key in self._series if key not in self._watched]:
+                del self._series[key]
+                self._procs.pop(key, None)
+                self._last_io.pop(key, None)
+
+    def series(self, key):
+        """Historial de un proceso observado o None"""
+        with self._lock:
+            return self._series.get(key)
+
+    def _process(self, key, now):
+        proc = self._procs.get(key)
+        if proc is not None and proc.is_running():
+            return proc
+        self._procs.pop(key, None)
+        self._last_io.pop(key, None)
+        try:
+            proc = psutil.Process(int(key))
+            # No seguir a otro proceso que reutilizó el PID
+            expected = self._watched.get(key)
+            if expected is not None and abs(proc.create_time() - expected) > IDENTITY_TOLERANCE:
+                return None
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            return None
+        # Primera lectura: fija la línea base del CPU% y de la E/S
+        try:
+            proc.cpu_percent()
+            io = proc.io_counters()
+            self._last_io[key] = (now, io.read_bytes, io.write_bytes)
+        except (psutil.Error, AttributeError, NotImplementedError):
+            pass
+        self._procs[key] = proc
+        return proc
+
+    def _sample(self, key, proc, now):
+        """Lee CPU, RSS, hilos y E/S de un proceso en un solo oneshot()"""
+        with proc.oneshot():
+            cpu = proc.cpu_percent()
+            rss_mb = proc.memory_info().rss / (1024*1024)
+            threads = proc.num_threads()
+            try:
+                io = proc.io_counters()
+            except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                io = None
+
+        read_kbs = write_kbs = math.nan
+        if io is not None:
+            previous = self._last_io.get(key)
+            self._last_io[key] = (now, io.read_bytes, io.write_bytes)
+            # Recién agregado: aún no hay intervalo para calcular la tasa
+            read_kbs = write_kbs = 0.0
+            if previous is not None and now > previous[0]:
+                elapsed = now - previous[0]
+                read_kbs = (io.read_bytes - previous[1]) / 1024 / elapsed
+                write_kbs = (io.write_bytes - previous[2]) / 1024 / elapsed
+        return (cpu, rss_mb, threads, read_kbs, write_kbs)
+
+    def tick(self):
+        now = time.monotonic()
+        with self._lock:
+            watched = list(self._watched)
+
+        latest = {}
+        for key in watched:
+            proc = self._process(key, now)
+            if proc is None:
+                continue
+            try:
+                values = self._sample(key, proc, now)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                self._procs.pop(key, None)
+                continue
+            except psutil.AccessDenied:
+                continue
+            with self._lock:
+                if key not in self._watched:
+                    continue
+                store = self._series.get(key)
+                if store is None:
+                    store = self._series[key] = TimeSeriesStore(WATCHED_SERIES, self.tiers)
+            store.append(values, now)
+            latest[key] = dict(zip(WATCHED_SERIES, values))
+        return latest
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Persistencia
+# Directorio de datos por usuario y escritura atómica diferida de archivos JSON
+#
+
+import json
+import os
+import sys
+import tempfile
+import threading
+
+APP_NAME = 'AdministradorDeTareas'
+
+
+def user_data_dir(app_name=APP_NAME):
+    """Directorio de datos del usuario (se crea si no existe)
+
+    Windows: %APPDATA%, macOS: ~/Library/Application Support, otros:
+    $XDG_DATA_HOME o ~/.local/share. No depende del directorio de trabajo.
+    """
+    if os.name == 'nt':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Application Support')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    path = os.path.join(base, app_name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_path(filename):
+    """Ruta de un archivo dentro del directorio de datos del usuario"""
+    return os.path.join(user_data_dir(), filename)
+
+
+def atomic_write(path, payload):
+    """Escribe `payload` (bytes) de forma atómica: temporal + fsync + rename
+
+    Si el programa se interrumpe a mitad de la escritura el archivo anterior
+    queda intacto; nunca se ve un archivo a medio escribir.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    # Asegurar también la entrada del directorio (no existe en Windows)
+    if os.name != 'nt':
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class AtomicJsonFile:
+    """Archivo JSON con escritura diferida en un hilo propio
+
+    save() serializa en el hilo que llama (rápido) y deja el contenido
+    pendiente; el hilo escritor hace la escritura atómica. Si llegan varios
+    save() mientras se escribe, solo se escribe el último: muchos cambios
+    seguidos cuestan una sola escritura en disco.
+    """
+
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.legacy_path = legacy_path  # ubicación anterior, solo para migrar
+        self.error = None  # último error de escritura
+        self._pending = None
+        self._writing = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def load(self, default=None):
+        """Lee el archivo; si no existe se intenta la ubicación anterior"""
+        for path in (self.path, self.legacy_path):
+            if path and os.path.exists(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        return json.load(f)
+                except (OSError, ValueError):
+                    continue
+        return {} if default is None else default
+
+    def save(self, data):
+        """Programa la escritura del contenido actual de `data`"""
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with self._condition:
+            self._pending = payload
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    @property
+    def busy(self):
+        """Hay contenido pendiente o escribiéndose (error todavía no es definitivo)"""
+        with self._condition:
+            return self._pending is not None or self._writing
+
+    def flush(self, timeout=5.0):
+        """Espera a que se escriba lo pendiente (por ejemplo al cerrar)"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._writing,
+                                            timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(lambda: self._pending is not None, timeout=30.0):
+                    # Sin trabajo: el hilo termina y save() lo vuelve a crear
+                    self._thread = None
+                    return
+                payload, self._pending = self._pending, None
+                self._writing = True
+            try:
+                atomic_write(self.path, payload)
+                self.error = None
+            except OSError as e:
+                self.error = e
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
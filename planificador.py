@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# Planificador de actualizaciones
+# Un único temporizador de Tk para todas las tareas periódicas de la interfaz
+#
+
+import time
+
+
+class Task:
+    """Tarea periódica registrada en el planificador"""
+
+    def __init__(self, name, callback, active_period, background_period, priority, tabs):
+        self.name = name
+        self.callback = callback
+        self.active_period = active_period
+        self.background_period = background_period  # None = en pausa en segundo plano
+        self.priority = priority
+        self.tabs = tabs  # pestañas donde la tarea está activa (None = siempre)
+        self.last_run = float('-inf')
+        self.runs = 0
+        self.total_time = 0.0
+
+
+class RateBinding:
+    """Periodo de un hilo externo (por ejemplo un muestreador) que se adapta a la vista"""
+
+    def __init__(self, name, set_period, active_period, background_period, tabs):
+        self.name = name
+        self.set_period = set_period
+        self.active_period = active_period
+        self.background_period = background_period
+        self.tabs = tabs
+        self.max_period = None  # límite impuesto por quien depende del hilo (None = ninguno)
+        self.applied = None
+
+    def limit(self, period):
+        """Periodo a aplicar respetando max_period"""
+        if self.max_period is None:
+            return period
+        return min(period, self.max_period)
+
+
+class RefreshScheduler:
+    """Planificador adaptativo de todas las tareas periódicas
+
+    Cada tarea tiene su periodo y prioridad. El periodo usado depende de si
+    su pestaña está visible y la ventana tiene el foco (periodo activo) o
+    no (periodo de segundo plano). Todo corre en el hilo de Tk con un solo
+    root.after, y el planificador mide el costo de CPU del propio proceso.
+    """
+
+    # Intervalo máximo entre revisiones (también el de medición de costo)
+    MAX_SLEEP = 1.0
+    COST_WINDOW = 5.0
+
+    def __init__(self, root, notebook):
+        self.root = root
+        self.notebook = notebook
+        self.tasks = {}
+        self.bindings = {}
+        self._after_id = None
+        self._cost_mark = (time.monotonic(), time.process_time())
+        self.cpu_cost = 0.0  # % de un núcleo usado por todo el proceso
+
+        # Cualquier cambio de vista se aplica de inmediato
+        notebook.bind('<<NotebookTabChanged>>', self._on_view_changed, add='+')
+        for sequence in ('<FocusIn>', '<FocusOut>', '<Map>', '<Unmap>'):
+            root.bind(sequence, self._on_view_changed, add='+')
+
+    def add(self, name, callback, active_period, background_period=None, priority=0, tabs=None):
+        """Registra una tarea de la interfaz (menor prioridad = corre primero)"""
+        self.tasks[name] = Task(name, callback, active_period, background_period, priority, tabs)
+
+    def bind_rate(self, name, set_period, active_period, background_period, tabs=None):
+        """Adapta el periodo de un hilo externo a la visibilidad de sus pestañas"""
+        self.bindings[name] = RateBinding(name, set_period, active_period, background_period, tabs)
+
+    def set_active_period(self, name, period):
+        """Cambia el periodo activo de una tarea o de un hilo vinculado"""
+        item = self.tasks.get(name) or self.bindings.get(name)
+        if item is not None:
+            item.active_period = period
+            if isinstance(item, RateBinding):
+                item.applied = None
+            self.reschedule()
+
+    def set_max_period(self, name, period):
+        """Limita el periodo de un hilo vinculado en cualquier vista (None = sin límite)"""
+        binding = self.bindings.get(name)
+        if binding is not None and binding.max_period != period:
+            binding.max_period = period
+            binding.applied = None
+            self.reschedule()
+
+    def run_now(self, name):
+        """Adelanta la próxima ejecución de una tarea"""
+        task = self.tasks.get(name)
+        if task is not None:
+            task.last_run = float('-inf')
+            self.reschedule()
+
+    def start(self):
+        self.reschedule()
+
+    def reschedule(self):
+        """Vuelve a evaluar las tareas en la próxima vuelta del bucle de Tk"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after_idle(self._tick)
+
+    def _on_view_changed(self, event=None):
+        # Los eventos de foco llegan al widget hijo; reevaluar es barato
+        self.reschedule()
+
+    def _foreground(self):
+        """La ventana está visible y tiene el foco"""
+        try:
+            if self.root.state() in ('iconic', 'withdrawn'):
+                return False
+            return self.root.focus_get() is not None
+        except Exception:
+            return False
+
+    def _period(self, item, current_tab, foreground):
+        active = foreground and (item.tabs is None or current_tab in item.tabs)
+        return item.active_period if active else item.background_period
+
+    def _tick(self):
+        self._after_id = None
+        now = time.monotonic()
+        try:
+            current_tab = self.notebook.select()
+        except Exception:
+            current_tab = None
+        foreground = self._foreground()
+
+        # Ajustar los periodos de los hilos externos solo cuando cambian
+        for binding in self.bindings.values():
+            period = binding.limit(self._period(binding, current_tab, foreground))
+            if period != binding.applied:
+                binding.applied = period
+                binding.set_period(period)
+
+        # El vencimiento se calcula con el periodo actual: una tarea que pasa
+        # a primer plano no espera el periodo largo de segundo plano
+        periods = {task.name: self._period(task, current_tab, foreground) for task in self.tasks.values()}
+        due = [task for task in self.tasks.values()
+               if periods[task.name] is not None and now - task.last_run >= periods[task.name]]
+        for task in sorted(due, key=lambda t: t.priority):
+            started = time.perf_counter()
+            try:
+                task.callback()
+            except Exception:
+                pass
+            task.total_time += time.perf_counter() - started
+            task.runs += 1
+            task.last_run = now
+
+        self._measure_cost(now)
+
+        # Dormir hasta la próxima tarea (las pausadas no cuentan)
+        now = time.monotonic()
+        next_runs = [task.last_run + periods[task.name] for task in self.tasks.values()
+                     if periods[task.name] is not None]
+        delay = min([self.MAX_SLEEP] + [max(0.0, t - now) for t in next_runs])
+        self._after_id = self.root.after(max(10, int(delay * 1000)), self._tick)
+
+    def _measure_cost(self, now):
+        last_wall, last_cpu = self._cost_mark
+        if now - last_wall >= self.COST_WINDOW:
+            cpu = time.process_time()
+            self.cpu_cost = (cpu - last_cpu) / (now - last_wall) * 100
+            self._cost_mark = (now, cpu)
+
+    def stats(self):
+        """Tiempo medio por ejecución de cada tarea, en milisegundos"""
+        return {name: (task.total_time / task.runs * 1000 if task.runs else 0.0)
+                for name, task in self.tasks.items()}
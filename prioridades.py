@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# Aplicación automática de prioridades
+# Prioridad de los observados y reglas por nombre/ejecutable/usuario en cada instantánea
+#
+
+import fnmatch
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+from observados import IDENTITY_TOLERANCE, identity_confirmed
+
+# Prioridades internas -> valor de nice() de psutil
+if os.name == 'nt':
+    PRIORITY_VALUES = {
+        'realtime': psutil.REALTIME_PRIORITY_CLASS,
+        'high': psutil.HIGH_PRIORITY_CLASS,
+        'normal': psutil.NORMAL_PRIORITY_CLASS,
+        'below_normal': psutil.BELOW_NORMAL_PRIORITY_CLASS,
+        'idle': psutil.IDLE_PRIORITY_CLASS,
+    }
+else:
+    PRIORITY_VALUES = {'realtime': -20, 'high': -10, 'normal': 0, 'below_normal': 10, 'idle': 19}
+
+# Valores guardados por versiones anteriores en watched_processes.json
+LEGACY_PRIORITIES = {'alta': 'high', 'media': 'normal', 'baja': 'idle'}
+
+# Campos sobre los que puede aplicarse una regla
+RULE_FIELDS = ('name', 'exe', 'user')
+
+# Regla: patrón estilo shell (*, ?) sin distinguir mayúsculas, p. ej. ('name', 'make*', 'idle')
+PriorityRule = namedtuple('PriorityRule', ['field', 'pattern', 'priority'])
+
+
+def priority_value(priority):
+    """Valor de nice() para una prioridad interna (None si no se conoce)"""
+    return PRIORITY_VALUES.get(LEGACY_PRIORITIES.get(priority, priority))
+
+
+def parse_rules(items):
+    """Reglas válidas a partir de la lista guardada en JSON (las inválidas se ignoran)"""
+    rules = []
+    for item in items or ():
+        try:
+            rule = PriorityRule(item['field'], str(item['pattern']), item['priority'])
+        except (KeyError, TypeError):
+            continue
+        if rule.field in RULE_FIELDS and rule.pattern and priority_value(rule.priority) is not None:
+            rules.append(rule)
+    return tuple(rules)
+
+
+class PriorityEnforcer:
+    """Mantiene la prioridad de los observados y de los procesos que cumplen una regla
+
+    Se registra como oyente del muestreador de procesos, así que corre en
+    su hilo con cada instantánea. Las reglas solo se evalúan para procesos
+    nuevos (la decisión se recuerda por (pid, create_time)) y nice() solo
+    se llama cuando el valor actual difiere del objetivo; lo ya aplicado
+    queda en caché y se vuelve a verificar cada VERIFY_INTERVAL segundos.
+    """
+
+    VERIFY_INTERVAL = 60.0
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._watched = ()      # (pid, entrada) de los observados con prioridad
+        self._rules = ()
+        self._decisions = {}    # (pid, create_time) -> valor de las reglas o None
+        self._generation = 0    # cambia con cada set_rules()
+        self._rules_lock = threading.Lock()
+        self._applied = {}      # (pid, create_time) -> (valor, instante, se pudo aplicar)
+        self.changes = 0        # llamadas a nice() que cambiaron algo
+        self.denied = 0         # procesos actuales sin permisos para cambiar su prioridad
+
+    def set_watched(self, watched):
+        """Copia los observados (pid -> datos); los marcados 'inactivo' no se tocan"""
+        self._watched = tuple((int(pid), dict(data)) for pid, data in watched.items()
+                              if str(pid).isdigit() and data.get('status') != 'inactivo'
+                              and priority_value(data.get('priority')) is not None)
+
+    def set_rules(self, rules):
+        """Reemplaza las reglas y vuelve a evaluarlas sobre todos los procesos"""
+        # Patrones compilados una sola vez: (campo, expresión, valor de nice())
+        compiled = tuple((rule.field, re.compile(fnmatch.translate(rule.pattern), re.IGNORECASE),
+                          priority_value(rule.priority)) for rule in rules)
+        with self._rules_lock:
+            self._rules = compiled
+            self._decisions = {}
+            self._generation += 1
+
+    def _rule_value(self, info, rules):
+        """Valor de la primera regla que cumple el proceso (None si ninguna)"""
+        proc = None
+        for field, pattern, value in rules:
+            if field == 'name':
+                text = info.name
+            else:
+                try:
+                    if proc is None:
+                        proc = psutil.Process(info.pid)
+                    text = proc.exe() if field == 'exe' else proc.username()
+                except psutil.Error:
+                    continue
+            if pattern.match(text):
+                return value
+        return None
+
+    def targets(self, snapshot):
+        """(pid, create_time) -> valor de nice() que debe tener cada proceso
+
+        Devuelve None si las reglas cambiaron durante el cálculo: el
+        resultado se descarta y se recalcula con la próxima instantánea.
+        """
+        with self._rules_lock:
+            rules, previous, generation = self._rules, self._decisions, self._generation
+        decisions = {}
+        targets = {}
+        if rules:
+            for info in snapshot:
+                if not info.accessible:
+                    continue
+                key = (info.pid, info.create_time)
+                value = previous[key] if key in previous else self._rule_value(info, rules)
+                decisions[key] = value
+                if value is not None:
+                    targets[key] = value
+        # Solo se recuerdan los procesos que siguen vivos
+        with self._rules_lock:
+            if generation != self._generation:
+                return None
+            self._decisions = decisions
+
+        # La prioridad de un observado tiene precedencia sobre las reglas; solo
+        # se aplica si la fila confirma que es el mismo proceso
+        for pid, entry in self._watched:
+            info = snapshot.get(pid)
+            if info is not None and identity_confirmed(entry, info):
+                targets[(pid, info.create_time)] = priority_value(entry['priority'])
+        return targets
+
+    def apply(self, snapshot):
+        """Oyente del muestreador: aplica las prioridades de la instantánea"""
+        if not self.enabled:
+            return
+        targets = self.targets(snapshot)
+        if targets is None:
+            return
+        now = time.monotonic()
+        applied = {}
+        for key, value in targets.items():
+            cached = self._applied.get(key)
+            if cached is not None and cached[0] == value and now - cached[1] < self.VERIFY_INTERVAL:
+                applied[key] = cached
+                continue
+            pid, create_time = key
+            try:
+                proc = psutil.Process(pid)
+                if abs(proc.create_time() - create_time) > IDENTITY_TOLERANCE:
+                    continue
+                if proc.nice() != value:
+                    proc.nice(value)
+                    self.changes += 1
+                ok = True
+            except psutil.NoSuchProcess:
+                continue
+            except psutil.AccessDenied:
+                # No reintentar en cada ciclo: se vuelve a probar tras VERIFY_INTERVAL
+                ok = False
+            applied[key] = (value, now, ok)
+        self._applied = applied
+        self.denied = sum(1 for _, _, ok in applied.values() if not ok)
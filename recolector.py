@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# Recolector de procesos
+# Obtiene todos los campos de todos los procesos en una sola pasada
+#
+
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+# Atributos que se piden a psutil en una sola llamada por proceso.
+# La línea de comando no se incluye: se carga bajo demanda con CmdlineCache.
+PROCESS_ATTRS = ['pid', 'name', 'cpu_percent', 'memory_percent',
+                 'memory_info', 'status']
+
+# Nombre mostrado cuando no se puede leer el del proceso
+DENIED_NAME = '[Acceso denegado]'
+
+# Información de un proceso tal como la muestra la interfaz
+ProcessInfo = namedtuple('ProcessInfo', [
+    'pid', 'create_time', 'name', 'cpu_percent', 'memory_percent',
+    'memory_mb', 'status', 'accessible'
+])
+
+
+def process_info_from_dict(data, create_time=None):
+    """Convierte el diccionario de psutil en un ProcessInfo
+
+    Los campos no accesibles llegan como None (ad_value=None) y se
+    reemplazan por los mismos valores que mostraba la interfaz.
+    """
+    accessible = True
+
+    name = data.get('name')
+    if name is None:
+        name = DENIED_NAME
+        accessible = False
+
+    cpu = data.get('cpu_percent')
+    if cpu is None:
+        cpu = 0.0
+        accessible = False
+
+    mem_percent = data.get('memory_percent')
+    if mem_percent is None:
+        mem_percent = 0.0
+        accessible = False
+
+    memory_info = data.get('memory_info')
+    if memory_info is None:
+        memory_mb = 0.0
+        accessible = False
+    else:
+        memory_mb = memory_info.rss / (1024*1024)
+
+    status = data.get('status')
+    if status is None:
+        status = '[Protegido]'
+        accessible = False
+
+    if create_time is None:
+        create_time = data.get('create_time') or 0.0
+
+    return ProcessInfo(
+        pid=data['pid'],
+        create_time=create_time,
+        name=name[:30],
+        cpu_percent=cpu,
+        memory_percent=mem_percent,
+        memory_mb=memory_mb,
+        status=status[:15] if status else 'N/A',
+        accessible=accessible
+    )
+
+
+def current_create_time(proc):
+    """create_time leído del sistema, sin la caché del objeto Process
+
+    Process.create_time() guarda el primer valor, así que no sirve para ver
+    si el PID pasó a otro proceso. Dentro de oneshot() la lectura sale de
+    los mismos datos ya cargados (stat en Linux). None si no se puede leer.
+    """
+    try:
+        return proc._proc.create_time()
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+
+class ProcessSnapshot:
+    """Instantánea inmutable de la lista de procesos"""
+
+    __slots__ = ('timestamp', 'processes', '_by_pid', '_columns')
+
+    def __init__(self, processes, timestamp=None):
+        object.__setattr__(self, 'timestamp', timestamp if timestamp is not None else time.time())
+        object.__setattr__(self, 'processes', tuple(processes))
+        object.__setattr__(self, '_by_pid', {p.pid: p for p in self.processes})
+        object.__setattr__(self, '_columns', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ProcessSnapshot es inmutable")
+
+    def __iter__(self):
+        return iter(self.processes)
+
+    def __len__(self):
+        return len(self.processes)
+
+    def get(self, pid):
+        """Devuelve el ProcessInfo de un PID o None si no existe"""
+        return self._by_pid.get(pid)
+
+    def columns(self):
+        """Vista en columnas NumPy de la instantánea (se construye una vez)"""
+        if self._columns is None:
+            from columnas import ProcessColumns
+            object.__setattr__(self, '_columns', ProcessColumns(self))
+        return self._columns
+
+    @property
+    def total_count(self):
+        return len(self.processes)
+
+    @property
+    def accessible_count(self):
+        return sum(1 for p in self.processes if p.accessible)
+
+    def accessible(self):
+        """Solo los procesos con todos sus campos accesibles"""
+        return [p for p in self.processes if p.accessible]
+
+
+class ProcessRegistry:
+    """Registro persistente de objetos Process entre recolecciones
+
+    Cada entrada se identifica por (pid, create_time). Mantener el mismo
+    objeto Process entre muestras permite que cpu_percent() calcule el uso
+    real desde la muestra anterior en lugar de devolver siempre 0.0.
+    `pids` y `process` permiten usar una fuente de procesos simulada con la
+    misma interfaz que psutil (los benchmarks).
+    """
+
+    def __init__(self, pids=psutil.pids, process=psutil.Process):
+        self._pids = pids
+        self._process = process
+        self._lock = threading.Lock()
+        self._entries = {}  # pid -> ((pid, create_time), psutil.Process)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _track(self, pid):
+        """Crea y registra un Process nuevo; None si ya no existe"""
+        try:
+            proc = self._process(pid)
+            key = (pid, proc.create_time())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        self._entries[pid] = (key, proc)
+        return key, proc
+
+    def refresh(self):
+        """Sincroniza el registro con los PIDs actuales
+
+        Solo trabaja con la diferencia de conjuntos contra psutil.pids():
+        expulsa los PIDs que desaparecieron y crea objetos Process solo para
+        los nuevos; los demás se reutilizan sin ninguna llamada extra. Un
+        PID muerto o reutilizado se detecta al leerlo en collect_snapshot
+        (NoSuchProcess o create_time distinto). Devuelve las entradas
+        vigentes como (key, Process).
+        """
+        current = set(self._pids())
+        with self._lock:
+            for pid in self._entries.keys() - current:
+                del self._entries[pid]
+            for pid in current - self._entries.keys():
+                self._track(pid)
+            return list(self._entries.values())
+
+    def discard(self, key):
+        """Olvida una entrada cuyo proceso terminó o cuyo PID fue reutilizado"""
+        with self._lock:
+            entry = self._entries.get(key[0])
+            if entry is not None and entry[0] == key:
+                del self._entries[key[0]]
+
+    def retrack(self, key):
+        """Reemplaza una entrada cuyo PID pasó a otro proceso; devuelve la nueva o None"""
+        with self._lock:
+            entry = self._entries.get(key[0])
+            if entry is None or entry[0] != key:
+                return entry
+            del self._entries[key[0]]
+            return self._track(key[0])
+
+    def get(self, pid):
+        """Devuelve el Process registrado para un PID o None"""
+        with self._lock:
+            entry = self._entries.get(pid)
+        return entry[1] if entry else None
+
+    def key(self, pid):
+        """Devuelve la identidad (pid, create_time) registrada para un PID"""
+        with self._lock:
+            entry = self._entries.get(pid)
+        return entry[0] if entry else None
+
+    def collect_snapshot(self, attrs=PROCESS_ATTRS):
+        """Recolecta una instantánea reutilizando los Process registrados"""
+        processes = []
+        for key, proc in self.refresh():
+            try:
+                with proc.oneshot():
+                    data = proc.as_dict(attrs=attrs, ad_value=None)
+                    created = current_create_time(proc)
+                if created is not None and created != key[1]:
+                    # PID reutilizado: psutil devuelve los datos del proceso nuevo,
+                    # así que se registra con su propia identidad y CPU% desde cero
+                    entry = self.retrack(key)
+                    if entry is None:
+                        continue
+                    key, proc = entry
+                    data = proc.as_dict(attrs=attrs, ad_value=None)
+                processes.append(process_info_from_dict(data, create_time=key[1]))
+            except psutil.NoSuchProcess:
+                # Terminó o el PID es de otro proceso: se vuelve a registrar si sigue
+                self.discard(key)
+            except Exception:
+                continue
+        return ProcessSnapshot(processes)
+
+
+class CmdlineCache:
+    """Caché de líneas de comando por (pid, create_time)
+
+    La línea de comando de un proceso no cambia durante su vida, así que se
+    lee una sola vez, la primera vez que una búsqueda la necesita. Las
+    entradas de procesos que terminaron se eliminan con prune().
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, info):
+        """Devuelve la línea de comando de un ProcessInfo ('' si no es accesible)"""
+        key = (info.pid, info.create_time)
+        with self._lock:
+            cmdline = self._cache.get(key)
+        if cmdline is not None:
+            return cmdline
+
+        cmdline = self._read(info)
+        with self._lock:
+            self._cache[key] = cmdline
+        return cmdline
+
+    def _read(self, info):
+        proc = None
+        if self.registry is not None and self.registry.key(info.pid) == (info.pid, info.create_time):
+            proc = self.registry.get(info.pid)
+        try:
+            if proc is None:
+                proc = psutil.Process(info.pid)
+                if info.create_time and proc.create_time() != info.create_time:
+                    # El PID ya pertenece a otro proceso
+                    return ''
+            cmdline = proc.cmdline()
+            return ' '.join(cmdline) if cmdline else ''
+        except (psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
+            return ''
+        except Exception:
+            return ''
+
+    def prune(self, snapshot):
+        """Elimina las entradas de procesos que ya no están en la instantánea"""
+        with self._lock:
+            if not self._cache:
+                return
+            alive = {(p.pid, p.create_time) for p in snapshot}
+            for key in [key for key in self._cache if key not in alive]:
+                del self._cache[key]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# Recolector rápido para Linux
+# Lee /proc directamente en una sola pasada, sin pasar por psutil
+#
+
+import os
+import sys
+import time
+
+from recolector import DENIED_NAME, ProcessInfo, ProcessSnapshot
+
+# Mismos estados que devuelve psutil en Linux
+PROC_STATUSES = {
+    'R': 'running', 'S': 'sleeping', 'D': 'disk-sleep', 'T': 'stopped',
+    't': 'tracing-stop', 'Z': 'zombie', 'X': 'dead', 'x': 'dead',
+    'K': 'wake-kill', 'W': 'waking', 'I': 'idle', 'P': 'parked',
+}
+
+
+class LinuxProcCollector:
+    """Recolector que analiza /proc/[pid]/stat y statm con búferes reutilizados
+
+    Produce los mismos campos que ProcessRegistry.collect_snapshot(). El
+    CPU% se calcula como delta de tiempo de CPU entre muestras, igual que
+    psutil.Process.cpu_percent(), usando (pid, starttime) como identidad.
+    """
+
+    BUFFER_SIZE = 4096
+
+    def __init__(self, proc_root='/proc'):
+        self.proc_root = proc_root
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        self.boot_time = self._read_boot_time()
+        self.total_memory = self._read_total_memory()
+        self._buffer = bytearray(self.BUFFER_SIZE)
+        self._view = memoryview(self._buffer)
+        self._last_cpu = {}  # (pid, starttime) -> (ticks de CPU, instante)
+
+    @staticmethod
+    def available(proc_root='/proc'):
+        """Indica si este recolector puede usarse en el sistema actual"""
+        return sys.platform.startswith('linux') and os.path.exists(f"{proc_root}/self/statm")
+
+    def _read_boot_time(self):
+        with open(f"{self.proc_root}/stat", 'rb') as f:
+            for line in f:
+                if line.startswith(b'btime'):
+                    return float(line.split()[1])
+        raise RuntimeError("No se encontró 'btime' en /proc/stat")
+
+    def _read_total_memory(self):
+        with open(f"{self.proc_root}/meminfo", 'rb') as f:
+            for line in f:
+                if line.startswith(b'MemTotal:'):
+                    return int(line.split()[1]) * 1024
+        raise RuntimeError("No se encontró 'MemTotal' en /proc/meminfo")
+
+    def _read(self, path):
+        """Lee un archivo pequeño de /proc en el búfer reutilizado"""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.readv(fd, [self._buffer])
+        finally:
+            os.close(fd)
+        return self._view[:size].tobytes()
+
+    def _extended_name(self, base, name):
+        """Igual que psutil: si el nombre está truncado, usar el de cmdline"""
+        try:
+            with open(f"{base}/cmdline", 'rb') as f:
+                first = f.read().split(b'\0', 1)[0]
+        except OSError:
+            return name
+        extended = os.path.basename(first.decode('utf-8', 'replace'))
+        return extended if extended.startswith(name) else name
+
+    def read_pid(self, pid, now, seen):
+        """Lee un proceso; devuelve ProcessInfo o None si ya terminó
+
+        Agrega la identidad (pid, starttime) del proceso al conjunto `seen`.
+        """
+        base = f"{self.proc_root}/{pid}"
+        try:
+            stat = self._read(f"{base}/stat")
+            statm = self._read(f"{base}/statm")
+        except (FileNotFoundError, ProcessLookupError):
+            return None
+        except PermissionError:
+            return ProcessInfo(pid=pid, create_time=0.0, name=DENIED_NAME,
+                               cpu_percent=0.0, memory_percent=0.0, memory_mb=0.0,
+                               status='[Protegido]', accessible=False)
+        except OSError:
+            return None
+
+        # Formato: pid (comm) estado campo4 ... ; comm puede tener espacios
+        close = stat.rfind(b')')
+        name = stat[stat.find(b'(') + 1:close].decode('utf-8', 'replace')
+        fields = stat[close + 2:].split()
+        try:
+            state = fields[0].decode()
+            cpu_ticks = int(fields[11]) + int(fields[12])
+            starttime = int(fields[19])
+            rss = int(statm.split()[1]) * self.page_size
+        except (IndexError, ValueError):
+            # Archivo truncado o con formato inesperado: se omite solo esta fila
+            return None
+
+        if len(name) >= 15:
+            name = self._extended_name(base, name)
+
+        key = (pid, starttime)
+        seen.add(key)
+        previous = self._last_cpu.get(key)
+        self._last_cpu[key] = (cpu_ticks, now)
+        cpu_percent = 0.0
+        if previous is not None and now > previous[1]:
+            cpu_percent = round((cpu_ticks - previous[0]) / self.clock_ticks / (now - previous[1]) * 100, 1)
+
+        status = PROC_STATUSES.get(state, state)
+        return ProcessInfo(
+            pid=pid,
+            create_time=float(starttime) / self.clock_ticks + self.boot_time,
+            name=name[:30],
+            cpu_percent=cpu_percent,
+            memory_percent=rss / self.total_memory * 100 if self.total_memory else 0.0,
+            memory_mb=rss / (1024*1024),
+            status=status[:15],
+            accessible=True
+        )
+
+    def collect_snapshot(self):
+        """Recorre /proc una sola vez y devuelve una instantánea"""
+        now = time.monotonic()
+        processes = []
+        seen = set()
+        for entry in os.listdir(self.proc_root):
+            if not entry.isdigit():
+                continue
+            info = self.read_pid(int(entry), now, seen)
+            if info is not None:
+                processes.append(info)
+
+        # Olvidar muestras de CPU de procesos que terminaron o reutilizaron PID
+        for key in [key for key in self._last_cpu if key not in seen]:
+            del self._last_cpu[key]
+        return ProcessSnapshot(processes)
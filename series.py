@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# Series de tiempo
+# Búferes circulares preasignados con niveles de resolución estilo RRD
+#
+
+import math
+import threading
+import time
+
+import numpy as np
+
+# Niveles por defecto: (resolución en segundos, retención en segundos)
+DEFAULT_TIERS = (
+    (1.0, 3600.0),        # 1 s durante 1 hora
+    (10.0, 86400.0),      # 10 s durante 1 día
+    (60.0, 7 * 86400.0),  # 1 min durante 1 semana
+)
+
+
+class RingBuffer:
+    """Búfer circular de tamaño fijo con una marca de tiempo por fila
+
+    Agregar una muestra es O(1) y la memoria no crece: al llenarse se
+    sobrescribe la muestra más antigua.
+    """
+
+    def __init__(self, capacity, width=1):
+        self.capacity = int(capacity)
+        self.times = np.zeros(self.capacity, dtype=np.float64)
+        self.values = np.zeros((self.capacity, width), dtype=np.float64)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+    def append(self, timestamp, row):
+        i = self._next
+        self.times[i] = timestamp
+        self.values[i] = row
+        self._next = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def last(self):
+        """Última fila agregada o None si está vacío"""
+        if not self._count:
+            return None
+        return self.values[self._next - 1].copy()
+
+    def ordered(self):
+        """Copias de (tiempos, valores) en orden cronológico"""
+        if self._count < self.capacity:
+            return self.times[:self._count].copy(), self.values[:self._count].copy()
+        index = (np.arange(self.capacity) + self._next) % self.capacity
+        return self.times[index], self.values[index]
+
+    def since(self, start):
+        """Muestras con marca de tiempo mayor o igual a `start`"""
+        times, values = self.ordered()
+        k = np.searchsorted(times, start)
+        return times[k:], values[k:]
+
+
+class _Tier:
+    """Nivel de resolución: promedia las muestras de cada intervalo de `step` segundos"""
+
+    def __init__(self, step, retention, width):
+        self.step = step
+        self.retention = retention
+        self.ring = RingBuffer(math.ceil(retention / step), width)
+        self._bucket = None
+        self._sum = np.zeros(width, dtype=np.float64)
+        self._count = 0
+        self._last_time = 0.0
+
+    def add(self, timestamp, row):
+        bucket = math.floor(timestamp / self.step)
+        if bucket != self._bucket and self._count:
+            # Cerrar el intervalo anterior con su promedio
+            self.ring.append((self._bucket + 1) * self.step, self._sum / self._count)
+            self._sum[:] = 0.0
+            self._count = 0
+        self._bucket = bucket
+        self._sum += row
+        self._count += 1
+        self._last_time = timestamp
+
+    def since(self, start):
+        """Muestras cerradas desde `start` más el intervalo en curso"""
+        times, values = self.ring.since(start)
+        if self._count and self._last_time >= start:
+            times = np.append(times, self._last_time)
+            values = np.vstack([values, self._sum / self._count])
+        return times, values
+
+    def last(self):
+        """Valor más reciente (intervalo en curso o último cerrado)"""
+        if self._count:
+            return self._sum / self._count
+        return self.ring.last()
+
+    def clear(self):
+        self.ring.clear()
+        self._bucket = None
+        self._sum[:] = 0.0
+        self._count = 0
+
+
+class TimeSeriesStore:
+    """Almacén de series de tiempo seguro entre hilos
+
+    Guarda varias series con la misma marca de tiempo (por ejemplo CPU y
+    memoria) en niveles de resolución decreciente: la memoria usada es
+    fija y depende solo de la retención configurada. Las marcas de tiempo
+    son de time.monotonic(), inmunes a cambios del reloj del sistema.
+    """
+
+    def __init__(self, names, tiers=DEFAULT_TIERS):
+        self.names = tuple(names)
+        self._lock = threading.Lock()
+        self._tiers = [_Tier(step, retention, len(self.names)) for step, retention in tiers]
+
+    @property
+    def retention(self):
+        """Retención máxima en segundos"""
+        return max(tier.retention for tier in self._tiers)
+
+    def append(self, values, timestamp=None):
+        """Agrega una muestra con un valor por serie"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        row = np.asarray(values, dtype=np.float64)
+        with self._lock:
+            for tier in self._tiers:
+                tier.add(timestamp, row)
+
+    def clear(self):
+        with self._lock:
+            for tier in self._tiers:
+                tier.clear()
+
+    def window(self, seconds, now=None):
+        """Devuelve (tiempos, valores) de los últimos `seconds` segundos
+
+        Se usa el nivel más fino cuya retención cubre la ventana pedida.
+        `valores` tiene una columna por serie, en el orden de `names`.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            tier = next((t for t in self._tiers if t.retention >= seconds), self._tiers[-1])
+            return tier.since(now - seconds)
+
+    def latest(self):
+        """Último valor de cada serie como diccionario, o None si no hay datos"""
+        with self._lock:
+            row = self._tiers[0].last()
+        if row is None:
+            return None
+        return dict(zip(self.names, row.tolist()))
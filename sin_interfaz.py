@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# Modo sin interfaz
+# Emite instantáneas de procesos como JSON por líneas (NDJSON) sin tkinter ni matplotlib
+#
+
+import json
+import operator
+import sys
+import time
+
+from muestreador import select_collector
+from recolector import ProcessInfo
+
+# Campos disponibles para cada proceso
+FIELDS = ProcessInfo._fields
+
+
+def parse_fields(text):
+    """Convierte 'pid,name,cpu_percent' en una tupla de campos válidos"""
+    fields = tuple(field.strip() for field in text.split(',') if field.strip())
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Campos desconocidos: {', '.join(unknown) or '(ninguno)'}. "
+                         f"Disponibles: {', '.join(FIELDS)}")
+    return fields
+
+
+def snapshot_record(snapshot, fields):
+    """Registro JSON de una instantánea con solo los campos pedidos"""
+    getter = operator.itemgetter(*(FIELDS.index(field) for field in fields))
+    if len(fields) == 1:
+        processes = [{fields[0]: getter(info)} for info in snapshot]
+    else:
+        processes = [dict(zip(fields, getter(info))) for info in snapshot]
+    return {'timestamp': time.time(), 'count': len(processes), 'processes': processes}
+
+
+def system_usage():
+    """(CPU%, memoria%) del sistema desde la llamada anterior"""
+    import psutil
+    return psutil.cpu_percent(interval=None), psutil.virtual_memory().percent
+
+
+def open_recorder(path):
+    """Grabador binario para `path` (grabacion se importa solo si se pide)"""
+    import psutil
+    from grabacion import SnapshotRecorder
+    psutil.cpu_percent(interval=None)  # línea base del CPU% del sistema
+    return SnapshotRecorder(path, psutil.virtual_memory().total)
+
+
+def run_headless(interval=2.0, fields=FIELDS, output=None, count=0, backend='auto', record=None):
+    """Recolecta cada `interval` segundos y escribe una línea JSON por instantánea
+
+    Usa el mismo recolector que la interfaz. La primera recolección solo
+    fija la línea base del CPU%, así que la primera línea sale tras un
+    intervalo. `count` = 0 emite sin límite hasta Ctrl+C. Con `record` las
+    instantáneas se agregan además a una grabación binaria; en ese caso el
+    NDJSON solo se escribe si se indica `output`.
+    """
+    collect = select_collector(backend)
+    recorder = open_recorder(record) if record else None
+    emit = output is not None or recorder is None
+    stream = open(output, 'a', encoding='utf-8') if output else sys.stdout
+    emitted = 0
+    try:
+        collect()
+        next_run = time.monotonic() + interval
+        while not count or emitted < count:
+            time.sleep(max(0.0, next_run - time.monotonic()))
+            next_run += interval
+            snapshot = collect()
+            if recorder is not None:
+                recorder.record(snapshot, system_usage())
+            if emit:
+                stream.write(json.dumps(snapshot_record(snapshot, fields),
+                                        ensure_ascii=False, separators=(',', ':')))
+                stream.write('\n')
+                stream.flush()
+            emitted += 1
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # El lector (por ejemplo `head`) cerró la tubería: terminar sin error
+        sys.stderr.close()
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+        if recorder is not None:
+            recorder.close()
+    return emitted
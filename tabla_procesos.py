@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# Tabla de procesos
+# Reconciliación incremental de filas de un ttk.Treeview
+#
+
+from tkinter import TclError, ttk
+
+
+def process_row(info):
+    """Fila (iid, valores) mostrada en la tabla para un ProcessInfo"""
+    return str(info.pid), (info.pid, info.name, f"{info.cpu_percent:.1f}",
+                           f"{info.memory_percent:.1f}", f"{info.memory_mb:.1f}", info.status)
+
+
+def process_key(info):
+    """Identidad de una fila de proceso para la selección (sobrevive a la reutilización del PID)"""
+    return info.pid, info.create_time
+
+
+def show_processes(table, columns, sort_keys, mask=None, limit=None):
+    """Ordena y recorta las columnas (vectorizado) y las muestra en una VirtualTable
+
+    Es el camino de dibujo de la pestaña de procesos; devuelve la cantidad
+    de filas mostradas.
+    """
+    displayed = columns.select(columns.order(sort_keys, mask, limit))
+    # La tabla virtual solo crea filas para la ventana visible
+    table.set_rows(displayed)
+    return len(displayed)
+
+
+class TreeviewReconciler:
+    """Sincroniza un Treeview con una lista de filas sin borrar y reinsertar todo
+
+    Cada fila se identifica por su iid (el PID). En cada actualización solo
+    se insertan las filas nuevas, se borran las que desaparecieron (en una
+    sola llamada), se modifican las filas cuyos valores cambiaron y, si el
+    orden cambió, se reordena todo con una única llamada a set_children.
+    Así se conservan la selección y la posición del scroll.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._values = {}   # iid -> valores mostrados
+        self._order = []    # iids en el orden mostrado
+        self.last_calls = 0  # llamadas Tcl de la última reconciliación
+
+    def clear(self):
+        """Elimina todas las filas administradas"""
+        if self._order:
+            self.tree.delete(*self._order)
+        self._values.clear()
+        self._order = []
+
+    def reconcile(self, rows):
+        """Aplica una lista ordenada de (iid, valores) y devuelve las llamadas Tcl usadas"""
+        calls = 0
+        order = [iid for iid, _ in rows]
+        wanted = set(order)
+
+        # Borrar de una vez los procesos que ya no están
+        gone = [iid for iid in self._order if iid not in wanted]
+        if gone:
+            self.tree.delete(*gone)
+            calls += 1
+            for iid in gone:
+                del self._values[iid]
+
+        for iid, values in rows:
+            current = self._values.get(iid)
+            if current is None:
+                self.tree.insert('', 'end', iid=iid, values=values)
+                calls += 1
+            elif current != values:
+                self.tree.item(iid, values=values)
+                calls += 1
+            self._values[iid] = values
+
+        # Las filas nuevas quedaron al final; reordenar solo si no coincide
+        previous = set(self._order)
+        current_order = [iid for iid in self._order if iid in wanted]
+        current_order += [iid for iid in order if iid not in previous]
+        if current_order != order:
+            self.tree.set_children('', *order)
+            calls += 1
+
+        self._order = order
+        self.last_calls = calls
+        return calls
+
+
+class VirtualTable:
+    """Tabla virtual: solo materializa en el Treeview las filas visibles
+
+    Las filas viven en memoria (por ejemplo, los ProcessInfo de una
+    instantánea) y se formatean solo al entrar en la ventana visible. El
+    Treeview nunca tiene más ítems que filas caben en pantalla, por lo que
+    la cantidad de widgets no depende del total de procesos.
+
+    El alto de fila y el del encabezado se miden en el Treeview real (estilo
+    y posición de la primera fila), así que funcionan con cualquier tema,
+    fuente o escala de pantalla. Si aun así el Treeview tuviera que
+    desplazarse por dentro, se reduce la cantidad de filas visibles.
+
+    La selección se guarda en la tabla por identidad de fila (`row_key`), no
+    en los iids del Treeview: sobrevive al scroll, al reordenamiento y a las
+    filas que salen de la ventana. Un clic simple (o las flechas) sobre una
+    fila la reemplaza; Ctrl/Shift+clic la amplía.
+    """
+
+    # Valores iniciales hasta la primera medición
+    HEADER_HEIGHT = 25
+    ROW_HEIGHT = 20
+
+    def __init__(self, tree, scrollbar, row_factory, row_height=None, row_key=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_factory = row_factory  # item -> (iid, valores)
+        self.row_key = row_key or (lambda item: row_factory(item)[0])
+        self.selected = {}          # identidad -> fila seleccionada, esté o no a la vista
+        self._visible = {}          # iid -> fila dibujada
+        self._replace_selection = False
+        self.row_height = row_height or self._style_row_height() or self.ROW_HEIGHT
+        self.header_height = self.HEADER_HEIGHT
+        self.rows = []
+        self.offset = 0
+        self.visible = max(1, int(tree.cget('height')))
+        self.reconciler = TreeviewReconciler(tree)
+
+        # El scroll lo maneja la tabla virtual, no el Treeview
+        scrollbar.configure(command=self.yview)
+        tree.configure(yscrollcommand=self._on_tree_yscroll)
+        tree.bind('<Configure>', self._on_resize)
+        tree.bind('<MouseWheel>', self._on_wheel)
+        tree.bind('<Button-4>', lambda e: self._scroll_units(-3))
+        tree.bind('<Button-5>', lambda e: self._scroll_units(3))
+        tree.bind('<Prior>', lambda e: self._scroll_units(-self.visible))
+        tree.bind('<Next>', lambda e: self._scroll_units(self.visible))
+        tree.bind('<Home>', lambda e: self._scroll_to(0))
+        tree.bind('<End>', lambda e: self._scroll_to(len(self.rows)))
+        tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        tree.bind('<Button-1>', self._on_click, add='+')
+        for sequence in ('<Up>', '<Down>'):
+            tree.bind(sequence, lambda e: self._set_replace(True), add='+')
+        for sequence in ('<Control-Button-1>', '<Shift-Button-1>', '<Shift-Up>', '<Shift-Down>'):
+            tree.bind(sequence, lambda e: self._set_replace(False), add='+')
+
+    def set_rows(self, rows):
+        """Reemplaza las filas en memoria y redibuja la ventana visible"""
+        self.rows = rows
+        self._scroll_to(self.offset)
+
+    def selected_rows(self):
+        """Filas seleccionadas que siguen entre las filas actuales, en el orden de la tabla"""
+        if not self.selected:
+            return []
+        return [item for item in self.rows if self.row_key(item) in self.selected]
+
+    def clear_selection(self):
+        self.selected = {}
+        self.tree.selection_set([])
+
+    def _set_replace(self, replace):
+        self._replace_selection = replace
+
+    def _on_click(self, event):
+        # Un clic simple sobre una fila reemplaza la selección (no en el encabezado)
+        if self.tree.identify_region(event.x, event.y) in ('cell', 'tree'):
+            self._replace_selection = True
+
+    def _on_select(self, event=None):
+        """Copia la selección del Treeview (solo filas a la vista) a la de la tabla"""
+        current = set(self.tree.selection())
+        if self._replace_selection:
+            self._replace_selection = False
+            self.selected = {}
+        for iid, item in self._visible.items():
+            key = self.row_key(item)
+            if iid in current:
+                self.selected[key] = item
+            else:
+                self.selected.pop(key, None)
+
+    def yview(self, *args):
+        """Comando del Scrollbar ('moveto' o 'scroll')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * len(self.rows)))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible
+            self._scroll_units(step)
+
+    def _scroll_units(self, step):
+        self._scroll_to(self.offset + step)
+        return 'break'
+
+    def _scroll_to(self, offset):
+        max_offset = max(0, len(self.rows) - self.visible)
+        self.offset = min(max(0, offset), max_offset)
+        self._render()
+        return 'break'
+
+    def _on_wheel(self, event):
+        return self._scroll_units(-3 if event.delta > 0 else 3)
+
+    def _style_row_height(self):
+        """Alto de fila configurado en el estilo del Treeview (None si no tiene)"""
+        try:
+            value = ttk.Style(self.tree).lookup(self.tree.cget('style') or 'Treeview', 'rowheight')
+            return int(float(value)) if value else None
+        except (TclError, ValueError):
+            return None
+
+    def _on_resize(self, event):
+        self._fit(event.height)
+
+    def _fit(self, height):
+        """Ajusta la cantidad de filas visibles al alto disponible"""
+        visible = max(1, (height - self.header_height) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self._scroll_to(self.offset)
+
+    def _measure(self):
+        """Mide el encabezado y el alto de fila con la primera fila dibujada"""
+        children = self.tree.get_children()
+        if not children:
+            return
+        try:
+            bbox = self.tree.bbox(children[0])
+        except TclError:
+            return
+        if not bbox:
+            return  # todavía no está a la vista
+        _, y, _, height = bbox
+        if height > 0 and (height, y) != (self.row_height, self.header_height):
+            self.row_height, self.header_height = height, y
+            self._fit(self.tree.winfo_height())
+
+    def _restore_selection(self):
+        """Marca en el Treeview las filas visibles que están en la selección"""
+        wanted = [iid for iid, item in self._visible.items() if self.row_key(item) in self.selected]
+        if set(wanted) != set(self.tree.selection()):
+            self.tree.selection_set(wanted)
+
+    def _on_tree_yscroll(self, first, last):
+        """El Treeview se desplazó por dentro: hay más filas de las que caben"""
+        first, last = float(first), float(last)
+        if first <= 0.0 and last >= 1.0:
+            return
+        fit = max(1, int((last - first) * len(self.tree.get_children())))
+        if fit < self.visible:
+            self.visible = fit
+            self.tree.yview_moveto(0)
+            self._scroll_to(self.offset)
+
+    def _render(self):
+        window = self.rows[self.offset:self.offset + self.visible]
+        rows = [self.row_factory(item) for item in window]
+        self.reconciler.reconcile(rows)
+        self._visible = {iid: item for (iid, _), item in zip(rows, window)}
+        self._restore_selection()
+        self._measure()
+
+        total = len(self.rows)
+        if total:
+            first = self.offset / total
+            last = min(1.0, (self.offset + len(window)) / total)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# Terminación de procesos en bloque
+# Envía terminate() a todos a la vez, espera con un solo timeout y fuerza a los que quedan
+#
+
+import os
+from collections import namedtuple
+
+import psutil
+
+from observados import IDENTITY_TOLERANCE
+
+# Resultado de una terminación en bloque; cada lista contiene (pid, nombre o '')
+TerminationReport = namedtuple('TerminationReport', [
+    'terminated',   # terminaron con terminate()
+    'killed',       # hubo que forzarlos con kill()
+    'gone',         # ya no existían (o el PID era de otro proceso)
+    'denied',       # sin permisos para terminarlos
+    'survivors',    # siguen vivos tras kill()
+])
+
+
+def _name(proc):
+    try:
+        return proc.name()
+    except psutil.Error:
+        return ''
+
+
+def collect_targets(targets, include_tree=False):
+    """Procesos a terminar a partir de pares (pid, create_time)
+
+    create_time puede ser None para aceptar cualquier proceso con ese PID;
+    si no, un PID reutilizado por otro proceso se descarta. Con
+    `include_tree` se agregan todos los descendientes. Nunca incluye el
+    propio proceso de la aplicación. Devuelve (procesos, ya terminados).
+    """
+    own_pid = os.getpid()
+    processes = {}
+    gone = []
+    for pid, create_time in targets:
+        try:
+            proc = psutil.Process(pid)
+        except psutil.NoSuchProcess:
+            gone.append((pid, ''))
+            continue
+        try:
+            if create_time and abs(proc.create_time() - create_time) > IDENTITY_TOLERANCE:
+                gone.append((pid, ''))
+                continue
+            found = [proc] + (proc.children(recursive=True) if include_tree else [])
+        except psutil.NoSuchProcess:
+            gone.append((pid, ''))
+            continue
+        except psutil.AccessDenied:
+            # Sin acceso a create_time ni a los hijos: se intenta igual sobre el PID
+            found = [proc]
+        for child in found:
+            if child.pid != own_pid:
+                processes.setdefault(child.pid, child)
+    return list(processes.values()), gone
+
+
+def terminate_processes(processes, timeout=3.0, kill_timeout=2.0, gone=()):
+    """Termina todos los procesos en paralelo y devuelve un TerminationReport
+
+    Primero se envía terminate() a todos, luego se espera a todos juntos
+    con un único `timeout` (psutil.wait_procs) y los que siguen vivos se
+    fuerzan con kill(). El tiempo total no depende de cuántos procesos haya.
+    """
+    names = {proc.pid: _name(proc) for proc in processes}
+    report = TerminationReport([], [], list(gone), [], [])
+
+    signaled = []
+    for proc in processes:
+        try:
+            proc.terminate()
+            signaled.append(proc)
+        except psutil.NoSuchProcess:
+            report.gone.append((proc.pid, names[proc.pid]))
+        except psutil.AccessDenied:
+            report.denied.append((proc.pid, names[proc.pid]))
+
+    finished, alive = psutil.wait_procs(signaled, timeout=timeout)
+    report.terminated.extend((proc.pid, names[proc.pid]) for proc in finished)
+
+    forced = []
+    for proc in alive:
+        try:
+            proc.kill()
+            forced.append(proc)
+        except psutil.NoSuchProcess:
+            report.terminated.append((proc.pid, names[proc.pid]))
+        except psutil.AccessDenied:
+            report.denied.append((proc.pid, names[proc.pid]))
+
+    finished, alive = psutil.wait_procs(forced, timeout=kill_timeout)
+    report.killed.extend((proc.pid, names[proc.pid]) for proc in finished)
+    report.survivors.extend((proc.pid, names[proc.pid]) for proc in alive)
+    return report
+
+
+def format_report(report, limit=10):
+    """Texto de un único informe para mostrar al usuario"""
+    sections = (("Terminados", report.terminated), ("Forzados (kill)", report.killed),
+                ("Ya no existían", report.gone), ("Sin permisos", report.denied),
+                ("Siguen en ejecución", report.survivors))
+    lines = []
+    for title, items in sections:
+        if not items:
+            continue
+        lines.append(f"{title}: {len(items)}")
+        for pid, name in items[:limit]:
+            lines.append(f"  • {name} (PID: {pid})" if name else f"  • PID {pid}")
+        if len(items) > limit:
+            lines.append(f"  … y {len(items) - limit} más")
+    return "\n".join(lines) or "No había procesos para terminar"
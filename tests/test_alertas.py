@@ -0,0 +1,93 @@
+# Pruebas del motor de alertas por umbral
+
+import json
+
+from alertas import AlertEngine, AlertRule, parse_rules
+from recolector import ProcessInfo, ProcessSnapshot
+
+
+def snapshot(cpu_by_process, timestamp):
+    """cpu_by_process: {(pid, create_time): CPU%}"""
+    return ProcessSnapshot([ProcessInfo(pid, create_time, f'proc{pid}', cpu, 0.0, 10.0, 'running', True)
+                            for (pid, create_time), cpu in cpu_by_process.items()], timestamp)
+
+
+def events(alerts):
+    return [(alert.pid, alert.resolved) for alert in alerts]
+
+
+def test_fires_after_duration_and_resolves_with_hysteresis():
+    engine = AlertEngine([AlertRule('cpu', 80.0, 10.0, 20.0)])
+    key = (10, 100.0)
+    assert engine.evaluate(snapshot({key: 90.0}, 0.0)) == []
+    assert engine.evaluate(snapshot({key: 90.0}, 9.0)) == []
+    assert events(engine.evaluate(snapshot({key: 95.0}, 10.0))) == [(10, False)]
+    # Sigue activa: no se repite
+    assert engine.evaluate(snapshot({key: 95.0}, 20.0)) == []
+    # Por debajo del umbral pero dentro de la histéresis: sigue activa
+    assert engine.evaluate(snapshot({key: 70.0}, 21.0)) == []
+    assert events(engine.evaluate(snapshot({key: 59.0}, 22.0))) == [(10, True)]
+    assert engine.evaluate(snapshot({key: 50.0}, 23.0)) == []
+
+
+def test_dip_restarts_duration():
+    engine = AlertEngine([AlertRule('cpu', 80.0, 10.0)])
+    key = (10, 100.0)
+    engine.evaluate(snapshot({key: 90.0}, 0.0))
+    engine.evaluate(snapshot({key: 10.0}, 5.0))
+    assert engine.evaluate(snapshot({key: 90.0}, 11.0)) == []
+    assert events(engine.evaluate(snapshot({key: 90.0}, 21.0))) == [(10, False)]
+
+
+def test_reused_pid_starts_over():
+    engine = AlertEngine([AlertRule('cpu', 80.0, 10.0)])
+    engine.evaluate(snapshot({(10, 100.0): 90.0}, 0.0))
+    # Mismo PID, otro proceso: no hereda el tiempo sobre el umbral
+    assert engine.evaluate(snapshot({(10, 500.0): 90.0}, 15.0)) == []
+    assert events(engine.evaluate(snapshot({(10, 500.0): 90.0}, 25.0))) == [(10, False)]
+
+
+def test_only_matching_processes_and_rules():
+    engine = AlertEngine([AlertRule('cpu', 50.0), AlertRule('cpu', 90.0), AlertRule('rss_mb', 5.0)])
+    alerts = engine.evaluate(snapshot({(1, 1.0): 60.0, (2, 2.0): 10.0}, 0.0))
+    fired = sorted((alert.pid, alert.rule.metric, alert.rule.threshold) for alert in alerts)
+    # rss_mb = 10 MB supera 5 MB en los dos procesos
+    assert fired == [(1, 'cpu', 50.0), (1, 'rss_mb', 5.0), (2, 'rss_mb', 5.0)]
+
+
+def test_system_metrics():
+    engine = AlertEngine([AlertRule('system_memory', 90.0, 5.0, 10.0)])
+    empty = snapshot({}, 0.0)
+    assert engine.evaluate(empty, {'system_memory': 95.0}, now=0.0) == []
+    assert events(engine.evaluate(empty, {'system_memory': 95.0}, now=5.0)) == [(None, False)]
+    assert engine.evaluate(empty, {'system_memory': 85.0}, now=6.0) == []
+    assert events(engine.evaluate(empty, {'system_memory': 79.0}, now=7.0)) == [(None, True)]
+
+
+def test_disabled_and_sample_period():
+    engine = AlertEngine([AlertRule('cpu', 1.0)], enabled=False)
+    assert engine.evaluate(snapshot({(1, 1.0): 50.0}, 0.0)) == []
+    assert engine.sample_period() is None
+    engine.enabled = True
+    assert engine.sample_period() == AlertEngine.SAMPLE_PERIOD
+    engine.set_rules([])
+    assert engine.sample_period() is None
+
+
+def test_log_and_pending(tmp_path):
+    log_path = tmp_path / 'alertas.jsonl'
+    engine = AlertEngine([AlertRule('cpu', 50.0)], log_path=str(log_path))
+    engine.evaluate(snapshot({(1, 1.0): 60.0}, 0.0))
+    engine.evaluate(snapshot({(1, 1.0): 10.0}, 1.0))
+    records = [json.loads(line) for line in log_path.read_text(encoding='utf-8').splitlines()]
+    assert [(r['pid'], r['resolved']) for r in records] == [(1, False), (1, True)]
+    assert len(engine.take_pending()) == 2
+    assert engine.take_pending() == []
+
+
+def test_parse_rules_skips_invalid():
+    rules = parse_rules([{'metric': 'cpu', 'threshold': '90', 'duration': 5},
+                         {'metric': 'disco', 'threshold': 1},
+                         {'metric': 'cpu'},
+                         {'metric': 'cpu', 'threshold': 1, 'duration': -1}])
+    assert rules == (AlertRule('cpu', 90.0, 5.0, 0.0),)
@@ -0,0 +1,54 @@
+# Pruebas del orden y top-k de ProcessColumns
+
+import numpy as np
+import pytest
+
+from columnas import ProcessColumns
+from recolector import ProcessInfo, ProcessSnapshot
+
+
+def make_columns(rows):
+    """rows: (pid, nombre, cpu, memoria MB)"""
+    return ProcessColumns(ProcessSnapshot(
+        ProcessInfo(pid, 1000.0, name, cpu, mb / 100, mb, 'running', True)
+        for pid, name, cpu, mb in rows))
+
+
+def pids(columns, index):
+    return columns.pid[index].tolist()
+
+
+def test_order_descending_with_pid_tiebreak():
+    columns = make_columns([(3, 'a', 5.0, 1), (1, 'b', 5.0, 1), (2, 'c', 9.0, 1)])
+    assert pids(columns, columns.order([('CPU%', True)])) == [2, 1, 3]
+
+
+def test_order_secondary_key():
+    columns = make_columns([(1, 'zeta', 0.0, 1), (2, 'alfa', 0.0, 1), (3, 'beta', 1.0, 1)])
+    assert pids(columns, columns.order([('CPU%', True), ('Nombre', False)])) == [3, 2, 1]
+
+
+def test_top_k_ties_at_limit():
+    # Muchos empates en la clave principal justo en el límite: la clave
+    # secundaria debe decidir cuáles entran, igual que el orden completo
+    rng = np.random.default_rng(0)
+    rows = [(pid, f"p{rng.integers(50)}", float(rng.integers(3)), float(rng.integers(5)))
+            for pid in rng.permutation(np.arange(1, 400)).tolist()]
+    columns = make_columns(rows)
+    for sort_keys in ([('CPU%', True)], [('CPU%', True), ('Nombre', False)],
+                      [('Memoria(MB)', False), ('CPU%', True)]):
+        full = columns.order(sort_keys)
+        for limit in (1, 10, 50, 133, 398):
+            assert pids(columns, columns.order(sort_keys, None, limit)) == pids(columns, full[:limit])
+
+
+@pytest.mark.parametrize('limit', [None, 2, 10])
+def test_order_with_mask(limit):
+    columns = make_columns([(1, 'a', 1.0, 1), (2, 'b', 2.0, 1), (3, 'c', 3.0, 1), (4, 'd', 4.0, 1)])
+    mask = columns.pid % 2 == 0
+    assert pids(columns, columns.order([('CPU%', True)], mask, limit)) == [4, 2]
+
+
+def test_order_empty():
+    columns = make_columns([])
+    assert len(columns.order([('CPU%', True)], None, 50)) == 0
@@ -0,0 +1,140 @@
+# Pruebas de la grabación y reproducción de instantáneas
+
+import math
+
+import pytest
+
+from grabacion import SnapshotPlayer, SnapshotRecorder
+from recolector import ProcessInfo, ProcessSnapshot
+
+TOTAL_MEMORY = 8 * 1024 ** 3
+
+
+def make_snapshots(count):
+    """Instantáneas con procesos que cambian, aparecen, terminan y reutilizan PID"""
+    snapshots = []
+    for t in range(count):
+        processes = [
+            ProcessInfo(1, 500.0, 'init', 0.0, 0.1, 12.5, 'sleeping', True),
+            ProcessInfo(50, 900.0, 'python', t * 1.5 % 100, 1.0, 100.0 + t, 'running', True),
+            ProcessInfo(60, 0.0, '[Acceso denegado]', 0.0, 0.0, 0.0, '[Protegido]', False),
+        ]
+        if t % 3:
+            processes.append(ProcessInfo(70, 1000.0 + t // 3, f'worker-{t // 3}', 12.3, 0.5, 40.0,
+                                         'disk-sleep', True))
+        snapshots.append(ProcessSnapshot(processes, timestamp=10_000.0 + t))
+    return snapshots
+
+
+def assert_same(expected, actual):
+    assert actual.timestamp == expected.timestamp
+    assert len(actual) == len(expected)
+    for a, b in zip(sorted(expected, key=lambda p: p.pid), sorted(actual, key=lambda p: p.pid)):
+        # CPU% en décimas y memoria en KiB; memory_percent se recalcula del total
+        assert (a.pid, a.create_time, a.name, a.status, a.accessible) == \
+            (b.pid, b.create_time, b.name, b.status, b.accessible)
+        assert b.cpu_percent == pytest.approx(a.cpu_percent, abs=0.05)
+        assert b.memory_mb == pytest.approx(a.memory_mb, abs=1 / 1024)
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / 'procesos.grab'
+    snapshots = make_snapshots(25)
+    recorder = SnapshotRecorder(str(path), TOTAL_MEMORY)
+    recorder.KEYFRAME_INTERVAL = 7
+    for i, snapshot in enumerate(snapshots):
+        recorder.record(snapshot, (float(i), 50.0))
+    recorder.close()
+    return path, snapshots
+
+
+def test_round_trip_sequential(recording):
+    path, snapshots = recording
+    player = SnapshotPlayer(str(path))
+    try:
+        assert len(player) == len(snapshots)
+        assert player.total_memory == TOTAL_MEMORY
+        for i, expected in enumerate(snapshots):
+            assert_same(expected, player.snapshot(i))
+    finally:
+        player.close()
+
+
+def test_random_access(recording):
+    path, snapshots = recording
+    player = SnapshotPlayer(str(path))
+    try:
+        for i in (20, 3, 24, 0, 13, 14, 6):
+            assert_same(snapshots[i], player.snapshot(i))
+        assert player.index_at(snapshots[9].timestamp + 0.5) == 9
+        assert player.index_at(0.0) == 0
+    finally:
+        player.close()
+
+
+def test_system_window(recording):
+    path, snapshots = recording
+    player = SnapshotPlayer(str(path))
+    try:
+        times, values = player.system_window(snapshots[10].timestamp, 3.0)
+        assert times.tolist() == [s.timestamp for s in snapshots[7:11]]
+        assert values[:, 0].tolist() == [7.0, 8.0, 9.0, 10.0]
+    finally:
+        player.close()
+
+
+def test_append_to_existing_recording(recording):
+    path, snapshots = recording
+    extra = ProcessSnapshot([ProcessInfo(1, 500.0, 'init', 0.0, 0.1, 12.5, 'sleeping', True)],
+                            timestamp=20_000.0)
+    recorder = SnapshotRecorder(str(path), 1)
+    assert recorder.total_memory == TOTAL_MEMORY
+    recorder.record(extra)
+    recorder.close()
+    player = SnapshotPlayer(str(path))
+    try:
+        assert len(player) == len(snapshots) + 1
+        assert_same(extra, player.snapshot(len(snapshots)))
+        assert math.isnan(player.system[-1, 0])
+    finally:
+        player.close()
+
+
+def test_truncated_last_frame(recording):
+    path, snapshots = recording
+    with open(path, 'r+b') as f:
+        f.truncate(path.stat().st_size - 3)
+    player = SnapshotPlayer(str(path))
+    try:
+        assert len(player) == len(snapshots) - 1
+        assert_same(snapshots[-2], player.snapshot(len(player) - 1))
+    finally:
+        player.close()
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / 'otro.bin'
+    path.write_bytes(b'no es una grabacion')
+    with pytest.raises(ValueError):
+        SnapshotPlayer(str(path))
+
+
+def test_append_after_truncated_frame(recording):
+    # Reanudar la grabación tras un corte: el cuadro cortado se descarta
+    path, snapshots = recording
+    with open(path, 'r+b') as f:
+        f.truncate(path.stat().st_size - 3)
+    later = [ProcessSnapshot(s.processes, timestamp=s.timestamp + 1000.0) for s in make_snapshots(10)]
+    recorder = SnapshotRecorder(str(path), TOTAL_MEMORY)
+    for snapshot in later:
+        recorder.record(snapshot)
+    recorder.close()
+    player = SnapshotPlayer(str(path))
+    try:
+        expected = snapshots[:-1] + later
+        assert len(player) == len(expected)
+        for i, snapshot in enumerate(expected):
+            assert_same(snapshot, player.snapshot(i))
+    finally:
+        player.close()
@@ -0,0 +1,69 @@
+# Pruebas de la identidad de los procesos observados
+
+from observados import IDENTITY_TOLERANCE, identity_confirmed, reconcile_watched, same_process
+from recolector import ProcessInfo, ProcessSnapshot
+
+
+def info(pid=100, create_time=1000.0, name='python', accessible=True, status='running'):
+    if not accessible:
+        name, status = '[Acceso denegado]', '[Protegido]'
+    return ProcessInfo(pid, create_time, name, 0.0, 0.0, 0.0, status, accessible)
+
+
+def test_same_create_time():
+    entry = {'name': 'python', 'create_time': 1000.0}
+    assert same_process(entry, info(create_time=1000.0 + IDENTITY_TOLERANCE / 2))
+
+
+def test_reused_pid():
+    entry = {'name': 'python', 'create_time': 1000.0}
+    assert not same_process(entry, info(create_time=2000.0))
+
+
+def test_reused_pid_protected():
+    # El create_time se compara aunque el proceso no sea accesible
+    entry = {'name': 'python', 'create_time': 1000.0}
+    assert not same_process(entry, info(create_time=2000.0, accessible=False))
+    assert same_process(entry, info(create_time=1000.0, accessible=False))
+
+
+def test_row_without_create_time():
+    entry = {'name': 'python', 'create_time': 1000.0}
+    assert not same_process(entry, info(create_time=0.0))
+
+
+def test_legacy_entry_uses_name():
+    entry = {'name': 'python'}
+    assert same_process(entry, info())
+    assert not same_process(entry, info(name='bash'))
+    # Nombre ilegible: se acepta el PID pero la identidad no queda confirmada
+    assert same_process(entry, info(accessible=False))
+    assert not identity_confirmed(entry, info(accessible=False))
+
+
+def test_legacy_entry_protected_with_readable_name():
+    # Nombre legible pero otros campos denegados: el nombre decide
+    entry = {'name': 'sqlservr.exe'}
+    protected = ProcessInfo(4844, 1000.0, 'svchost.exe', 0.0, 0.0, 0.0, '[Protegido]', False)
+    assert not same_process(entry, protected)
+    same_name = protected._replace(name='sqlservr.exe')
+    assert same_process(entry, same_name)
+    assert identity_confirmed(entry, same_name)
+
+
+def test_reconcile_does_not_store_unconfirmed_identity():
+    watched = {'4844': {'name': 'sqlservr.exe', 'status': 'activo'}}
+    reconcile_watched(watched, ProcessSnapshot([info(pid=4844, create_time=1000.0, accessible=False)]))
+    assert watched['4844'].get('create_time') is None
+    assert watched['4844']['status'] == 'activo'
+
+
+def test_reconcile_marks_reused_pid():
+    watched = {'100': {'name': 'python', 'create_time': 1000.0, 'status': 'activo'},
+               '200': {'name': 'bash', 'status': 'activo'}}
+    snapshot = ProcessSnapshot([info(pid=100, create_time=2000.0),
+                                info(pid=200, create_time=3000.0, name='bash')])
+    assert reconcile_watched(watched, snapshot)
+    assert watched['100']['status'] == 'terminado'
+    # La entrada antigua adopta la identidad completa
+    assert watched['200']['create_time'] == 3000.0
@@ -0,0 +1,71 @@
+# Pruebas de la escritura atómica de archivos de datos
+
+import json
+import os
+
+import pytest
+
+import persistencia
+from persistencia import AtomicJsonFile, atomic_write
+
+
+def test_atomic_write_replaces_content(tmp_path):
+    path = tmp_path / 'datos.json'
+    atomic_write(str(path), b'uno')
+    atomic_write(str(path), b'dos')
+    assert path.read_bytes() == b'dos'
+    # No quedan temporales en el directorio
+    assert os.listdir(tmp_path) == ['datos.json']
+
+
+def test_atomic_write_failure_keeps_previous(tmp_path, monkeypatch):
+    path = tmp_path / 'datos.json'
+    atomic_write(str(path), b'original')
+
+    def fail(src, dst):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(persistencia.os, 'replace', fail)
+    with pytest.raises(OSError):
+        atomic_write(str(path), b'nuevo')
+    assert path.read_bytes() == b'original'
+    assert os.listdir(tmp_path) == ['datos.json']
+
+
+def test_json_file_keeps_last_save(tmp_path):
+    path = tmp_path / 'observados.json'
+    data_file = AtomicJsonFile(str(path))
+    for i in range(50):
+        data_file.save({'contador': i})
+    assert data_file.flush()
+    assert data_file.error is None
+    assert json.loads(path.read_text(encoding='utf-8')) == {'contador': 49}
+    assert data_file.load() == {'contador': 49}
+
+
+def test_json_file_legacy_and_default(tmp_path):
+    legacy = tmp_path / 'anterior.json'
+    data_file = AtomicJsonFile(str(tmp_path / 'nuevo.json'), legacy_path=str(legacy))
+    assert data_file.load() == {}
+    assert data_file.load(default={'reglas': []}) == {'reglas': []}
+    legacy.write_text('{"1234": {"name": "python"}}', encoding='utf-8')
+    assert data_file.load() == {'1234': {'name': 'python'}}
+
+
+def test_json_file_ignores_corrupt(tmp_path):
+    path = tmp_path / 'roto.json'
+    path.write_text('{"sin cerrar": ', encoding='utf-8')
+    assert AtomicJsonFile(str(path)).load() == {}
+
+
+def test_json_file_error_after_last_write(tmp_path):
+    # El error corresponde a la última escritura y se conoce al terminar flush()
+    data_file = AtomicJsonFile(str(tmp_path / 'no_existe' / 'datos.json'))
+    data_file.save({'a': 1})
+    assert data_file.flush()
+    assert not data_file.busy
+    assert isinstance(data_file.error, OSError)
+    data_file.path = str(tmp_path / 'datos.json')
+    data_file.save({'a': 2})
+    assert data_file.flush()
+    assert data_file.error is None
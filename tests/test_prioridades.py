@@ -0,0 +1,16 @@
+# Pruebas de las prioridades de los observados
+
+from prioridades import PriorityEnforcer, priority_value
+from recolector import ProcessInfo, ProcessSnapshot
+
+
+def test_watched_priority_needs_confirmed_identity():
+    enforcer = PriorityEnforcer()
+    enforcer.set_watched({'4844': {'name': 'sqlservr.exe', 'priority': 'high', 'status': 'activo'},
+                          '500': {'name': 'python', 'priority': 'idle', 'status': 'activo',
+                                  'create_time': 900.0}})
+    snapshot = ProcessSnapshot([
+        ProcessInfo(4844, 1000.0, '[Acceso denegado]', 0.0, 0.0, 0.0, '[Protegido]', False),
+        ProcessInfo(500, 900.0, 'python', 0.0, 0.0, 0.0, 'running', True),
+    ])
+    assert enforcer.targets(snapshot) == {(500, 900.0): priority_value('idle')}
@@ -0,0 +1,43 @@
+# Pruebas del registro de procesos
+
+import os
+
+import psutil
+
+from recolector import ProcessRegistry
+
+
+def test_reused_pid_gets_new_identity():
+    registry = ProcessRegistry()
+    registry.collect_snapshot()
+    pid = os.getpid()
+    key, proc = registry._entries[pid]
+    real_create_time = key[1]
+
+    # Simular que el Process registrado era de un proceso anterior con el mismo PID
+    old_key = (pid, real_create_time - 100.0)
+    proc._create_time = old_key[1]
+    registry._entries[pid] = (old_key, proc)
+
+    info = registry.collect_snapshot().get(pid)
+    assert info.create_time == real_create_time
+    assert registry.key(pid) == (pid, real_create_time)
+    assert registry.get(pid) is not proc
+
+
+def test_same_process_keeps_entry():
+    registry = ProcessRegistry()
+    registry.collect_snapshot()
+    pid = os.getpid()
+    proc = registry.get(pid)
+    info = registry.collect_snapshot().get(pid)
+    assert registry.get(pid) is proc
+    assert info.create_time == psutil.Process(pid).create_time()
+
+
+def test_dead_pids_are_dropped():
+    registry = ProcessRegistry()
+    registry.collect_snapshot()
+    registry._entries[2 ** 22 + 7] = ((2 ** 22 + 7, 1.0), psutil.Process(os.getpid()))
+    registry.collect_snapshot()
+    assert registry.get(2 ** 22 + 7) is None